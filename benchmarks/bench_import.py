@@ -0,0 +1,112 @@
+"""
+Benchmarks cold-start import time of the app entry points with ``python -X importtime``
+
+Run with ``python -m benchmarks.bench_import`` (optionally ``--max-ms 1500`` to fail on regressions).
+"""
+import argparse
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "fantasy_football.app",
+    "fantasy_football.visualizations.dashboard",
+    "fantasy_football.get_fantasy_stuff",
+]
+
+# Modules the app entry point should not import before it binds the server
+DEFERRED_MODULES = ["pandas", "numpy", "fantasy_football.get_fantasy_stuff"]
+
+
+def get_import_times(module: str) -> dict:
+    """
+    Import a module in a fresh interpreter and parse its ``-X importtime`` report
+
+    Args:
+        module (str): Dotted name of the module to import
+
+    Returns:
+        dict: Cumulative import time in seconds of every module imported, keyed by module name
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times = {}
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+
+        if cumulative.strip().isdigit():
+            import_times[name.strip()] = int(cumulative) / 1e6
+
+    return import_times
+
+
+def run_benchmarks(modules: list, repeat: int = 3, top: int = 5) -> list:
+    """
+    Time the cold import of every module, reporting its slowest direct and indirect imports
+
+    Args:
+        modules (list): Dotted names of the modules to import
+        repeat (int): Number of fresh interpreters per module; the best is reported
+        top (int): Number of slowest imports to list per module
+
+    Returns:
+        list: (module, best seconds) tuples
+    """
+    results = []
+
+    for module in modules:
+        runs = [get_import_times(module) for _ in range(repeat)]
+        best_run = min(runs, key=lambda import_times: import_times[module])
+        best = best_run[module]
+
+        print(f"{module:<45} {best * 1000:10.2f} ms")
+
+        slowest = sorted(
+            (item for item in best_run.items() if item[0] != module),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+
+        for name, seconds in slowest:
+            print(f"    {name:<41} {seconds * 1000:10.2f} ms")
+
+        if module == "fantasy_football.app":
+            for name in DEFERRED_MODULES:
+                if name in best_run:
+                    print(f"    warning: {name} is imported at startup")
+
+        results.append((module, best))
+
+    return results
+
+
+def main():
+    """
+    Command line entry point for the import-time benchmarks
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module")
+    parser.add_argument(
+        "--max-ms", type=float, default=None,
+        help="Exit with an error if the first module takes longer than this to import"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.modules, repeat=args.repeat)
+
+    if args.max_ms is not None and results[0][1] * 1000 > args.max_ms:
+        sys.exit(f"{results[0][0]} took {results[0][1] * 1000:.0f} ms to import (max {args.max_ms:g})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmarks the analytics pipeline against synthetic leagues of several sizes
+
+Run with ``python -m benchmarks.bench_pipeline`` (optionally ``--sizes 12x14x1 20x17x10``).
+"""
+import argparse
+import copy
+import timeit
+
+from fantasy_football.analytics.all_play import get_all_play_standings
+from fantasy_football.analytics.playoff_odds import get_playoff_odds
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import (
+    build_league_data,
+    get_all_team_scores,
+    get_team_scores,
+    plot_all_teams,
+)
+from fantasy_football.synthetic_league import generate_league_info, generate_league_seasons
+from fantasy_football.visualizations.dashboard import Dashboard
+
+# (teams, weeks, seasons)
+DEFAULT_SIZES = ["10x14x1", "12x17x1", "20x17x1", "20x17x10"]
+
+
+def build_cases(num_teams: int, num_weeks: int, num_seasons: int) -> dict:
+    """
+    Build the benchmark cases for one league size
+
+    Each case is a zero-argument callable that runs a pipeline stage over every season.
+    ``MatchupInfo`` caches derived tables, so cases that time it build a fresh instance.
+
+    Args:
+        num_teams (int): Number of teams in the league
+        num_weeks (int): Number of weeks per season
+        num_seasons (int): Number of seasons
+
+    Returns:
+        dict: Callables keyed by case name
+    """
+    payloads = generate_league_seasons(num_teams, num_weeks, num_seasons, seed=0)
+
+    seasons = [
+        (
+            BasicInfo(league_id, year, client=object(), league_info=payload),
+            MatchupInfo(league_id, year, client=object(), league_info=payload),
+        )
+        for (league_id, year), payload in payloads.items()
+    ]
+
+    def fresh_matchup_infos() -> list:
+        return [
+            MatchupInfo(league_id, year, client=object(), league_info=payload)
+            for (league_id, year), payload in payloads.items()
+        ]
+
+    prepared = []
+    for basic_info, matchup_info in seasons:
+        games_df = matchup_info.get_all_games_df()
+        avgs = matchup_info.get_weekly_average_score()
+        prepared.append((basic_info, matchup_info, games_df, avgs))
+
+    # Playoff odds only simulate unplayed games, so time them on a season with four weeks left
+    in_progress_games_df = MatchupInfo(
+        1,
+        2021,
+        client=object(),
+        league_info=generate_league_info(num_teams, num_weeks, played_weeks=num_weeks - 4, seed=0),
+    ).get_all_games_df()
+
+    # Running stats of every season with its last week still to fold in
+    last_week_stats = []
+    for (league_id, year), payload in payloads.items():
+        last_week = max(game["matchupPeriodId"] for game in payload["schedule"])
+        matchup_info = MatchupInfo(
+            league_id,
+            year,
+            client=object(),
+            league_info={
+                **payload,
+                "schedule": [
+                    game for game in payload["schedule"] if game["matchupPeriodId"] != last_week
+                ],
+            },
+        )
+        last_week_games = [
+            game for game in payload["schedule"] if game["matchupPeriodId"] == last_week
+        ]
+        last_week_stats.append((matchup_info.get_running_stats(), last_week, last_week_games))
+
+    def running_stats_add_week() -> None:
+        # Copies the stats so every repeat adds the week afresh; the copy is O(teams) too
+        for running_stats, last_week, last_week_games in last_week_stats:
+            copy.deepcopy(running_stats).add_week(last_week, last_week_games)
+
+    def dashboard_layout() -> None:
+        for basic_info, matchup_info, _, _ in prepared:
+            dashboard = Dashboard(
+                1, 2021, build_league_data(basic_info, matchup_info), basic_info.get_teams()
+            )
+            dashboard.build_layout()
+
+    return {
+        "get_all_team_weekly_wins": lambda: [
+            matchup_info.get_all_team_weekly_wins() for matchup_info in fresh_matchup_infos()
+        ],
+        "get_all_game_margins": lambda: [
+            matchup_info.get_all_game_margins() for matchup_info in fresh_matchup_infos()
+        ],
+        "get_weekly_average_score": lambda: [
+            matchup_info.get_weekly_average_score() for matchup_info in fresh_matchup_infos()
+        ],
+        "get_running_stats": lambda: [
+            matchup_info.get_running_stats() for matchup_info in fresh_matchup_infos()
+        ],
+        "running_stats_add_week": running_stats_add_week,
+        "get_all_play_standings": lambda: [
+            get_all_play_standings(matchup_info.get_team_results())
+            for _, matchup_info, _, _ in prepared
+        ],
+        "get_playoff_odds": lambda: get_playoff_odds(in_progress_games_df, seed=0),
+        "get_team_scores": lambda: [
+            get_team_scores(team_id, games_df, avgs)
+            for basic_info, _, games_df, avgs in prepared
+            for team_id in basic_info.get_team_ids()
+        ],
+        "get_all_team_scores": lambda: [
+            get_all_team_scores(games_df, avgs) for _, _, games_df, avgs in prepared
+        ],
+        "plot_all_teams": lambda: [
+            plot_all_teams(
+                basic_info.get_team_ids(), basic_info.get_teams_dataframe(), games_df, avgs
+            )
+            for basic_info, _, games_df, avgs in prepared
+        ],
+        "dashboard_layout": dashboard_layout,
+    }
+
+
+def run_benchmarks(sizes: list, repeat: int = 5, number: int = 1) -> list:
+    """
+    Time every benchmark case at every league size
+
+    Args:
+        sizes (list): League sizes as "TEAMSxWEEKSxSEASONS" strings
+        repeat (int): Number of timing repeats; the best is reported
+        number (int): Number of calls per repeat
+
+    Returns:
+        list: (size, case name, best seconds per call) tuples; seconds is None if the case failed
+    """
+    results = []
+
+    for size in sizes:
+        num_teams, num_weeks, num_seasons = (int(part) for part in size.split("x"))
+
+        for name, case in build_cases(num_teams, num_weeks, num_seasons).items():
+            try:
+                best = min(timeit.repeat(case, repeat=repeat, number=number)) / number
+            except Exception as error:  # pylint: disable=W0703
+                print(f"{size:>10}  {name:<28} failed: {error!r}")
+                best = None
+            else:
+                print(f"{size:>10}  {name:<28} {best * 1000:10.2f} ms")
+
+            results.append((size, name, best))
+
+    return results
+
+
+def main():
+    """
+    Command line entry point for the pipeline benchmarks
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", nargs="+", default=DEFAULT_SIZES, help="League sizes as TEAMSxWEEKSxSEASONS"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per case")
+    args = parser.parse_args()
+
+    run_benchmarks(args.sizes, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+All-play (expected wins) standings
+"""
+import pandas as pd
+
+
+def get_all_play_standings(team_results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get every team's all-play record, expected wins and luck
+
+    Each week, every team's score is ranked against every other team's score in one vectorized
+    week x team rank. A team's all-play wins that week are the number of teams it outscored
+    (ties count as half), and its expected wins are that as a fraction of its possible opponents.
+    Luck is actual wins (ties as half) minus expected wins.
+
+    Args:
+        team_results (pd.DataFrame): Long-format team results, as from
+            ``MatchupInfo.get_team_results`` (or ``SeasonStore.load_team_results`` with a
+            Year column, to span several seasons)
+
+    Returns:
+        pd.DataFrame: All-Play Wins, All-Play Losses, Expected Wins, Actual Wins and Luck
+            for each team (index is team id)
+    """
+    played = team_results[team_results["Result"] != "U"]
+    period_keys = ["Year", "Week"] if "Year" in played.columns else ["Week"]
+
+    scores = played.pivot(index=period_keys, columns="Team", values="PointsFor")
+
+    # Average ranks put tied teams half-way, so rank - 1 counts tied opponents as half a win
+    ranks = scores.rank(axis=1, method="average")
+    teams_per_week = scores.notna().sum(axis=1)
+
+    all_play_wins = ranks.sub(1)
+    all_play_losses = ranks.rsub(teams_per_week, axis=0)
+    expected_wins = all_play_wins.div(teams_per_week - 1, axis=0)
+
+    actual_wins = (
+        played["Result"].map({"W": 1.0, "T": 0.5, "L": 0.0}).groupby(played["Team"]).sum()
+    )
+
+    all_play_standings = pd.DataFrame({
+        "All-Play Wins": all_play_wins.sum(),
+        "All-Play Losses": all_play_losses.sum(),
+        "Expected Wins": expected_wins.sum(),
+        "Actual Wins": actual_wins,
+    })
+    all_play_standings["Luck"] = (
+        all_play_standings["Actual Wins"] - all_play_standings["Expected Wins"]
+    )
+    all_play_standings.index.name = "Team"
+
+    return all_play_standings
@@ -0,0 +1,161 @@
+"""
+Monte Carlo playoff odds
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_NUM_SIMULATIONS = 100_000
+DEFAULT_BATCH_SIZE = 10_000
+
+# Scale that keeps wins the primary sort key with points for as the tiebreaker
+_WINS_SCALE = 1e7
+
+
+def get_playoff_odds(
+    games_df: pd.DataFrame,
+    num_playoff_teams: int = 4,
+    num_simulations: int = DEFAULT_NUM_SIMULATIONS,
+    seed: int = None,
+    processes: int = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
+    """
+    Simulate the rest of the regular season and get each team's probability of each final seed
+
+    Every undecided game, including a live one with partial scores, is simulated by drawing each
+    team's score from a normal distribution fitted to its decided games. Final seeds are ordered by
+    wins (ties count half) with total points scored as the tiebreaker, ESPN's default seeding
+    rule. Simulations run in vectorized NumPy batches spread over a process pool; every batch
+    gets its own child of one ``SeedSequence``, so results only depend on ``seed``, not on the
+    number of processes.
+
+    Args:
+        games_df (pd.DataFrame): Regular season games, as from MatchupInfo.get_all_games_df
+        num_playoff_teams (int): Number of teams that make the playoffs
+        num_simulations (int): Number of seasons to simulate
+        seed (int): Seed for the random number generator, for reproducible odds
+        processes (int): Number of worker processes (None for one per CPU, 1 to run inline)
+        batch_size (int): Number of seasons simulated per vectorized batch
+
+    Returns:
+        pd.DataFrame: Probability of each final seed ("Seed 1", ...) and of making the
+            playoffs ("Playoffs") for each team (index is team id)
+    """
+    teams = np.unique(games_df[["Team1", "Team2"]].to_numpy())
+    team_index = {team_id: i for i, team_id in enumerate(teams)}
+
+    home = games_df["Team1"].map(team_index).to_numpy()
+    away = games_df["Team2"].map(team_index).to_numpy()
+    home_score = games_df["Score1"].to_numpy(dtype=float)
+    away_score = games_df["Score2"].to_numpy(dtype=float)
+
+    # Partial scores of live games are ignored, so they never count as results or in the fit
+    remaining = (games_df["Winner"].astype(str).str.upper() == "UNDECIDED").to_numpy()
+    played = ~remaining
+
+    num_teams = len(teams)
+
+    base_wins = (
+        np.bincount(home[played], weights=_wins(home_score, away_score)[played], minlength=num_teams)
+        + np.bincount(away[played], weights=_wins(away_score, home_score)[played], minlength=num_teams)
+    )
+    base_points = (
+        np.bincount(home[played], weights=home_score[played], minlength=num_teams)
+        + np.bincount(away[played], weights=away_score[played], minlength=num_teams)
+    )
+
+    played_teams = np.concatenate([home[played], away[played]])
+    played_scores = np.concatenate([home_score[played], away_score[played]])
+
+    means, stds = _fit_score_distributions(played_teams, played_scores, num_teams)
+
+    batch_sizes = [batch_size] * (num_simulations // batch_size)
+    if num_simulations % batch_size:
+        batch_sizes.append(num_simulations % batch_size)
+
+    batch_seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    batch_args = [
+        (
+            batch_seed, size, home[remaining], away[remaining], means, stds,
+            base_wins, base_points,
+        )
+        for batch_seed, size in zip(batch_seeds, batch_sizes)
+    ]
+
+    if processes == 1 or len(batch_args) <= 1:
+        seed_counts = sum(_simulate_batch(*args) for args in batch_args)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            seed_counts = sum(executor.map(_simulate_batch, *zip(*batch_args)))
+
+    seed_odds = pd.DataFrame(
+        seed_counts / num_simulations,
+        index=pd.Index(teams, name="Team"),
+        columns=[f"Seed {i}" for i in range(1, num_teams + 1)],
+    )
+    seed_odds["Playoffs"] = seed_odds.iloc[:, :num_playoff_teams].sum(axis=1)
+
+    return seed_odds
+
+
+def _wins(score: np.ndarray, opponent_score: np.ndarray) -> np.ndarray:
+    return (score > opponent_score) + 0.5 * (score == opponent_score)
+
+
+def _fit_score_distributions(team_idx: np.ndarray, scores: np.ndarray, num_teams: int) -> tuple:
+    counts = np.bincount(team_idx, minlength=num_teams)
+    sums = np.bincount(team_idx, weights=scores, minlength=num_teams)
+    sums_sq = np.bincount(team_idx, weights=scores ** 2, minlength=num_teams)
+
+    league_mean = scores.mean() if len(scores) else 100.0
+    league_std = scores.std() if len(scores) > 1 else 25.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(sums_sq / counts - means ** 2, 0.0) * counts / (counts - 1))
+
+    # Fall back to the league-wide distribution until a team has a couple of games
+    means = np.where(counts > 0, means, league_mean)
+    stds = np.where(counts > 1, stds, league_std)
+
+    return means, stds
+
+
+def _simulate_batch(
+    seed_sequence: np.random.SeedSequence,
+    batch_size: int,
+    home: np.ndarray,
+    away: np.ndarray,
+    means: np.ndarray,
+    stds: np.ndarray,
+    base_wins: np.ndarray,
+    base_points: np.ndarray
+) -> np.ndarray:
+    rng = np.random.default_rng(seed_sequence)
+    num_teams = len(means)
+
+    home_score = rng.normal(means[home], stds[home], size=(batch_size, len(home)))
+    away_score = rng.normal(means[away], stds[away], size=(batch_size, len(away)))
+
+    # Scatter each simulated game's result onto its two teams with one-hot matrix products
+    home_onehot = np.eye(num_teams)[home]
+    away_onehot = np.eye(num_teams)[away]
+
+    wins = (
+        base_wins
+        + _wins(home_score, away_score) @ home_onehot
+        + _wins(away_score, home_score) @ away_onehot
+    )
+    points = base_points + home_score @ home_onehot + away_score @ away_onehot
+
+    order = np.argsort(-(wins * _WINS_SCALE + points), axis=1, kind="stable")
+
+    # counts[team, seed] = number of simulations where team finished in that seed
+    seeds = np.broadcast_to(np.arange(num_teams), order.shape)
+    seed_counts = np.bincount(
+        (order * num_teams + seeds).ravel(), minlength=num_teams * num_teams
+    )
+
+    return seed_counts.reshape(num_teams, num_teams)
@@ -0,0 +1,84 @@
+"""
+Player value over a league-average replacement ("MVP" analysis)
+"""
+import numpy as np
+import pandas as pd
+
+
+def get_replacement_values(player_weeks: pd.DataFrame, team_results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get how much each starter helped their team over a league-average replacement
+
+    A player's replacement each week scores the league-average points of every starter in the
+    same lineup slot that week. Every starter's matchup is then re-decided with that player
+    swapped for the replacement, all starters at once, and the change in result is the wins
+    the player added.
+
+    Args:
+        player_weeks (pd.DataFrame): Player-week points, as from RosterInfo.get_player_weeks_df
+        team_results (pd.DataFrame): Long-format team results, as from MatchupInfo.get_team_results
+
+    Returns:
+        pd.DataFrame: Starts, Points, Points Over Replacement and Wins Added for each player on
+            each team (index is Team, Player), sorted by wins then points added
+    """
+    starters = player_weeks[player_weeks["Starter"]]
+
+    replacement_points = starters.groupby(["Week", "Slot"])["Points"].transform("mean")
+
+    decided = team_results[team_results["Result"] != "U"]
+    matchups = decided.set_index(["Week", "Team"])[["PointsFor", "PointsAgainst"]]
+
+    starter_matchups = matchups.reindex(
+        pd.MultiIndex.from_arrays([starters["Week"], starters["Team"]])
+    )
+    points_for = starter_matchups["PointsFor"].to_numpy()
+    points_against = starter_matchups["PointsAgainst"].to_numpy()
+
+    points = starters["Points"].to_numpy(dtype=np.float64)
+    points_over_replacement = points - replacement_points.to_numpy(dtype=np.float64)
+    swapped_points_for = points_for - points_over_replacement
+
+    wins_added = _result(points_for, points_against) - _result(swapped_points_for, points_against)
+
+    player_values = pd.DataFrame({
+        "Team": starters["Team"].to_numpy(),
+        "Player": starters["Player"].to_numpy(),
+        "Starts": np.ones(len(starters), dtype=np.int32),
+        "Points": points,
+        "Points Over Replacement": points_over_replacement,
+        "Wins Added": np.where(np.isnan(points_for), 0.0, wins_added),
+    })
+
+    player_values = player_values.groupby(["Team", "Player"]).sum()
+
+    return player_values.sort_values(["Wins Added", "Points Over Replacement"], ascending=False)
+
+
+def get_team_mvps(player_values: pd.DataFrame, player_names: dict = None) -> pd.DataFrame:
+    """
+    Get each team's most valuable player over replacement
+
+    Args:
+        player_values (pd.DataFrame): Player values, as from get_replacement_values
+        player_names (dict): Player full names keyed by player ID, e.g. RosterInfo.player_names
+
+    Returns:
+        pd.DataFrame: The top player's values for each team (index is team id)
+    """
+    team_mvps = (
+        player_values.sort_values(["Wins Added", "Points Over Replacement"], ascending=False)
+        .reset_index()
+        .drop_duplicates("Team")
+        .set_index("Team")
+        .sort_index()
+    )
+
+    if player_names is not None:
+        team_mvps.insert(1, "Player Name", team_mvps["Player"].map(player_names))
+
+    return team_mvps
+
+
+def _result(points_for: np.ndarray, points_against: np.ndarray) -> np.ndarray:
+    return (points_for > points_against) + 0.5 * (points_for == points_against)
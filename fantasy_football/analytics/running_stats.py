@@ -0,0 +1,222 @@
+"""
+Running season aggregates, updated one finalized week at a time
+"""
+import numpy as np
+import pandas as pd
+
+
+class RunningLeagueStats:
+    """
+    Per-team and per-week aggregates of a season, updated one finalized week at a time
+
+    Final weeks never change, so each is folded in once by ``add_week`` in O(teams): every team's
+    record and points for/against, the week's mean score and variance, and every team's deviation
+    from that week's mean (total, mean, variance, min and max, as the notebook computes). Means and
+    variances are kept with Welford's algorithm, so no past week is ever revisited.
+
+    Args:
+        team_ids (list): IDs of every team in the league
+
+    Attributes:
+        None
+
+    Methods:
+        add_week (None): Folds a finalized week's games into the aggregates
+        has_week (bool): Returns whether a week has been added
+        get_team_stats (pd.DataFrame): Returns every team's record, points and deviation stats
+        get_weekly_stats (pd.DataFrame): Returns the mean score and variance of every week added
+        get_league_score_stats (dict): Returns the count, mean and variance of every score added
+    """
+    def __init__(self, team_ids: list):
+        self._team_ids: list = list(team_ids)
+        self._team_indexes: dict = {team_id: i for i, team_id in enumerate(self._team_ids)}
+
+        num_teams = len(self._team_ids)
+
+        self._wins: np.ndarray = np.zeros(num_teams, dtype=int)
+        self._losses: np.ndarray = np.zeros(num_teams, dtype=int)
+        self._ties: np.ndarray = np.zeros(num_teams, dtype=int)
+        self._points_for: np.ndarray = np.zeros(num_teams)
+        self._points_against: np.ndarray = np.zeros(num_teams)
+
+        # Welford state of each team's score minus the league mean of the week
+        self._deviation_count: np.ndarray = np.zeros(num_teams, dtype=int)
+        self._deviation_mean: np.ndarray = np.zeros(num_teams)
+        self._deviation_m2: np.ndarray = np.zeros(num_teams)
+        self._deviation_min: np.ndarray = np.full(num_teams, np.inf)
+        self._deviation_max: np.ndarray = np.full(num_teams, -np.inf)
+
+        # (count, mean, variance) of each week's scores, keyed by week
+        self._weeks: dict = {}
+
+        self._score_count: int = 0
+        self._score_mean: float = 0.0
+        self._score_m2: float = 0.0
+
+    def has_week(self, week: int) -> bool:
+        """
+        Whether a week has been added
+
+        Args:
+            week (int): Matchup period
+
+        Returns:
+            bool: True if the week's games are in the aggregates
+        """
+        return week in self._weeks
+
+    def add_week(self, week: int, games: list) -> None:
+        """
+        Fold a finalized week's games into the aggregates
+
+        Args:
+            week (int): Matchup period of the games
+            games (list): The week's ESPN schedule entries, every one decided (byes are skipped)
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the week was already added, a game is undecided or a team plays twice
+            KeyError: If a game has a team that is not in the league
+        """
+        if week in self._weeks:
+            raise ValueError(f"Week {week} has already been added")
+
+        games = [game for game in games if "home" in game and "away" in game]
+
+        if not games:
+            return
+
+        winners = [str(game.get("winner", "UNDECIDED")).upper() for game in games]
+        if "UNDECIDED" in winners:
+            raise ValueError(f"Week {week} has undecided games")
+
+        team1 = self._get_team_indexes([game["home"]["teamId"] for game in games])
+        team2 = self._get_team_indexes([game["away"]["teamId"] for game in games])
+        score1 = np.array([game["home"]["totalPoints"] for game in games], dtype=float)
+        score2 = np.array([game["away"]["totalPoints"] for game in games], dtype=float)
+        winners = np.array(winners)
+
+        teams = np.concatenate([team1, team2])
+        if len(np.unique(teams)) != len(teams):
+            raise ValueError(f"A team plays more than once in week {week}")
+
+        scores = np.concatenate([score1, score2])
+
+        self._wins[teams] += np.concatenate([winners == "HOME", winners == "AWAY"])
+        self._losses[teams] += np.concatenate([winners == "AWAY", winners == "HOME"])
+        self._ties[teams] += np.concatenate([winners == "TIE", winners == "TIE"])
+        self._points_for[teams] += scores
+        self._points_against[teams] += np.concatenate([score2, score1])
+
+        week_count = len(scores)
+        week_mean = scores.mean()
+        week_m2 = ((scores - week_mean) ** 2).sum()
+
+        self._weeks[week] = (
+            week_count, week_mean, week_m2 / (week_count - 1) if week_count > 1 else np.nan
+        )
+
+        deviations = scores - week_mean
+
+        self._deviation_count[teams] += 1
+        delta = deviations - self._deviation_mean[teams]
+        self._deviation_mean[teams] += delta / self._deviation_count[teams]
+        self._deviation_m2[teams] += delta * (deviations - self._deviation_mean[teams])
+        self._deviation_min[teams] = np.minimum(self._deviation_min[teams], deviations)
+        self._deviation_max[teams] = np.maximum(self._deviation_max[teams], deviations)
+
+        # Merge the week into the season's score mean and variance (Chan et al.)
+        total_count = self._score_count + week_count
+        delta = week_mean - self._score_mean
+        self._score_m2 += week_m2 + delta ** 2 * self._score_count * week_count / total_count
+        self._score_mean += delta * week_count / total_count
+        self._score_count = total_count
+
+    def _get_team_indexes(self, team_ids: list) -> np.ndarray:
+        try:
+            return np.array([self._team_indexes[team_id] for team_id in team_ids], dtype=int)
+        except KeyError as error:
+            raise KeyError(f"Team ID {error.args[0]} is not in the league") from None
+
+    def get_team_stats(self) -> pd.DataFrame:
+        """
+        Get every team's record, points and deviation from the weekly league mean
+
+        Args:
+            None
+
+        Returns:
+            pd.DataFrame: Games, Wins, Losses, Ties, Points For, Points Against, and Total, Mean,
+                Std, Min and Max Deviation and Deviation Range for each team (index is team id);
+                deviation stats are NaN for teams with no games and Std for teams with one
+        """
+        count = self._deviation_count
+        played = count > 0
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.where(count > 1, self._deviation_m2 / (count - 1), np.nan))
+
+        mean = np.where(played, self._deviation_mean, np.nan)
+        minimum = np.where(played, self._deviation_min, np.nan)
+        maximum = np.where(played, self._deviation_max, np.nan)
+
+        team_stats = pd.DataFrame(
+            {
+                "Games": count,
+                "Wins": self._wins,
+                "Losses": self._losses,
+                "Ties": self._ties,
+                "Points For": self._points_for,
+                "Points Against": self._points_against,
+                "Total Deviation": np.where(played, mean * count, np.nan),
+                "Mean Deviation": mean,
+                "Std Deviation": std,
+                "Min Deviation": minimum,
+                "Max Deviation": maximum,
+                "Deviation Range": maximum - minimum,
+            },
+            index=pd.Index(self._team_ids, name="Team"),
+        )
+
+        return team_stats
+
+    def get_weekly_stats(self) -> pd.DataFrame:
+        """
+        Get the mean score and variance of every week added
+
+        Args:
+            None
+
+        Returns:
+            pd.DataFrame: Week, Score (the league mean, as in get_weekly_average_score), Variance
+                and Teams for each week, sorted by week
+        """
+        weeks = sorted(self._weeks)
+
+        return pd.DataFrame({
+            "Week": weeks,
+            "Score": [self._weeks[week][1] for week in weeks],
+            "Variance": [self._weeks[week][2] for week in weeks],
+            "Teams": [self._weeks[week][0] for week in weeks],
+        })
+
+    def get_league_score_stats(self) -> dict:
+        """
+        Get the count, mean and variance of every team score added
+
+        Args:
+            None
+
+        Returns:
+            dict: count, mean and (sample) variance of the scores; mean and variance are NaN
+                before any week is added
+        """
+        count = self._score_count
+
+        return {
+            "count": count,
+            "mean": self._score_mean if count else np.nan,
+            "variance": self._score_m2 / (count - 1) if count > 1 else np.nan,
+        }
@@ -0,0 +1,163 @@
+"""
+Schedule luck: how each team would have done with other schedules
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 1_000
+
+
+def _get_score_and_opponent_matrices(games_df: pd.DataFrame) -> tuple:
+    played = games_df[games_df["Winner"].str.upper() != "UNDECIDED"]
+
+    teams = np.unique(played[["Team1", "Team2"]].to_numpy())
+    weeks = np.unique(played["Week"].to_numpy())
+
+    team_idx1 = np.searchsorted(teams, played["Team1"].to_numpy())
+    team_idx2 = np.searchsorted(teams, played["Team2"].to_numpy())
+    week_idx = np.searchsorted(weeks, played["Week"].to_numpy())
+
+    # week x team matrices; byes are NaN scores and -1 opponents
+    scores = np.full((len(weeks), len(teams)), np.nan)
+    opponents = np.full((len(weeks), len(teams)), -1)
+
+    scores[week_idx, team_idx1] = played["Score1"].to_numpy()
+    scores[week_idx, team_idx2] = played["Score2"].to_numpy()
+    opponents[week_idx, team_idx1] = team_idx2
+    opponents[week_idx, team_idx2] = team_idx1
+
+    return teams, scores, opponents
+
+
+def _count_wins(scores: np.ndarray, opponent_scores: np.ndarray, week_axis: int) -> np.ndarray:
+    # NaN on either side (a bye) compares False both ways, so it is neither a win nor a tie
+    wins = (scores > opponent_scores) + 0.5 * (scores == opponent_scores)
+    return wins.sum(axis=week_axis)
+
+
+def get_schedule_swap_wins(games_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get every team's win total under every other team's schedule
+
+    Team i playing team j's schedule faces j's opponent each week, except that in the week j
+    played i, i faces j instead. Computed as one week x team x schedule array operation.
+
+    Args:
+        games_df (pd.DataFrame): DataFrame of all games, as from MatchupInfo.get_all_games_df
+
+    Returns:
+        pd.DataFrame: N x N win totals; row is the team, column is whose schedule it played
+            (the diagonal is each team's actual wins, ties counting half)
+    """
+    teams, scores, opponents = _get_score_and_opponent_matrices(games_df)
+    num_weeks, num_teams = scores.shape
+
+    team_idx = np.arange(num_teams)
+
+    # swapped[w, i, j] = who team i plays in week w on team j's schedule
+    swapped = np.broadcast_to(opponents[:, None, :], (num_weeks, num_teams, num_teams))
+    swapped = np.where(swapped == team_idx[None, :, None], team_idx[None, None, :], swapped)
+
+    opponent_scores = np.where(
+        swapped >= 0,
+        scores[np.arange(num_weeks)[:, None, None], np.maximum(swapped, 0)],
+        np.nan,
+    )
+
+    swap_wins = _count_wins(scores[:, :, None], opponent_scores, week_axis=0)
+
+    return pd.DataFrame(
+        swap_wins,
+        index=pd.Index(teams, name="Team"),
+        columns=pd.Index(teams, name="Schedule Of"),
+    )
+
+
+def iter_shuffled_schedule_wins(
+    games_df: pd.DataFrame,
+    num_samples: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = None
+):
+    """
+    Re-score the season under random schedules, yielding win totals one chunk at a time
+
+    Each sampled schedule pairs teams at random every week (one random bye per week for an
+    odd number of teams) and keeps everyone's actual weekly scores. Only ``chunk_size``
+    schedules are held in memory at once.
+
+    Args:
+        games_df (pd.DataFrame): DataFrame of all games, as from MatchupInfo.get_all_games_df
+        num_samples (int): Total number of random schedules to sample
+        chunk_size (int): Number of schedules sampled per chunk
+        seed (int): Seed for the random number generator
+
+    Yields:
+        np.ndarray: (chunk, team) array of win totals, teams in the order of ``np.unique`` ids
+    """
+    _, scores, _ = _get_score_and_opponent_matrices(games_df)
+    num_weeks, num_teams = scores.shape
+    num_pairs = num_teams // 2
+
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, num_samples, chunk_size):
+        size = min(chunk_size, num_samples - start)
+
+        # Random week-by-week pairings: shuffle the teams, then pair neighbours
+        order = rng.permuted(np.broadcast_to(np.arange(num_teams), (size, num_weeks, num_teams)), axis=2)
+
+        opponents = np.full((size, num_weeks, num_teams), -1)
+        first, second = order[..., 0:2 * num_pairs:2], order[..., 1:2 * num_pairs:2]
+        np.put_along_axis(opponents, first, second, axis=2)
+        np.put_along_axis(opponents, second, first, axis=2)
+
+        week_scores = np.broadcast_to(scores, (size, num_weeks, num_teams))
+        opponent_scores = np.where(
+            opponents >= 0,
+            np.take_along_axis(week_scores, np.maximum(opponents, 0), axis=2),
+            np.nan,
+        )
+
+        yield _count_wins(week_scores, opponent_scores, week_axis=1)
+
+
+def get_shuffled_schedule_win_distribution(
+    games_df: pd.DataFrame,
+    num_samples: int = 10_000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = None
+) -> pd.DataFrame:
+    """
+    Get each team's distribution of win totals over many random schedules
+
+    Chunks from ``iter_shuffled_schedule_wins`` are folded into a running histogram, so memory
+    stays bounded by ``chunk_size`` however many samples are drawn.
+
+    Args:
+        games_df (pd.DataFrame): DataFrame of all games, as from MatchupInfo.get_all_games_df
+        num_samples (int): Total number of random schedules to sample
+        chunk_size (int): Number of schedules sampled per chunk
+        seed (int): Seed for the random number generator
+
+    Returns:
+        pd.DataFrame: Probability of each win total (columns) for each team (index is team id)
+    """
+    teams, scores, _ = _get_score_and_opponent_matrices(games_df)
+    num_weeks, num_teams = scores.shape
+
+    # Wins come in halves (ties), so bin on twice the win total
+    num_bins = 2 * num_weeks + 1
+    counts = np.zeros(num_teams * num_bins, dtype=np.int64)
+
+    for wins in iter_shuffled_schedule_wins(games_df, num_samples, chunk_size, seed):
+        bins = np.rint(wins * 2).astype(np.int64) + np.arange(num_teams) * num_bins
+        counts += np.bincount(bins.ravel(), minlength=num_teams * num_bins)
+
+    distribution = pd.DataFrame(
+        counts.reshape(num_teams, num_bins) / num_samples,
+        index=pd.Index(teams, name="Team"),
+        columns=pd.Index(np.arange(num_bins) / 2, name="Wins"),
+    )
+
+    return distribution.loc[:, distribution.any(axis=0)]
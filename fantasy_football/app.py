@@ -7,16 +7,52 @@ Creates plotly dashboard
 # from dash.dependencies import Input, Output
 # import pandas as pd
 
-from fantasy_football.get_fantasy_stuff import get_all_league_info
+from fantasy_football.espn_requests.cache import get_current_season
+from fantasy_football.metrics import stage
 from fantasy_football.visualizations.dashboard import Dashboard
 
 
+def load_league(league_id: int, year: int) -> tuple:
+    """
+    Load a league for the Dashboard, polling ESPN in the background if its season is running
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+
+    Returns:
+        dict: Dictionary of the standings table and every team's per-week score data
+        list: List of TeamInfo for every team
+        LiveRefresher: The started refresher, or None for a finished season
+    """
+    # Imported here so the server can bind before pandas and the analytics are loaded
+    # pylint: disable=C0415
+    from fantasy_football.get_fantasy_stuff import build_league_data, fetch_league_info
+    from fantasy_football.live_refresh import LiveRefresher
+
+    with stage("fetch"):
+        basic_info, matchup_info = fetch_league_info(league_id, year)
+
+    if year < get_current_season():
+        return build_league_data(basic_info, matchup_info), basic_info.get_teams(), None
+
+    refresher = LiveRefresher(league_id, year, basic_info, matchup_info)
+    refresher.start()
+
+    _, league_data, _ = refresher.get_snapshot()
+
+    return league_data, basic_info.get_teams(), refresher
+
+
 def main():
     """
     Main function for creating dashboards manually
     """
-    team_plots, team_names = get_all_league_info()
-    dashboard = Dashboard(team_plots, team_names)
+    league_id = 1117278137
+    year = 2021
+
+    # The league is loaded in the background while the server shows a loading page
+    dashboard = Dashboard(league_id, year, league_loader=load_league)
     dashboard.build_app()
 
 
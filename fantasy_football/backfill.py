@@ -0,0 +1,178 @@
+"""
+Backfills every past season of a league, with weekly box scores, into the local season store
+
+Usage: ``python -m fantasy_football.backfill LEAGUE_ID --start-year 2012``
+"""
+import argparse
+import json
+import os
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.cache import ResponseCache, get_current_season
+from fantasy_football.espn_requests.client import ESPNClient
+from fantasy_football.espn_requests.constants import HISTORY_CUTOFF_YEAR
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.espn_requests.roster_info import RosterInfo
+from fantasy_football.storage.season_store import DATA_DIR, SeasonStore
+
+# Views needed to store a season's teams, schedule and settings
+SEASON_VIEWS = ["mTeam", "mMatchup", "mSettings"]
+
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+
+
+class Checkpoint:
+    """
+    Records completed backfill steps in a JSON file so an interrupted run can resume
+
+    Args:
+        path (str): Path of the checkpoint file
+
+    Attributes:
+        path (str): Path of the checkpoint file
+
+    Methods:
+        is_done (bool): Returns whether a step has already completed
+        mark_done (None): Records a step as completed
+    """
+    def __init__(self, path: str):
+        self.path: str = path
+
+        self._completed: set = set()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as checkpoint_file:
+                self._completed = set(json.load(checkpoint_file)["completed"])
+
+    def is_done(self, step: str) -> bool:
+        """
+        Whether a step has already completed
+
+        Args:
+            step (str): Step name, e.g. "2015:season" or "2015:week:3"
+
+        Returns:
+            bool: True if the step is recorded as completed
+        """
+        return step in self._completed
+
+    def mark_done(self, step: str) -> None:
+        """
+        Record a step as completed, writing the checkpoint file atomically
+
+        Args:
+            step (str): Step name
+
+        Returns:
+            None
+        """
+        self._completed.add(step)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"completed": sorted(self._completed)}, checkpoint_file)
+
+        os.replace(tmp_path, self.path)
+
+
+def backfill_league(
+    league_id: int,
+    start_year: int,
+    end_year: int,
+    client: ESPNClient,
+    season_store: SeasonStore,
+    checkpoint: Checkpoint
+) -> None:
+    """
+    Backfill a league's seasons and weekly box scores, skipping steps already checkpointed
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        start_year (int): First season to backfill
+        end_year (int): Last season to backfill
+        client (ESPNClient): Throttled client to make requests with
+        season_store (SeasonStore): Store to write seasons and box scores into
+        checkpoint (Checkpoint): Record of completed steps
+
+    Returns:
+        None
+    """
+    for year in range(start_year, end_year + 1):
+        if checkpoint.is_done(f"{year}:done"):
+            continue
+
+        history = year < HISTORY_CUTOFF_YEAR
+
+        league_info, _ = client.stream_league_info(
+            league_id, year, views=SEASON_VIEWS, history=history
+        )
+
+        if not league_info.get("schedule"):
+            print(f"{year}: no season found, skipping")
+            continue
+
+        if not checkpoint.is_done(f"{year}:season"):
+            basic_info = BasicInfo(league_id, year, client=client, league_info=league_info)
+            matchup_info = MatchupInfo(league_id, year, client=client, league_info=league_info)
+
+            season_store.save_season(league_id, year, basic_info, matchup_info)
+            checkpoint.mark_done(f"{year}:season")
+
+        final_week = league_info.get("status", {}).get("finalScoringPeriod") or max(
+            game["matchupPeriodId"] for game in league_info["schedule"]
+        )
+
+        for week in range(1, final_week + 1):
+            step = f"{year}:week:{week}"
+
+            if checkpoint.is_done(step):
+                continue
+
+            roster_info = RosterInfo(league_id, year, client=client, history=history)
+            roster_info.get_all_scoring_periods([week])
+
+            season_store.save_player_weeks(league_id, year, roster_info)
+            checkpoint.mark_done(step)
+
+        checkpoint.mark_done(f"{year}:done")
+        print(f"{year}: done ({final_week} weeks)")
+
+
+def main():
+    """
+    Command line entry point for the historical backfill
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("league_id", type=int, help="ESPN league ID")
+    parser.add_argument("--start-year", type=int, required=True, help="First season to backfill")
+    parser.add_argument(
+        "--end-year", type=int, default=get_current_season() - 1,
+        help="Last season to backfill (defaults to last season)"
+    )
+    parser.add_argument(
+        "--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+        help="Maximum requests per second sent to ESPN"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory of the local season store")
+    parser.add_argument(
+        "--checkpoint", default=None,
+        help="Checkpoint file (defaults to backfill_<league_id>.json in the data directory)"
+    )
+    args = parser.parse_args()
+
+    season_store = SeasonStore(args.data_dir)
+    checkpoint = Checkpoint(
+        args.checkpoint or os.path.join(args.data_dir, f"backfill_{args.league_id}.json")
+    )
+    client = ESPNClient(cache=ResponseCache(), requests_per_second=args.requests_per_second)
+
+    try:
+        backfill_league(
+            args.league_id, args.start_year, args.end_year, client, season_store, checkpoint
+        )
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+Writes headless league reports (CSV/JSON tables plus the static HTML dashboard) for many leagues
+
+Usage: ``python -m fantasy_football.batch_report 1117278137:2021 53946782:2020 --out-dir reports``
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import pandas as pd
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.constants import DEFAULT_MAX_CONCURRENCY, YEAR
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import build_league_data, fetch_league_info
+from fantasy_football.static_export import export_league, write_plotly_js
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_OUT_DIR = "reports"
+
+
+def write_league_report(
+    league_id: int,
+    year: int,
+    basic_info: BasicInfo,
+    matchup_info: MatchupInfo,
+    out_dir: str = DEFAULT_OUT_DIR,
+    plotly_js_url: str = None
+) -> dict:
+    """
+    Run a league's analytics and write its report to ``out_dir/<league_id>/<year>/``
+
+    The report holds CSVs of the standings (record, expected wins, luck), playoff odds, weekly
+    league averages, game margins, and the finalized weeks' team and weekly stats (points and
+    deviation from the weekly mean), a ``report.json`` of the same tables, and the static
+    dashboard (``index.html`` and ``league.json``) with every team's figures.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        basic_info (BasicInfo): Basic league information
+        matchup_info (MatchupInfo): League matchup information
+        out_dir (str): Root directory of the reports
+        plotly_js_url (str): URL of Plotly JS for the HTML page (defaults to a shared local copy)
+
+    Returns:
+        dict: Paths of the written files, keyed by report name
+    """
+    league_dir = os.path.join(out_dir, str(league_id), str(year))
+    os.makedirs(league_dir, exist_ok=True)
+
+    # Run inline: this already runs in a report worker, one per CPU
+    league_data = build_league_data(basic_info, matchup_info, processes=1)
+
+    team_names = basic_info.get_team_names()
+    game_margins = matchup_info.get_all_game_margins()
+    game_margins.insert(2, "Team Name", game_margins["Team"].map(team_names))
+
+    running_stats = matchup_info.get_running_stats()
+    team_stats = running_stats.get_team_stats().reset_index()
+    team_stats.insert(1, "Team Name", team_stats["Team"].map(team_names))
+
+    tables = {
+        "standings": pd.DataFrame(league_data["standings"].data),
+        "playoff_odds": pd.DataFrame(league_data["playoff_odds"].data),
+        "weekly_average_score": matchup_info.get_weekly_average_score(),
+        "game_margins": game_margins.sort_values(["Week", "Team"], ignore_index=True),
+        "team_stats": team_stats,
+        "weekly_stats": running_stats.get_weekly_stats(),
+    }
+
+    paths = {}
+    for name, table in tables.items():
+        paths[name] = os.path.join(league_dir, f"{name}.csv")
+        table.to_csv(paths[name], index=False)
+
+    paths["report"] = os.path.join(league_dir, "report.json")
+    with open(paths["report"], "w", encoding="utf-8") as report_file:
+        json.dump(
+            {
+                "league_id": league_id,
+                "year": year,
+                "name": league_data["name"],
+                # Through pandas' JSON writer, so missing values become null rather than NaN
+                **{
+                    name: json.loads(table.to_json(orient="records"))
+                    for name, table in tables.items()
+                },
+            },
+            report_file,
+        )
+
+    paths["html"] = export_league(
+        league_id,
+        year,
+        basic_info,
+        matchup_info,
+        out_dir=out_dir,
+        plotly_js_url=plotly_js_url,
+        league_data=league_data,
+    )
+
+    return paths
+
+
+def run_batch(
+    leagues: list,
+    out_dir: str = DEFAULT_OUT_DIR,
+    workers: int = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    plotly_js_url: str = None
+) -> dict:
+    """
+    Write the reports of many leagues, isolating failures to the league they happen in
+
+    Leagues are fetched on a thread pool, and each league's analytics and report are handed to a
+    process pool as soon as its fetch finishes, so fetching overlaps with the CPU-bound work.
+
+    Args:
+        leagues (list): List of (league_id, year) pairs
+        out_dir (str): Root directory of the reports
+        workers (int): Number of report processes (defaults to the number of CPUs)
+        max_concurrency (int): Maximum number of leagues fetched at once
+        plotly_js_url (str): URL of Plotly JS for the HTML pages (defaults to a shared local copy)
+
+    Returns:
+        dict: Result of every league keyed by (league_id, year), each with a status of "ok"
+            (and the written paths) or "error" (and the failed stage and error message), and the
+            seconds from the start of the batch until it finished
+    """
+    leagues = list(dict.fromkeys((league_id, year) for league_id, year in leagues))
+
+    # Written once up front, so report processes never race to create the shared copy
+    if plotly_js_url is None:
+        write_plotly_js(out_dir)
+
+    results = {}
+    start_times = {league: time.perf_counter() for league in leagues}
+
+    def record(league: tuple, result: dict) -> None:
+        result["seconds"] = round(time.perf_counter() - start_times[league], 3)
+        results[league] = result
+
+        if result["status"] == "ok":
+            LOGGER.info("Wrote report for league %s (%s)", *league)
+        else:
+            LOGGER.error("Report for league %s (%s) failed: %s", *league, result["error"])
+
+    # Spawned, not forked, because the fetch threads are already running when workers start
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as process_pool, ThreadPoolExecutor(max_workers=max_concurrency) as fetch_pool:
+        fetches = {
+            fetch_pool.submit(_fetch_league_payload, league_id, year): (league_id, year)
+            for league_id, year in leagues
+        }
+
+        reports = {}
+        for fetch in as_completed(fetches):
+            league = fetches[fetch]
+
+            try:
+                league_info = fetch.result()
+            except Exception as error:  # pylint: disable=W0703
+                record(league, {"status": "error", "stage": "fetch", "error": repr(error)})
+                continue
+
+            report = process_pool.submit(
+                _write_league_report_from_payload, *league, league_info, out_dir, plotly_js_url
+            )
+            reports[report] = league
+
+        for report in as_completed(reports):
+            league = reports[report]
+
+            try:
+                paths = report.result()
+            except Exception as error:  # pylint: disable=W0703
+                record(league, {"status": "error", "stage": "report", "error": repr(error)})
+                continue
+
+            record(league, {"status": "ok", "paths": paths})
+
+    return {league: results[league] for league in leagues}
+
+
+def _fetch_league_payload(league_id: int, year: int) -> dict:
+    basic_info, _ = fetch_league_info(league_id, year)
+
+    # BasicInfo and MatchupInfo share one slim payload, which is all a report process needs
+    return basic_info.league_basic_info
+
+
+def _write_league_report_from_payload(
+    league_id: int, year: int, league_info: dict, out_dir: str, plotly_js_url: str
+) -> dict:
+    basic_info = BasicInfo(league_id, year, league_info=league_info)
+    matchup_info = MatchupInfo(league_id, year, league_info=league_info)
+
+    return write_league_report(
+        league_id, year, basic_info, matchup_info, out_dir=out_dir, plotly_js_url=plotly_js_url
+    )
+
+
+def parse_league(league: str) -> tuple:
+    """
+    Parse a ``LEAGUE_ID[:YEAR]`` command line argument
+
+    Args:
+        league (str): League ID, optionally followed by a colon and the year
+
+    Returns:
+        tuple: (league_id, year), with the default year if none is given
+    """
+    league_id, _, year = league.strip().partition(":")
+
+    return int(league_id), int(year) if year else YEAR
+
+
+def main():
+    """
+    Command line entry point for the batch reports
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("leagues", nargs="*", help="Leagues to report, as LEAGUE_ID[:YEAR]")
+    parser.add_argument(
+        "--leagues-file", default=None,
+        help="File listing more leagues, one LEAGUE_ID[:YEAR] per line"
+    )
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Root directory of the reports")
+    parser.add_argument("--workers", type=int, default=None, help="Number of report processes")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of leagues fetched at once"
+    )
+    parser.add_argument(
+        "--plotly-js-url", default=None,
+        help="Load Plotly JS from this URL instead of a shared copy in the output directory"
+    )
+    args = parser.parse_args()
+
+    leagues = list(args.leagues)
+    if args.leagues_file:
+        with open(args.leagues_file, "r", encoding="utf-8") as leagues_file:
+            leagues.extend(
+                line for line in leagues_file if line.strip() and not line.startswith("#")
+            )
+
+    if not leagues:
+        parser.error("no leagues given")
+
+    logging.basicConfig(level=logging.INFO)
+
+    results = run_batch(
+        [parse_league(league) for league in leagues],
+        out_dir=args.out_dir,
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        plotly_js_url=args.plotly_js_url,
+    )
+
+    summary_path = os.path.join(args.out_dir, "batch_report.json")
+    with open(summary_path, "w", encoding="utf-8") as summary_file:
+        json.dump(
+            [
+                {"league_id": league_id, "year": year, **result}
+                for (league_id, year), result in results.items()
+            ],
+            summary_file,
+            indent=2,
+        )
+
+    failed = [league for league, result in results.items() if result["status"] != "ok"]
+    print(f"Wrote {len(results) - len(failed)} of {len(results)} reports")
+    print(f"Summary in {summary_path}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
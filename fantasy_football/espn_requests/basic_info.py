@@ -1,11 +1,39 @@
 """
 Main communication with ESPN fantasy API
 """
-import requests
-
 import pandas as pd
 
-from fantasy_football.espn_requests.constants import BASE_URL
+from fantasy_football.espn_requests.client import ESPNClient, get_default_client
+
+
+class TeamInfo:
+    """
+    Compact metadata of one fantasy team
+
+    Args:
+        team_id (int): The team's ID
+        location (str): First part of the team name
+        nickname (str): Second part of the team name
+        abbrev (str): The team's abbreviation
+
+    Attributes:
+        id (int): The team's ID
+        location (str): First part of the team name
+        nickname (str): Second part of the team name
+        abbrev (str): The team's abbreviation
+        name (str): Full team name, "location nickname"
+    """
+    __slots__ = ("id", "location", "nickname", "abbrev", "name")
+
+    def __init__(self, team_id: int, location: str, nickname: str, abbrev: str):
+        self.id: int = team_id
+        self.location: str = location
+        self.nickname: str = nickname
+        self.abbrev: str = abbrev
+        self.name: str = f"{location} {nickname}"
+
+    def __repr__(self) -> str:
+        return f"TeamInfo(id={self.id!r}, name={self.name!r}, abbrev={self.abbrev!r})"
 
 
 class BasicInfo:
@@ -15,28 +43,41 @@ class BasicInfo:
     Args:
         league_id (int): The ID for the fantasy league
         year (int): The year of the league
+        client (ESPNClient): Shared ESPN client to make requests with (defaults to the shared client)
+        league_info (dict): Already fetched league payload to share instead of fetching again
 
     Attributes:
-        None
+        league_basic_info (dict): Response from ESPN API of league information
 
     Methods:
         get_league_basic_info (dict): Returns dict of basic league information
+        get_league_name (str): Returns the league's name
         get_basic_teams_list (list): Returns list of league teams
         get_team_ids (list): Returns list of team ID strings
+        get_teams (list): Returns list of TeamInfo for every team
+        get_team (TeamInfo): Returns a team's metadata based on it's ID
         get_team_name_by_id (str): Returns a team's name based on it's ID
+        get_team_names (dict): Returns every team's name keyed by team ID
+        get_team_id_by_name (int): Returns a team's ID based on it's name
         get_teams_dataframe (pd.DataFrame): Returns DataFrame of team ID, name, and abbreviation
     """
-    def __init__(self, league_id: int, year: int):
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        client: ESPNClient = None,
+        league_info: dict = None
+    ):
         self._league_id: int = league_id
         self._year: int = year
 
-        self._league_url: str = ""
+        self._client: ESPNClient = client or get_default_client()
 
-        self.league_basic_info: dict = {}
-        self.league_matchup_info: dict = {}
+        self.league_basic_info: dict = league_info if league_info is not None else {}
 
-    def _get_current_league_url(self) -> None:
-        self._league_url = BASE_URL + f"{self._year}/segments/0/leagues/{self._league_id}"
+        self._teams_source: list = None
+        self._teams_by_id: dict = {}
+        self._team_ids_by_name: dict = {}
 
     def get_league_basic_info(self) -> dict:
         """
@@ -48,14 +89,21 @@ class BasicInfo:
         Returns:
             dict: Dictionary of league information from ESPN API
         """
-        if not self._league_url:
-            self._get_current_league_url()
+        self.league_basic_info = self._client.get_league_info(self._league_id, self._year)
 
-        basic_info_response = requests.get(self._league_url)
+        return self.league_basic_info
 
-        self.league_basic_info = basic_info_response.json()
+    def get_league_name(self) -> str:
+        """
+        Returns the league's name, if the payload includes the ``mSettings`` view
 
-        return basic_info_response.json()
+        Args:
+            None
+
+        Returns:
+            str: The league name, or None if unknown
+        """
+        return self.league_basic_info.get("settings", {}).get("name")
 
     def get_basic_teams_list(self) -> list:
         """
@@ -82,24 +130,107 @@ class BasicInfo:
         teams = self.get_basic_teams_list()
         return [team["id"] for team in teams]
 
+    def _get_team_index(self) -> dict:
+        teams = self.get_basic_teams_list()
+
+        # Rebuild only when the teams list has been replaced, e.g. by get_league_basic_info
+        if teams is not self._teams_source:
+            self._teams_by_id = {
+                team["id"]: TeamInfo(
+                    team["id"],
+                    team.get("location", ""),
+                    team.get("nickname", ""),
+                    team.get("abbrev", ""),
+                )
+                for team in teams
+            }
+            self._team_ids_by_name = {
+                team.name: team_id for team_id, team in self._teams_by_id.items()
+            }
+            self._teams_source = teams
+
+        return self._teams_by_id
+
+    def get_teams(self) -> list:
+        """
+        Returns metadata of every team in the league
+
+        Args:
+            None
+
+        Returns:
+            list: list of TeamInfo, in league order
+        """
+        return list(self._get_team_index().values())
+
+    def get_team(self, team_id: int) -> TeamInfo:
+        """
+        Returns the metadata of a team based on it's team ID
+
+        Args:
+            team_id (int): The team's ID
+
+        Returns:
+            TeamInfo: The team's metadata
+
+        Raises:
+            KeyError: If no team in the league has the ID
+        """
+        try:
+            return self._get_team_index()[team_id]
+        except KeyError:
+            raise KeyError(
+                f"No team with ID {team_id} in league {self._league_id} ({self._year})"
+            ) from None
+
     def get_team_name_by_id(self, team_id: int) -> str:
         """
         Returns the name of a team based on it's team ID
 
+        Args:
+            team_id (int): The team's ID
+
         Returns:
             str: The team name
+
+        Raises:
+            KeyError: If no team in the league has the ID
         """
-        basic_team_info = self.get_basic_teams_list()
+        return self.get_team(team_id).name
 
-        # TODO: Add check if input team_id doesn't match any "id"s in the basic_team_info
-        team_name = ""
+    def get_team_names(self) -> dict:
+        """
+        Returns the name of every team in the league
 
-        # TODO: More efficient look-up than for loop needed
-        for team in basic_team_info:
-            if team["id"] == team_id:
-                team_name = "{0} {1}".format(team["location"], team["nickname"])
+        Args:
+            None
 
-        return team_name
+        Returns:
+            dict: Team names keyed by team ID
+        """
+        return {team_id: team.name for team_id, team in self._get_team_index().items()}
+
+    def get_team_id_by_name(self, team_name: str) -> int:
+        """
+        Returns the ID of a team based on it's name
+
+        Args:
+            team_name (str): The team's full name, "location nickname"
+
+        Returns:
+            int: The team's ID
+
+        Raises:
+            KeyError: If no team in the league has the name
+        """
+        self._get_team_index()
+
+        try:
+            return self._team_ids_by_name[team_name]
+        except KeyError:
+            raise KeyError(
+                f"No team named {team_name!r} in league {self._league_id} ({self._year})"
+            ) from None
 
     def get_teams_dataframe(self) -> pd.DataFrame:
         """
@@ -111,13 +242,8 @@ class BasicInfo:
         Returns:
             pd.DataFrame: Pandas DataFrame of team ID, name, and abbreviation
         """
-        teams = self.get_basic_teams_list()
-
         teams_df = pd.DataFrame(
-            [
-                [team["id"], f"{team['location']} {team['nickname']}", team["abbrev"]]
-                for team in teams
-            ],
+            [[team.id, team.name, team.abbrev] for team in self.get_teams()],
             columns=["id", "team name", "abbrev"]
         )
 
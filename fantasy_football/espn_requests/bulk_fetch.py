@@ -0,0 +1,157 @@
+"""
+Concurrent fetching of many leagues and seasons from the ESPN fantasy API
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.client import ESPNClient, get_default_client
+from fantasy_football.espn_requests.constants import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_SECOND,
+    LEAGUE_VIEWS,
+)
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+
+
+class AsyncRateLimiter:
+    """
+    Spaces out requests so no more than ``requests_per_second`` start each second
+
+    Args:
+        requests_per_second (float): Maximum request rate, or None for no limit
+
+    Attributes:
+        None
+
+    Methods:
+        wait (None): Waits until the next request is allowed to start
+    """
+    def __init__(self, requests_per_second: float = None):
+        self._interval: float = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_start: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """
+        Wait until the next request is allowed to start
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self._interval:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def fetch_leagues_async(
+    leagues: list,
+    views: list = None,
+    client: ESPNClient = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    stream: bool = False
+) -> dict:
+    """
+    Concurrently fetch the league payload of many (league_id, year) pairs
+
+    Requests run on a thread pool over the shared pooled client, so at most
+    ``max_concurrency`` are in flight at once, and each host is limited to
+    ``requests_per_second`` new requests per second.
+
+    Args:
+        leagues (list): List of (league_id, year) pairs
+        views (list): ESPN views to request for every league (defaults to LEAGUE_VIEWS)
+        client (ESPNClient): Client to make requests with (defaults to the shared client)
+        max_concurrency (int): Maximum number of requests in flight at once
+        requests_per_second (float): Maximum new requests per second per host, or None for no limit
+        stream (bool): Stream each response and keep only the fields BasicInfo and MatchupInfo use
+
+    Returns:
+        dict: League payloads keyed by (league_id, year)
+    """
+    views = LEAGUE_VIEWS if views is None else views
+    client = client or get_default_client()
+
+    def get_league_info(league_id: int, year: int) -> dict:
+        if stream:
+            league_info, _ = client.stream_league_info(league_id, year, views=views)
+            return league_info
+
+        return client.get_league_info(league_id, year, views)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    rate_limiters = {}
+
+    async def fetch_one(league_id: int, year: int) -> dict:
+        host = urlparse(client.get_league_url(league_id, year)).netloc
+        rate_limiter = rate_limiters.setdefault(host, AsyncRateLimiter(requests_per_second))
+
+        async with semaphore:
+            await rate_limiter.wait()
+            return await loop.run_in_executor(
+                executor, get_league_info, league_id, year
+            )
+
+    leagues = list(dict.fromkeys((league_id, year) for league_id, year in leagues))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        payloads = await asyncio.gather(*(fetch_one(league_id, year) for league_id, year in leagues))
+
+    return dict(zip(leagues, payloads))
+
+
+def fetch_leagues(
+    leagues: list,
+    views: list = None,
+    client: ESPNClient = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND
+) -> dict:
+    """
+    Concurrently fetch many leagues and wrap each in BasicInfo and MatchupInfo
+
+    Args:
+        leagues (list): List of (league_id, year) pairs
+        views (list): ESPN views to request for every league (defaults to LEAGUE_VIEWS)
+        client (ESPNClient): Client to make requests with (defaults to the shared client)
+        max_concurrency (int): Maximum number of requests in flight at once
+        requests_per_second (float): Maximum new requests per second per host, or None for no limit
+
+    Returns:
+        dict: (BasicInfo, MatchupInfo) tuples keyed by (league_id, year)
+    """
+    client = client or get_default_client()
+
+    payloads = asyncio.run(
+        fetch_leagues_async(
+            leagues,
+            views=views,
+            client=client,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            stream=True,
+        )
+    )
+
+    return {
+        (league_id, year): (
+            BasicInfo(league_id, year, client=client, league_info=league_info),
+            MatchupInfo(league_id, year, client=client, league_info=league_info),
+        )
+        for (league_id, year), league_info in payloads.items()
+    }
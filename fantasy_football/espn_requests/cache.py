@@ -0,0 +1,224 @@
+"""
+On-disk cache of ESPN fantasy API responses
+"""
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+
+from fantasy_football.espn_requests.constants import CACHE_DIR, CURRENT_SEASON_TTL
+
+
+class OfflineCacheMiss(LookupError):
+    """
+    Raised when running offline and a request has no cached response
+    """
+
+
+class ResponseCache:
+    """
+    On-disk cache of ESPN fantasy API responses, keyed by (league_id, year, views)
+
+    Each entry is stored as the raw response body plus a small metadata file holding the
+    ``ETag``/``Last-Modified`` validators and the time the entry was last confirmed fresh.
+    Entries for finished seasons never expire; entries for the current season expire after
+    ``current_season_ttl`` seconds, after which they are revalidated with a conditional request.
+
+    Args:
+        cache_dir (str): Directory to store cached responses in
+        current_season_ttl (float): Seconds before a current-season entry must be revalidated
+
+    Attributes:
+        cache_dir (str): Directory cached responses are stored in
+
+    Methods:
+        get_key (str): Returns the cache key for a league request
+        get (dict): Returns the cached metadata for a key, if any
+        load_payload (dict): Returns the cached league payload for a key
+        open_payload (file): Opens the cached response body for a key for streaming
+        is_fresh (bool): Returns whether a cached entry can be used without revalidation
+        put (None): Stores a response body and its validators
+        put_stream (None): Stores a response body read in chunks, and its validators
+        touch (None): Marks an entry as freshly validated (e.g. after a 304)
+    """
+    def __init__(self, cache_dir: str = CACHE_DIR, current_season_ttl: float = CURRENT_SEASON_TTL):
+        self.cache_dir: str = cache_dir
+        self._current_season_ttl: float = current_season_ttl
+
+    @staticmethod
+    def get_key(league_id: int, year: int, views: list = None, params: dict = None) -> str:
+        """
+        Get the cache key for a league request
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            views (list): ESPN views requested
+            params (dict): Any extra query parameters sent with the request
+
+        Returns:
+            str: The cache key, safe to use as a file name
+        """
+        request_id = json.dumps(
+            {"views": sorted(views or []), "params": params or {}}, sort_keys=True
+        )
+        digest = hashlib.sha1(request_id.encode("utf-8")).hexdigest()[:16]
+
+        return f"{league_id}_{year}_{digest}"
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.meta.json")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        self._write_chunks_atomic(path, [data])
+
+    def _write_chunks_atomic(self, path: str, chunks) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as tmp_file:
+                for chunk in chunks:
+                    tmp_file.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> dict:
+        """
+        Get the cached metadata for a key
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            dict: Metadata (year, etag, last_modified, validated_at), or None if not cached
+        """
+        if not os.path.exists(self._body_path(key)):
+            return None
+
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def load_payload(self, key: str) -> dict:
+        """
+        Get the cached league payload for a key
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            dict: The cached league payload
+        """
+        with open(self._body_path(key), "rb") as body_file:
+            return json.load(body_file)
+
+    def open_payload(self, key: str):
+        """
+        Open the cached response body for a key, to be parsed as a stream
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            file: The cached response body, opened in binary mode
+        """
+        return open(self._body_path(key), "rb")
+
+    def is_fresh(self, meta: dict) -> bool:
+        """
+        Whether a cached entry can be used without revalidating it against ESPN
+
+        Args:
+            meta (dict): Cached metadata, as returned by ``get``
+
+        Returns:
+            bool: True if the entry is for a finished season or is within the current-season TTL
+        """
+        if meta["year"] < get_current_season():
+            return True
+
+        return time.time() - meta["validated_at"] < self._current_season_ttl
+
+    def put(self, key: str, year: int, body: bytes, etag: str = None, last_modified: str = None) -> None:
+        """
+        Store a response body and its validators
+
+        Args:
+            key (str): The cache key
+            year (int): The year of the league, used to decide expiry
+            body (bytes): The raw response body
+            etag (str): The response ``ETag`` header, if any
+            last_modified (str): The response ``Last-Modified`` header, if any
+
+        Returns:
+            None
+        """
+        self.put_stream(key, year, [body], etag=etag, last_modified=last_modified)
+
+    def put_stream(
+        self, key: str, year: int, chunks, etag: str = None, last_modified: str = None
+    ) -> None:
+        """
+        Store a response body read in chunks, so it never has to be held in memory whole
+
+        Args:
+            key (str): The cache key
+            year (int): The year of the league, used to decide expiry
+            chunks: Iterable of the raw response body's bytes chunks
+            etag (str): The response ``ETag`` header, if any
+            last_modified (str): The response ``Last-Modified`` header, if any
+
+        Returns:
+            None
+        """
+        meta = {
+            "year": year,
+            "etag": etag,
+            "last_modified": last_modified,
+            "validated_at": time.time(),
+        }
+
+        self._write_chunks_atomic(self._body_path(key), chunks)
+        self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as freshly validated, e.g. after a ``304 Not Modified``
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            None
+        """
+        meta = self.get(key)
+
+        if meta is not None:
+            meta["validated_at"] = time.time()
+            self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+
+
+def get_current_season() -> int:
+    """
+    Get the current NFL season year (a season runs from September into the following year)
+
+    Args:
+        None
+
+    Returns:
+        int: The current season year
+    """
+    today = datetime.date.today()
+
+    return today.year if today.month >= 3 else today.year - 1
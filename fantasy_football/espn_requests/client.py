@@ -0,0 +1,445 @@
+"""
+Shared, pooled HTTP client for the ESPN fantasy API
+"""
+import contextlib
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fantasy_football.espn_requests.cache import OfflineCacheMiss, ResponseCache
+from fantasy_football.espn_requests.constants import (
+    BASE_URL,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    HISTORY_URL,
+    OFFLINE,
+)
+from fantasy_football.espn_requests.stream_parse import parse_league_info
+from fantasy_football.metrics import (
+    CACHE_LOOKUPS,
+    ESPN_REQUEST_SECONDS,
+    ESPN_REQUESTS,
+    ESPN_RESPONSE_BYTES,
+)
+
+
+class ESPNClient:
+    """
+    Pooled HTTP client for the ESPN fantasy API
+
+    A single ``requests.Session`` is shared by every request made through the client, so
+    consecutive league/view fetches reuse the same keep-alive connection instead of paying
+    for a new TCP+TLS handshake each time.
+
+    Args:
+        timeout (float): Seconds to wait for the server before giving up on a request
+        retries (int): Number of times to retry failed connections and 429/5xx responses
+        backoff_factor (float): Exponential backoff factor applied between retries
+        pool_size (int): Maximum number of pooled connections kept per host
+        cache (ResponseCache): On-disk response cache to read from and write to, if any
+        offline (bool): Serve only from the cache and never touch the network
+        requests_per_second (float): Maximum network requests per second, or None for no limit
+
+    Attributes:
+        session (requests.Session): The pooled session used for all requests
+        cache (ResponseCache): On-disk response cache, or None if caching is disabled
+        offline (bool): Whether requests are served only from the cache
+
+    Methods:
+        get_league_url (str): Returns the URL of a league for a given year
+        get_league_history_url (str): Returns the leagueHistory URL used for old seasons
+        get (requests.Response): Sends a GET request through the pooled session
+        get_league_info (dict): Returns the league JSON for the requested views
+        stream_league_info (tuple): Streams a league response, keeping only the fields used
+        close (None): Closes the pooled session
+    """
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        cache: ResponseCache = None,
+        offline: bool = False,
+        requests_per_second: float = None
+    ):
+        self._timeout: float = timeout
+        self._rate_limiter: RateLimiter = RateLimiter(requests_per_second)
+
+        self.cache: ResponseCache = cache
+        self.offline: bool = offline
+
+        if self.offline and self.cache is None:
+            raise ValueError("Offline mode needs a response cache to serve from")
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session: requests.Session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip"})
+
+    @staticmethod
+    def get_league_url(league_id: int, year: int) -> str:
+        """
+        Get the URL of a league for a given year
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+
+        Returns:
+            str: The league URL
+        """
+        return BASE_URL + f"{year}/segments/0/leagues/{league_id}"
+
+    @staticmethod
+    def get_league_history_url(league_id: int) -> str:
+        """
+        Get the ``leagueHistory`` URL of a league, which ESPN uses to serve old seasons
+
+        Args:
+            league_id (int): The ID for the fantasy league
+
+        Returns:
+            str: The league history URL
+        """
+        return HISTORY_URL + f"{league_id}"
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request through the pooled session, recording its status, latency and size
+
+        Args:
+            url (str): The URL to request
+            **kwargs: Extra keyword arguments passed to ``requests.Session.get``
+
+        Returns:
+            requests.Response: The response, after raising for any HTTP error status
+        """
+        kwargs.setdefault("timeout", self._timeout)
+
+        self._rate_limiter.wait()
+
+        start = time.perf_counter()
+
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            ESPN_REQUESTS.inc(status="error")
+            raise
+        finally:
+            ESPN_REQUEST_SECONDS.observe(time.perf_counter() - start)
+
+        ESPN_REQUESTS.inc(status=str(response.status_code))
+
+        # Bytes are counted as read off the wire (before decompression) on both paths. requests
+        # has already read a non-streamed body; a streamed one is counted once it is closed
+        if kwargs.get("stream"):
+            _count_bytes_on_close(response)
+        else:
+            ESPN_RESPONSE_BYTES.inc(response.raw.tell())
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            # A streamed body is never read on error, so release its pooled connection here
+            response.close()
+            raise
+
+        return response
+
+    def get_league_info(
+        self,
+        league_id: int,
+        year: int,
+        views: list = None,
+        params: dict = None,
+        headers: dict = None,
+        use_cache: bool = True,
+        history: bool = False
+    ) -> dict:
+        """
+        Get league information from the ESPN API
+
+        When a cache is configured, fresh entries are served straight from disk and stale ones
+        are revalidated with ``If-None-Match``/``If-Modified-Since`` so an unchanged league costs
+        a ``304`` instead of the full payload.
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            views (list): ESPN views to request (e.g. ``["mMatchup"]``), or None for the bare league
+            params (dict): Extra query parameters, e.g. ``{"scoringPeriodId": 5}``
+            headers (dict): Extra request headers, e.g. an ``X-Fantasy-Filter``
+            use_cache (bool): Whether to use the response cache for this request
+            history (bool): Request the season from the ``leagueHistory`` endpoint (old seasons)
+
+        Returns:
+            dict: Dictionary of league information from ESPN API
+
+        Raises:
+            OfflineCacheMiss: If running offline and the request has not been cached
+        """
+        url, params = self._get_league_request(league_id, year, params, history)
+
+        league_info = self._get_league_json(
+            url, league_id, year, views, params, headers, use_cache
+        )
+
+        # leagueHistory answers with a list holding the one requested season
+        if history and isinstance(league_info, list):
+            league_info = league_info[0] if league_info else {}
+
+        return league_info
+
+    def stream_league_info(
+        self,
+        league_id: int,
+        year: int,
+        views: list = None,
+        params: dict = None,
+        history: bool = False,
+        scoring_period_id: int = None
+    ) -> tuple:
+        """
+        Get league information from the ESPN API, parsing the response as a stream
+
+        Only the fields used by BasicInfo, MatchupInfo and RosterInfo are kept, so large
+        roster/box score payloads are never built in memory as nested dicts. Responses are
+        cached and revalidated the same way as ``get_league_info``, but written to disk in chunks.
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            views (list): ESPN views to request (e.g. ``["mRoster", "mBoxscore"]``)
+            params (dict): Extra query parameters, e.g. ``{"scoringPeriodId": 5}``
+            history (bool): Request the season from the ``leagueHistory`` endpoint (old seasons)
+            scoring_period_id (int): Scoring period whose player points should be read from rosters
+
+        Returns:
+            dict: League payload with only the teams, schedule, status and settings fields
+            dict: Roster columns (Team, Player, Slot, Position, Points) and a player_names dict
+
+        Raises:
+            OfflineCacheMiss: If running offline and the request has not been cached
+        """
+        url, params = self._get_league_request(league_id, year, params, history)
+
+        with self._open_league_body(url, league_id, year, views, params) as body_file:
+            return parse_league_info(body_file, scoring_period_id)
+
+    def _get_league_request(self, league_id: int, year: int, params: dict, history: bool) -> tuple:
+        if history:
+            return self.get_league_history_url(league_id), {**(params or {}), "seasonId": year}
+
+        return self.get_league_url(league_id, year), params
+
+    @contextlib.contextmanager
+    def _open_league_body(self, url: str, league_id: int, year: int, views: list, params: dict):
+        extra_params = params
+        params = dict(params or {})
+        if views:
+            params["view"] = list(views)
+
+        if self.cache is None:
+            with self.get(url, params=params, stream=True) as response:
+                response.raw.decode_content = True
+                yield response.raw
+            return
+
+        key = self.cache.get_key(league_id, year, views, extra_params)
+        meta = self.cache.get(key)
+
+        if self.offline and meta is None:
+            raise OfflineCacheMiss(
+                f"No cached response for league {league_id} ({year}) with views {views}"
+            )
+
+        if meta is None or not (self.offline or self.cache.is_fresh(meta)):
+            headers = {}
+            if meta is not None:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            with self.get(url, params=params, headers=headers, stream=True) as response:
+                if response.status_code == 304 and meta is not None:
+                    CACHE_LOOKUPS.inc(result="revalidated")
+                    self.cache.touch(key)
+                else:
+                    CACHE_LOOKUPS.inc(result="miss")
+                    self.cache.put_stream(
+                        key,
+                        year,
+                        response.iter_content(chunk_size=64 * 1024),
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    )
+        else:
+            CACHE_LOOKUPS.inc(result="offline_hit" if self.offline else "hit")
+
+        with self.cache.open_payload(key) as body_file:
+            yield body_file
+
+    def _get_league_json(
+        self,
+        url: str,
+        league_id: int,
+        year: int,
+        views: list,
+        params: dict,
+        headers: dict,
+        use_cache: bool
+    ):
+        extra_params = params
+        params = dict(params or {})
+        if views:
+            params["view"] = list(views)
+
+        if self.cache is None or (not use_cache and not self.offline):
+            return self.get(url, params=params, headers=headers).json()
+
+        key = self.cache.get_key(league_id, year, views, extra_params)
+        meta = self.cache.get(key)
+
+        if self.offline:
+            if meta is None:
+                raise OfflineCacheMiss(
+                    f"No cached response for league {league_id} ({year}) with views {views}"
+                )
+            CACHE_LOOKUPS.inc(result="offline_hit")
+            return self.cache.load_payload(key)
+
+        if meta is not None and self.cache.is_fresh(meta):
+            CACHE_LOOKUPS.inc(result="hit")
+            return self.cache.load_payload(key)
+
+        headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and meta is not None:
+            CACHE_LOOKUPS.inc(result="revalidated")
+            self.cache.touch(key)
+            return self.cache.load_payload(key)
+
+        CACHE_LOOKUPS.inc(result="miss")
+        self.cache.put(
+            key,
+            year,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+        return response.json()
+
+    def close(self) -> None:
+        """
+        Close the pooled session and release its connections
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.session.close()
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing out requests so no more than ``requests_per_second`` start a second
+
+    Args:
+        requests_per_second (float): Maximum request rate, or None for no limit
+
+    Attributes:
+        None
+
+    Methods:
+        wait (None): Blocks until the next request is allowed to start
+    """
+    def __init__(self, requests_per_second: float = None):
+        self._interval: float = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_start: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Block until the next request is allowed to start
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self._interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+_DEFAULT_CLIENT = None
+
+
+def _count_bytes_on_close(response: requests.Response) -> None:
+    close = response.close
+    counted = False
+
+    def close_and_count():
+        nonlocal counted
+
+        if not counted:
+            counted = True
+            ESPN_RESPONSE_BYTES.inc(response.raw.tell())
+
+        close()
+
+    response.close = close_and_count
+
+
+def get_default_client() -> ESPNClient:
+    """
+    Get the process-wide shared ESPN client, creating it on first use
+
+    The shared client caches responses on disk and runs offline when the
+    ``FANTASY_FOOTBALL_OFFLINE`` environment variable is set.
+
+    Args:
+        None
+
+    Returns:
+        ESPNClient: The shared client
+    """
+    global _DEFAULT_CLIENT  # pylint: disable=W0603
+
+    if _DEFAULT_CLIENT is None:
+        _DEFAULT_CLIENT = ESPNClient(cache=ResponseCache(), offline=OFFLINE)
+
+    return _DEFAULT_CLIENT
@@ -1,7 +1,39 @@
 """
 Contains constants for interacting with ESPN fantasy API
 """
+import os
 
 BASE_URL = "https://fantasy.espn.com/apis/v3/games/ffl/seasons/"
+HISTORY_URL = "https://fantasy.espn.com/apis/v3/games/ffl/leagueHistory/"
+
+# Seasons before this year are only served through HISTORY_URL
+HISTORY_CUTOFF_YEAR = 2018
 LEAGUE_ID = 53946782
 YEAR = 2020
+
+# Views fetched together in a single league request
+LEAGUE_VIEWS = ["mTeam", "mMatchup", "mMatchupScore", "mRoster", "mSettings"]
+
+# Lineup slots that don't count towards a team's score (bench and injured reserve)
+BENCH_LINEUP_SLOT_IDS = [20, 21]
+
+# HTTP client settings
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_POOL_SIZE = 10
+
+# Bulk fetch settings
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+# Response cache settings
+CACHE_DIR = os.environ.get(
+    "FANTASY_FOOTBALL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "fantasy_football")
+)
+CURRENT_SEASON_TTL = 300.0
+OFFLINE = os.environ.get("FANTASY_FOOTBALL_OFFLINE", "") not in ("", "0")
+
+# Backend of MatchupInfo's DataFrame dtypes: "pyarrow" for Arrow-backed columns (pandas 2), or
+# None for NumPy
+DTYPE_BACKEND = os.environ.get("FANTASY_FOOTBALL_DTYPE_BACKEND") or None
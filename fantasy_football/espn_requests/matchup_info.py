@@ -1,11 +1,14 @@
 """
 Getting matchup information for a league
 """
-import requests
-
+import numpy as np
 import pandas as pd
 
-from fantasy_football.espn_requests.constants import BASE_URL
+from fantasy_football.analytics.running_stats import RunningLeagueStats
+from fantasy_football.espn_requests.client import ESPNClient, get_default_client
+from fantasy_football.espn_requests.constants import DTYPE_BACKEND
+
+DTYPE_BACKENDS = (None, "pyarrow")
 
 
 class MatchupInfo:
@@ -15,29 +18,54 @@ class MatchupInfo:
     Args:
         league_id (int): The ID for the fantasy league
         year (int): The year of the league
+        client (ESPNClient): Shared ESPN client to make requests with (defaults to the shared client)
+        league_info (dict): Already fetched league payload to share instead of fetching again
+        dtype_backend (str): "pyarrow" to return Arrow-backed DataFrames (needs pandas 2 and
+            pyarrow), or None for NumPy dtypes
 
     Attributes:
         league_matchup_info (dict): Response from ESPN API of matchup information
 
     Methods:
         get_league_matchup_info (dict): Returns dict of league matchup information
+        get_current_matchup_period (int): Returns the league's in-progress matchup period
+        get_playoff_settings (dict): Returns the league's playoff size and regular season length
+        update_schedule (set): Merges updated games into the schedule, returning affected team IDs
         get_all_games_df (pd.DataFrame): Returns DataFrame of each game score
+        get_team_results (pd.DataFrame): Returns long DataFrame of each team's result for each week
+        get_running_stats (RunningLeagueStats): Returns running aggregates of the finalized weeks
         get_all_team_weekly_wins (pd.DataFrame): Get DataFrame of each team's result for each week
         get_all_teams_total_wins (pd.Series): Get Series showing each team's total wins
         get_single_team_total_wins (int): Get the total wins of a given team
         get_all_game_margins (pd.DataFrame): Returns DataFrame of each game margin of victory
         get_weekly_average_score (pd.DataFrame): Returns DataFrame of average score for each week
     """
-    def __init__(self, league_id: int, year: int):
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        client: ESPNClient = None,
+        league_info: dict = None,
+        dtype_backend: str = DTYPE_BACKEND
+    ):
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(
+                f"dtype_backend must be one of {DTYPE_BACKENDS}, not {dtype_backend!r}"
+            )
+
         self._league_id: int = league_id
         self._year: int = year
+        self._dtype_backend: str = dtype_backend
 
-        self._league_url: str = ""
+        self._client: ESPNClient = client or get_default_client()
 
-        self.league_matchup_info: dict = {}
+        self.league_matchup_info: dict = league_info if league_info is not None else {}
 
-    def _get_current_league_url(self) -> None:
-        self._league_url = BASE_URL + f"{self._year}/segments/0/leagues/{self._league_id}"
+        self._team_results: pd.DataFrame = None
+
+        self._running_stats: RunningLeagueStats = None
+        self._game_indexes_by_week: dict = None
+        self._pending_weeks: set = set()
 
     def get_league_matchup_info(self) -> dict:
         """
@@ -49,15 +77,92 @@ class MatchupInfo:
         Returns:
             dict: Dictionary of matchup information
         """
-        if not self._league_url:
-            self._get_current_league_url()
+        self.league_matchup_info = self._client.get_league_info(
+            self._league_id, self._year, views=["mMatchup"]
+        )
+        self._team_results = None
+        self._running_stats = None
+
+        return self.league_matchup_info
+
+    def get_current_matchup_period(self) -> int:
+        """
+        Get the league's current (in-progress) matchup period
+
+        Args:
+            None
+
+        Returns:
+            int: The current matchup period, or None if the league has no status information
+        """
+        return self.league_matchup_info.get("status", {}).get("currentMatchupPeriod")
+
+    def get_playoff_settings(self) -> dict:
+        """
+        Get the league's playoff settings (from the ``mSettings`` view)
+
+        Args:
+            None
+
+        Returns:
+            dict: playoff_team_count and regular_season_weeks, falling back to ESPN's defaults
+                for anything the payload doesn't include
+        """
+        schedule_settings = self.league_matchup_info.get("settings", {}).get("scheduleSettings", {})
+
+        return {
+            "playoff_team_count": schedule_settings.get("playoffTeamCount", 4),
+            "regular_season_weeks": schedule_settings.get("matchupPeriodCount"),
+        }
+
+    def update_schedule(self, games: list) -> set:
+        """
+        Merge updated games (e.g. a live ``mMatchupScore`` poll) into the schedule
 
-        matchups_response = requests.get(self._league_url, params={"view": "mMatchup"})
+        Games are matched on their ESPN game ``id``; games with no match are appended.
 
-        self.league_matchup_info = matchups_response.json()
+        Args:
+            games (list): List of ESPN schedule entries
 
-        return matchups_response.json()
+        Returns:
+            set: IDs of teams whose games changed
+        """
+        schedule = self.league_matchup_info.setdefault("schedule", [])
+        index_by_game_id = {game.get("id"): i for i, game in enumerate(schedule)}
+
+        changed_team_ids = set()
+        changed_weeks = set()
+
+        for game in games:
+            i = index_by_game_id.get(game.get("id"))
+
+            if i is None:
+                schedule.append(game)
+                if self._game_indexes_by_week is not None:
+                    self._game_indexes_by_week.setdefault(game["matchupPeriodId"], []).append(
+                        len(schedule) - 1
+                    )
+            elif _game_result(schedule[i]) != _game_result(game):
+                schedule[i] = game
+            else:
+                continue
 
+            changed_team_ids.update(
+                game[side]["teamId"] for side in ("home", "away") if side in game
+            )
+            changed_weeks.add(game["matchupPeriodId"])
+
+        if changed_team_ids:
+            self._team_results = None
+
+        if self._running_stats is not None:
+            if any(self._running_stats.has_week(week) for week in changed_weeks):
+                # A week already folded in changed (e.g. a stat correction), so start over
+                self._running_stats = None
+            else:
+                self._pending_weeks.update(changed_weeks)
+
+        return changed_team_ids
 
     def get_all_games_df(self) -> pd.DataFrame:
         """
@@ -69,24 +174,136 @@ class MatchupInfo:
         Returns:
             pd.DataFrame: Pandas DataFrame of all game matchup scores
         """
-        games_df = [
-            [
+        return self._to_frame(self._get_game_columns())
+
+    def _get_game_columns(self) -> dict:
+        games = [
+            (
                 game["matchupPeriodId"],
                 game["home"]["teamId"],
                 game["home"]["totalPoints"],
                 game["away"]["teamId"],
                 game["away"]["totalPoints"],
-                game["winner"]
-            ]
+                game["winner"],
+            )
             for game in self.league_matchup_info["schedule"]
         ]
 
-        games_df = pd.DataFrame(
-            games_df,
-            columns=["Week", "Team1", "Score1", "Team2", "Score2", "Winner"]
+        week, team1, score1, team2, score2, winner = zip(*games) if games else ((),) * 6
+
+        return {
+            "Week": np.array(week, dtype=np.int64),
+            "Team1": np.array(team1, dtype=np.int64),
+            "Score1": np.array(score1, dtype=np.float64),
+            "Team2": np.array(team2, dtype=np.int64),
+            "Score2": np.array(score2, dtype=np.float64),
+            "Winner": np.array(winner, dtype=object),
+        }
+
+    def _get_team_week_columns(self, game_columns: dict) -> dict:
+        # Each game becomes a home row then an away row, each column one allocation
+        week = game_columns["Week"]
+        team1, team2 = game_columns["Team1"], game_columns["Team2"]
+        score1, score2 = game_columns["Score1"], game_columns["Score2"]
+
+        return {
+            "Week": np.concatenate([week, week]),
+            "Team": np.concatenate([team1, team2]),
+            "Opponent": np.concatenate([team2, team1]),
+            "PointsFor": np.concatenate([score1, score2]),
+            "PointsAgainst": np.concatenate([score2, score1]),
+        }
+
+    def _to_frame(self, columns: dict) -> pd.DataFrame:
+        frame = pd.DataFrame(columns)
+
+        if self._dtype_backend == "pyarrow":
+            frame = frame.astype({
+                name: "string[pyarrow]" if values.dtype.kind in "OU" else f"{values.dtype}[pyarrow]"
+                for name, values in columns.items()
+            })
+
+        return frame
+
+    def get_team_results(self) -> pd.DataFrame:
+        """
+        Get long-format pandas DataFrame of every team's result for every week
+
+        Built in one vectorized pass over the games (each game contributes a home row and an
+        away row) and cached on the instance, so repeated win lookups don't re-walk the schedule.
+
+        Args:
+            None
+
+        Returns:
+            pd.DataFrame: One row per team per week with columns Week, Team, Opponent,
+                PointsFor, PointsAgainst, Result ("W", "L", "T", or "U" if undecided) and Win
+        """
+        if self._team_results is not None:
+            return self._team_results
+
+        game_columns = self._get_game_columns()
+        winner = np.char.upper(game_columns["Winner"].astype(str))
+
+        home_won = winner == "HOME"
+        away_won = winner == "AWAY"
+        tied = winner == "TIE"
+
+        columns = self._get_team_week_columns(game_columns)
+        columns["Result"] = np.concatenate([
+            np.select([home_won, away_won, tied], ["W", "L", "T"], "U"),
+            np.select([away_won, home_won, tied], ["W", "L", "T"], "U"),
+        ]).astype(object)
+        columns["Win"] = (columns["Result"] == "W").astype(np.int64)
+
+        # Sorted on the arrays, so the frame is only built once
+        order = np.lexsort((columns["Team"], columns["Week"]))
+
+        self._team_results = self._to_frame(
+            {name: values[order] for name, values in columns.items()}
         )
 
-        return games_df
+        return self._team_results
+
+    def get_running_stats(self) -> RunningLeagueStats:
+        """
+        Get running aggregates (records, points, weekly means and deviations) of the final weeks
+
+        The first call folds in every finalized week. Later calls only fold in weeks that
+        ``update_schedule`` has since changed and that are now final, in O(teams) per week.
+
+        Args:
+            None
+
+        Returns:
+            RunningLeagueStats: Aggregates of every week whose games are all decided
+        """
+        schedule = self.league_matchup_info.get("schedule", [])
+
+        if self._running_stats is None:
+            self._running_stats = RunningLeagueStats(self._get_league_team_ids())
+
+            self._game_indexes_by_week = {}
+            for i, game in enumerate(schedule):
+                self._game_indexes_by_week.setdefault(game["matchupPeriodId"], []).append(i)
+
+            self._pending_weeks = set(self._game_indexes_by_week)
+
+        for week in sorted(self._pending_weeks):
+            week_games = [schedule[i] for i in self._game_indexes_by_week.get(week, [])]
+
+            if week_games and all(
+                str(game.get("winner", "UNDECIDED")).upper() != "UNDECIDED" for game in week_games
+            ):
+                self._running_stats.add_week(week, week_games)
+
+        # Weeks that are not final yet are checked again once update_schedule changes them
+        self._pending_weeks = set()
+
+        return self._running_stats
+
+    def _get_league_team_ids(self) -> list:
+        return [team.get("id") for team in self.league_matchup_info["teams"]]
 
     def get_all_team_weekly_wins(self) -> pd.DataFrame:
         """
@@ -95,23 +312,11 @@ class MatchupInfo:
         Returns:
             pd.DataFrame: df showing each team's (axis 0) win/loss result for each week (axis 1)
         """
-        teams_dict = {team.get("id"): {} for team in self.league_matchup_info["teams"]}
-
-        for team in self.league_matchup_info["teams"]:
-            team_id = team.get("id")
-
-            for game in self.league_matchup_info["schedule"]:
-                if team_id == game["home"]["teamId"] or team_id == game["away"]["teamId"]:
-                    if team_id == game["home"]["teamId"]:
-                        team_loc = "home"
-                    elif team_id == game["away"]["teamId"]:
-                        team_loc = "away"
+        team_results = self.get_team_results()
 
-                    teams_dict[team_id][game["matchupPeriodId"]] = int(
-                        team_loc == game["winner"].lower()
-                    )
+        weekly_wins = team_results.pivot(index="Week", columns="Team", values="Win")
 
-        return pd.DataFrame(teams_dict)
+        return weekly_wins.reindex(columns=self._get_league_team_ids())
 
     def get_all_teams_total_wins(self) -> pd.Series:
         """
@@ -120,8 +325,11 @@ class MatchupInfo:
         Returns:
             pd.Series: Series giving total wins for each team (Series index is team id)
         """
-        weekly_wins = self.get_all_team_weekly_wins()
-        return weekly_wins.sum(axis=0)
+        team_results = self.get_team_results()
+
+        total_wins = team_results.groupby("Team")["Win"].sum()
+
+        return total_wins.reindex(self._get_league_team_ids(), fill_value=0)
 
     def get_single_team_total_wins(self, team_id: int) -> int:
         """
@@ -131,54 +339,68 @@ class MatchupInfo:
             int: Total number of wins for a single team
         """
         all_teams_total_wins = self.get_all_teams_total_wins()
-        # TODO: Add exception for when team_id not in all_teams_total_wins
+
+        if team_id not in all_teams_total_wins.index:
+            raise KeyError(f"Team ID {team_id} is not in league {self._league_id} ({self._year})")
+
         return all_teams_total_wins[team_id]
 
     def get_all_game_margins(self) -> pd.DataFrame:
         """
         Get pandas DataFrame of margin of victory (or defeat) for all games
 
+        Every game gives a row for each team (all home rows, then all away rows), built straight
+        from the schedule's arrays with a fresh RangeIndex.
+
         Args:
             None
 
         Returns:
-            pd.DataFrame: Pandas DataFrame of all game margins
+            pd.DataFrame: Week, Team, Opponent, PointsFor, PointsAgainst and Margin for each team
+                in each game
         """
-        games_df = self.get_all_games_df()
-
-        game_margins = games_df.assign(
-            Margin1 = games_df['Score1'] - games_df['Score2'],
-            Margin2 = games_df['Score2'] - games_df['Score1']
-        )
-
-        game_margins = (
-            game_margins[['Week', 'Team1', 'Margin1']]
-            .rename(columns={'Team1': 'Team', 'Margin1': 'Margin'})
-            .append(game_margins[['Week', 'Team2', 'Margin2']]
-            .rename(columns={'Team2': 'Team', 'Margin2': 'Margin'}))
-        )
+        columns = self._get_team_week_columns(self._get_game_columns())
+        columns["Margin"] = columns["PointsFor"] - columns["PointsAgainst"]
 
-        return game_margins
+        return self._to_frame(columns)
 
     def get_weekly_average_score(self) -> pd.DataFrame:
         """
         Get the average league score for each week
 
+        Final weeks are read from the running aggregates (see get_running_stats), so only the
+        weeks still in progress or to come are averaged from the schedule.
+
         Args:
             None
 
         Returns:
-            pd.DataFrame: The average team score for every week of the season
+            pd.DataFrame: Week and Score, the average team score for every week of the season
         """
-        games_df = self.get_all_games_df()
+        weekly_stats = self.get_running_stats().get_weekly_stats()
+        final_weeks = weekly_stats["Week"].to_numpy(dtype=np.int64)
+
+        columns = self._get_team_week_columns(self._get_game_columns())
+        is_open = ~np.isin(columns["Week"], final_weeks)
 
-        avgs = (
-            games_df
-            .filter(['Week', 'Score1', 'Score2'])
-            .melt(id_vars=['Week'], value_name='Score')
-            .groupby('Week')
-            .mean()
-            .reset_index()
+        open_weeks, week_index = np.unique(columns["Week"][is_open], return_inverse=True)
+        score_sums = np.bincount(
+            week_index, weights=columns["PointsFor"][is_open], minlength=len(open_weeks)
         )
+        score_counts = np.bincount(week_index, minlength=len(open_weeks))
+
+        weeks = np.concatenate([final_weeks, open_weeks])
+        scores = np.concatenate([
+            weekly_stats["Score"].to_numpy(dtype=np.float64), score_sums / score_counts
+        ])
+        order = np.argsort(weeks, kind="stable")
+
+        return self._to_frame({"Week": weeks[order], "Score": scores[order]})
+
 
-        return avgs
+def _game_result(game: dict) -> tuple:
+    return (
+        game.get("home", {}).get("totalPoints"),
+        game.get("away", {}).get("totalPoints"),
+        game.get("winner"),
+    )
@@ -0,0 +1,240 @@
+"""
+Getting roster and box score information for a league
+"""
+import numpy as np
+import pandas as pd
+
+from fantasy_football.espn_requests.client import ESPNClient, get_default_client
+from fantasy_football.espn_requests.constants import BENCH_LINEUP_SLOT_IDS
+
+
+class RosterInfo:
+    """
+    Getting roster and box score information for a league
+
+    Player-week points are stored as compact columns (small int ids, float32 points) rather
+    than as the nested ESPN payload, one scoring period at a time.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        client (ESPNClient): Shared ESPN client to make requests with (defaults to the shared client)
+        history (bool): Fetch from the ``leagueHistory`` endpoint, for old seasons
+
+    Attributes:
+        player_names (dict): Player full names keyed by player ID
+
+    Methods:
+        get_league_roster_info (dict): Returns dict of roster information for one scoring period
+        add_scoring_period (None): Adds one scoring period's rosters from an ESPN payload
+        add_scoring_period_columns (None): Adds one scoring period's already-parsed roster columns
+        get_all_scoring_periods (None): Fetches and adds rosters for several scoring periods
+        get_player_weeks_df (pd.DataFrame): Returns DataFrame of each rostered player's weekly points
+    """
+    def __init__(self, league_id: int, year: int, client: ESPNClient = None, history: bool = False):
+        self._league_id: int = league_id
+        self._year: int = year
+        self._history: bool = history
+
+        self._client: ESPNClient = client or get_default_client()
+
+        self._columns: dict = {
+            "Week": [], "Team": [], "Player": [], "Slot": [], "Position": [], "Points": []
+        }
+        self._player_weeks: pd.DataFrame = None
+
+        self.player_names: dict = {}
+
+    def get_league_roster_info(self, scoring_period_id: int) -> dict:
+        """
+        Get a league's rosters and box scores for one scoring period from the ESPN API
+
+        Args:
+            scoring_period_id (int): The scoring period (week) to get rosters for
+
+        Returns:
+            dict: Dictionary of roster information
+        """
+        return self._client.get_league_info(
+            self._league_id,
+            self._year,
+            views=["mRoster", "mBoxscore"],
+            params={"scoringPeriodId": scoring_period_id},
+            history=self._history,
+        )
+
+    def add_scoring_period(self, scoring_period_id: int, roster_info: dict) -> None:
+        """
+        Add one scoring period's rosters from an ESPN ``mRoster`` payload
+
+        Args:
+            scoring_period_id (int): The scoring period (week) the payload is for
+            roster_info (dict): ESPN payload, as from get_league_roster_info
+
+        Returns:
+            None
+        """
+        rows = []
+        player_names = {}
+
+        for team in roster_info.get("teams", []):
+            for full_entry in team.get("roster", {}).get("entries", []):
+                entry = get_roster_entry(full_entry)
+
+                rows.append(get_roster_row(team["id"], entry, scoring_period_id))
+                player_names[entry["playerId"]] = entry["fullName"]
+
+        self.add_scoring_period_columns(scoring_period_id, to_roster_columns(rows, player_names))
+
+    def add_scoring_period_columns(self, scoring_period_id: int, roster_columns: dict) -> None:
+        """
+        Add one scoring period's rosters from already-parsed columns
+
+        Args:
+            scoring_period_id (int): The scoring period (week) the columns are for
+            roster_columns (dict): Team, Player, Slot, Position and Points arrays (and optionally
+                player_names), as from stream_parse.parse_league_info
+
+        Returns:
+            None
+        """
+        num_rows = len(roster_columns["Player"])
+
+        if not num_rows:
+            return
+
+        self._columns["Week"].append(np.full(num_rows, scoring_period_id, dtype=np.int16))
+        self._columns["Team"].append(np.asarray(roster_columns["Team"], dtype=np.int16))
+        self._columns["Player"].append(np.asarray(roster_columns["Player"], dtype=np.int32))
+        self._columns["Slot"].append(np.asarray(roster_columns["Slot"], dtype=np.int16))
+        self._columns["Position"].append(np.asarray(roster_columns["Position"], dtype=np.int16))
+        self._columns["Points"].append(np.asarray(roster_columns["Points"], dtype=np.float32))
+
+        self.player_names.update(roster_columns.get("player_names", {}))
+
+        self._player_weeks = None
+
+    def get_all_scoring_periods(self, scoring_period_ids: list) -> None:
+        """
+        Fetch and add rosters for several scoring periods over the shared client
+
+        Args:
+            scoring_period_ids (list): The scoring periods (weeks) to get rosters for
+
+        Returns:
+            None
+        """
+        for scoring_period_id in scoring_period_ids:
+            _, roster_columns = self._client.stream_league_info(
+                self._league_id,
+                self._year,
+                views=["mRoster", "mBoxscore"],
+                params={"scoringPeriodId": scoring_period_id},
+                history=self._history,
+                scoring_period_id=scoring_period_id,
+            )
+            self.add_scoring_period_columns(scoring_period_id, roster_columns)
+
+    def get_player_weeks_df(self) -> pd.DataFrame:
+        """
+        Gets pandas DataFrame of each rostered player's points for each scoring period
+
+        Args:
+            None
+
+        Returns:
+            pd.DataFrame: One row per rostered player per week with columns Week, Team, Player,
+                Slot, Position, Points (float32) and Starter
+        """
+        if self._player_weeks is None:
+            self._player_weeks = pd.DataFrame({
+                column: np.concatenate(arrays) if arrays else np.array([], dtype=np.int32)
+                for column, arrays in self._columns.items()
+            })
+            self._player_weeks["Starter"] = ~self._player_weeks["Slot"].isin(BENCH_LINEUP_SLOT_IDS)
+
+        return self._player_weeks
+
+
+def get_roster_entry(full_entry: dict) -> dict:
+    """
+    Get the fields of an ESPN roster entry that roster rows are built from
+
+    Args:
+        full_entry (dict): Roster entry from an ESPN ``mRoster`` payload
+
+    Returns:
+        dict: playerId, lineupSlotId, appliedStatTotal, fullName, defaultPositionId and the
+            player's stats, as stream_parse collects them
+    """
+    player_pool_entry = full_entry.get("playerPoolEntry", {})
+    player = player_pool_entry.get("player", {})
+
+    return {
+        "playerId": full_entry.get("playerId"),
+        "lineupSlotId": full_entry.get("lineupSlotId"),
+        "appliedStatTotal": player_pool_entry.get("appliedStatTotal"),
+        "fullName": player.get("fullName", ""),
+        "defaultPositionId": player.get("defaultPositionId"),
+        "stats": player.get("stats", []),
+    }
+
+
+def get_roster_row(team_id: int, entry: dict, scoring_period_id: int) -> tuple:
+    """
+    Get one rostered player's row for a scoring period
+
+    Points are the player's actual (statSourceId 0) applied total for the scoring period,
+    falling back to the entry's appliedStatTotal. A missing slot or position becomes -1.
+
+    Args:
+        team_id (int): ID of the team the player is rostered on
+        entry (dict): Roster entry, as from get_roster_entry
+        scoring_period_id (int): The scoring period (week) to read points for
+
+    Returns:
+        tuple: (team ID, player ID, lineup slot ID, default position ID, points)
+    """
+    points = entry.get("appliedStatTotal") or 0.0
+
+    for stat in entry.get("stats", []):
+        if stat.get("scoringPeriodId") == scoring_period_id and stat.get("statSourceId") == 0:
+            points = stat.get("appliedTotal", 0.0)
+            break
+
+    slot_id = entry.get("lineupSlotId")
+    position_id = entry.get("defaultPositionId")
+
+    return (
+        team_id,
+        entry.get("playerId"),
+        -1 if slot_id is None else slot_id,
+        -1 if position_id is None else position_id,
+        points,
+    )
+
+
+def to_roster_columns(roster_rows: list, player_names: dict) -> dict:
+    """
+    Get compact roster columns from roster rows
+
+    Args:
+        roster_rows (list): Rows, as from get_roster_row
+        player_names (dict): Player full names keyed by player ID
+
+    Returns:
+        dict: Team, Player, Slot, Position and Points arrays and the player_names dict, as
+            RosterInfo.add_scoring_period_columns takes them
+    """
+    team_ids, player_ids, slot_ids, position_ids, points = (
+        zip(*roster_rows) if roster_rows else ((), (), (), (), ())
+    )
+
+    return {
+        "Team": np.array(team_ids, dtype=np.int16),
+        "Player": np.array(player_ids, dtype=np.int32),
+        "Slot": np.array(slot_ids, dtype=np.int16),
+        "Position": np.array(position_ids, dtype=np.int16),
+        "Points": np.array(points, dtype=np.float32),
+        "player_names": player_names,
+    }
@@ -0,0 +1,202 @@
+"""
+Streaming parser that pulls only the fields the analytics use out of ESPN league payloads
+"""
+import json
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - falls back to json.load
+    ijson = None
+
+# Payload paths kept from the league, its teams and its schedule (ijson prefix -> key path)
+_LEAGUE_FIELDS = {
+    "id": ("id",),
+    "seasonId": ("seasonId",),
+    "scoringPeriodId": ("scoringPeriodId",),
+    "status.currentMatchupPeriod": ("status", "currentMatchupPeriod"),
+    "status.finalScoringPeriod": ("status", "finalScoringPeriod"),
+    "status.isActive": ("status", "isActive"),
+    "settings.name": ("settings", "name"),
+    "settings.scheduleSettings.matchupPeriodCount": (
+        "settings", "scheduleSettings", "matchupPeriodCount"
+    ),
+    "settings.scheduleSettings.playoffTeamCount": (
+        "settings", "scheduleSettings", "playoffTeamCount"
+    ),
+}
+_TEAM_FIELDS = {
+    "teams.item.id": ("id",),
+    "teams.item.location": ("location",),
+    "teams.item.nickname": ("nickname",),
+    "teams.item.abbrev": ("abbrev",),
+}
+_GAME_FIELDS = {
+    "schedule.item.id": ("id",),
+    "schedule.item.matchupPeriodId": ("matchupPeriodId",),
+    "schedule.item.winner": ("winner",),
+    "schedule.item.home.teamId": ("home", "teamId"),
+    "schedule.item.home.totalPoints": ("home", "totalPoints"),
+    "schedule.item.away.teamId": ("away", "teamId"),
+    "schedule.item.away.totalPoints": ("away", "totalPoints"),
+}
+
+_ENTRY = "teams.item.roster.entries.item"
+_ENTRY_FIELDS = {
+    f"{_ENTRY}.playerId": "playerId",
+    f"{_ENTRY}.lineupSlotId": "lineupSlotId",
+    f"{_ENTRY}.playerPoolEntry.appliedStatTotal": "appliedStatTotal",
+    f"{_ENTRY}.playerPoolEntry.player.fullName": "fullName",
+    f"{_ENTRY}.playerPoolEntry.player.defaultPositionId": "defaultPositionId",
+}
+_STAT = f"{_ENTRY}.playerPoolEntry.player.stats.item"
+_STAT_FIELDS = {
+    f"{_STAT}.scoringPeriodId": "scoringPeriodId",
+    f"{_STAT}.statSourceId": "statSourceId",
+    f"{_STAT}.appliedTotal": "appliedTotal",
+}
+
+
+def parse_league_info(file_obj, scoring_period_id: int = None) -> tuple:
+    """
+    Parse an ESPN league response, keeping only the fields the analytics use
+
+    With ``ijson`` installed the response is parsed as a stream of events, so the full nested
+    payload (rosters, box scores, player cards) is never built in memory. Roster entries go
+    straight into typed columns. Without ``ijson`` the payload is loaded whole and projected.
+
+    Args:
+        file_obj: Binary file-like object holding the JSON response
+        scoring_period_id (int): Scoring period whose player points should be read from rosters
+
+    Returns:
+        dict: League payload with only the teams, schedule, status and settings fields used by
+            BasicInfo and MatchupInfo
+        dict: Roster columns (Team, Player, Slot, Position, Points) and a player_names dict
+    """
+    if ijson is None:
+        return _project_league_info(json.load(file_obj), scoring_period_id)
+
+    # Imported here, as roster_info imports the client, which imports this module
+    from fantasy_football.espn_requests.roster_info import (  # pylint: disable=C0415
+        get_roster_row, to_roster_columns
+    )
+
+    league_info = {"teams": [], "schedule": []}
+    roster_rows = []
+    player_names = {}
+
+    team = game = entry = stat = None
+    team_entries = []
+
+    events = ijson.parse(file_obj, use_float=True)
+
+    # leagueHistory answers with a list holding the one requested season
+    _, first_event, _ = next(events, (None, None, None))
+    item_prefix = "item." if first_event == "start_array" else ""
+
+    for prefix, event, value in events:
+        if item_prefix:
+            if not prefix.startswith(item_prefix):
+                continue
+            prefix = prefix[len(item_prefix):]
+
+        if event == "start_map":
+            if prefix == "teams.item":
+                team = {}
+                team_entries = []
+                league_info["teams"].append(team)
+            elif prefix == "schedule.item":
+                game = {}
+                league_info["schedule"].append(game)
+            elif prefix == _ENTRY:
+                entry = {"stats": []}
+            elif prefix == _STAT:
+                stat = {}
+        elif event == "end_map":
+            if prefix == _ENTRY:
+                # JSON keys are unordered, so the team's id may only come after its roster
+                team_entries.append(entry)
+                player_names[entry.get("playerId")] = entry.get("fullName", "")
+            elif prefix == "teams.item" and team_entries:
+                team_id = _get_team_id(team)
+                roster_rows.extend(
+                    get_roster_row(team_id, team_entry, scoring_period_id)
+                    for team_entry in team_entries
+                )
+            elif prefix == _STAT:
+                entry["stats"].append(stat)
+        elif prefix in _GAME_FIELDS:
+            _set_path(game, _GAME_FIELDS[prefix], value)
+        elif prefix in _TEAM_FIELDS:
+            _set_path(team, _TEAM_FIELDS[prefix], value)
+        elif prefix in _ENTRY_FIELDS:
+            entry[_ENTRY_FIELDS[prefix]] = value
+        elif prefix in _STAT_FIELDS:
+            stat[_STAT_FIELDS[prefix]] = value
+        elif prefix in _LEAGUE_FIELDS:
+            _set_path(league_info, _LEAGUE_FIELDS[prefix], value)
+
+    return league_info, to_roster_columns(roster_rows, player_names)
+
+
+def _project_league_info(full_league_info, scoring_period_id: int = None) -> tuple:
+    from fantasy_football.espn_requests.roster_info import (  # pylint: disable=C0415
+        get_roster_entry, get_roster_row, to_roster_columns
+    )
+
+    if isinstance(full_league_info, list):
+        full_league_info = full_league_info[0] if full_league_info else {}
+
+    league_info = {"teams": [], "schedule": []}
+
+    for prefix, path in _LEAGUE_FIELDS.items():
+        value = _get_path(full_league_info, prefix.split("."))
+        if value is not None:
+            _set_path(league_info, path, value)
+
+    roster_rows = []
+    player_names = {}
+
+    for full_team in full_league_info.get("teams", []):
+        league_info["teams"].append({
+            key: full_team[key] for key in ("id", "location", "nickname", "abbrev") if key in full_team
+        })
+
+        for full_entry in full_team.get("roster", {}).get("entries", []):
+            entry = get_roster_entry(full_entry)
+
+            roster_rows.append(get_roster_row(_get_team_id(full_team), entry, scoring_period_id))
+            player_names[entry["playerId"]] = entry["fullName"]
+
+    for full_game in full_league_info.get("schedule", []):
+        game = {}
+        for prefix, path in _GAME_FIELDS.items():
+            value = _get_path(full_game, prefix.split(".")[2:])
+            if value is not None:
+                _set_path(game, path, value)
+        league_info["schedule"].append(game)
+
+    return league_info, to_roster_columns(roster_rows, player_names)
+
+
+def _get_team_id(team: dict) -> int:
+    if "id" not in team:
+        raise ValueError("League payload has a team with a roster but no id")
+
+    return team["id"]
+
+
+def _get_path(container: dict, path: list):
+    for key in path:
+        if not isinstance(container, dict) or key not in container:
+            return None
+        container = container[key]
+
+    return container
+
+
+def _set_path(container: dict, path: tuple, value) -> None:
+    for key in path[:-1]:
+        container = container.setdefault(key, {})
+
+    container[path[-1]] = value
@@ -7,51 +7,178 @@ Get fantasy football "stuff"
 # http://espn-fantasy-football-api.s3-website.us-east-2.amazonaws.com/
 
 from dash import dash_table
+import numpy as np
 import pandas as pd
 
+from fantasy_football.analytics.all_play import get_all_play_standings
+from fantasy_football.analytics.playoff_odds import get_playoff_odds
+from fantasy_football.analytics.running_stats import RunningLeagueStats
 from fantasy_football.visualizations.espn_plotter import ESPNPlotter
 from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.cache import get_current_season
+from fantasy_football.espn_requests.client import get_default_client
+from fantasy_football.espn_requests.constants import LEAGUE_VIEWS
 from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.metrics import stage
+from fantasy_football.storage.season_store import SeasonStore
 
 
-def get_all_league_info() -> dict:
+def get_all_league_info(league_id: int = 1117278137, year: int = 2021) -> dict:
     """
     Main function for getting fantasy league information
 
     Args:
-        None
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
 
     Returns:
-        dict: Dictionary of plots
+        dict: Dictionary of the standings table and every team's per-week score data
+        list: List of TeamInfo for every team
     """
-    league_id = 1117278137
-    year = 2021
+    with stage("fetch"):
+        basic_info, matchup_info = fetch_league_info(league_id, year)
 
-    basic_info = BasicInfo(league_id, year)
-    matchup_info = MatchupInfo(league_id, year)
+    league_data = build_league_data(basic_info, matchup_info)
 
-    basic_info.get_league_basic_info()
-    matchup_info.get_league_matchup_info()
+    return league_data, basic_info.get_teams()
 
-    team_ids = basic_info.get_team_ids()
 
-    teams_df = basic_info.get_teams_dataframe()
+def fetch_league_info(league_id: int, year: int, season_store: SeasonStore = None) -> tuple:
+    """
+    Fetch a league from the local season store if present, else from the ESPN API
+
+    Finished seasons fetched from ESPN are saved to the store for next time.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        season_store (SeasonStore): Local season store (defaults to the one in the data directory)
+
+    Returns:
+        BasicInfo: Basic league information
+        MatchupInfo: League matchup information, sharing the same payload
+    """
+    client = get_default_client()
+    season_store = season_store or SeasonStore()
+
+    if season_store.has_season(league_id, year):
+        league_info = season_store.load_league_info(league_id, year)
+    else:
+        # Fetch every view in one round-trip, stream out the fields used, and share the
+        # slimmed payload between both classes
+        league_info, _ = client.stream_league_info(league_id, year, views=LEAGUE_VIEWS)
+
+    basic_info = BasicInfo(league_id, year, client=client, league_info=league_info)
+    matchup_info = MatchupInfo(league_id, year, client=client, league_info=league_info)
+
+    if year < get_current_season() and not season_store.has_season(league_id, year):
+        season_store.save_season(league_id, year, basic_info, matchup_info)
+
+    return basic_info, matchup_info
+
+
+def build_league_data(
+    basic_info: BasicInfo,
+    matchup_info: MatchupInfo,
+    processes: int = 1
+) -> dict:
+    """
+    Run the league analytics needed by the Dashboard
+
+    Playoff odds are simulated inline by default, since this runs from Dash callbacks, the live
+    refresh thread and batch worker processes, none of which should start a process pool per call.
+    Records and weekly averages of final weeks come from the MatchupInfo's running aggregates, so
+    rebuilding after a live poll only folds in the weeks that have become final since.
+
+    Args:
+        basic_info (BasicInfo): Basic league information
+        matchup_info (MatchupInfo): League matchup information
+        processes (int): Worker processes for the playoff odds (1 to run inline, None for one
+            per CPU)
 
-    games_df = matchup_info.get_all_games_df()
+    Returns:
+        dict: Dictionary of the league name, the standings and playoff odds tables and every
+            team's per-week score data
+    """
+    with stage("get_all_games_df"):
+        games_df = matchup_info.get_all_games_df()
+
+    with stage("get_running_stats"):
+        running_stats = matchup_info.get_running_stats()
+
+    with stage("get_weekly_average_score"):
+        avgs = matchup_info.get_weekly_average_score()
+
+    with stage("get_team_results"):
+        team_results = matchup_info.get_team_results()
 
-    avgs = matchup_info.get_weekly_average_score()
+    league_data = {"name": basic_info.get_league_name()}
 
-    all_teams_total_wins = matchup_info.get_all_teams_total_wins()
+    with stage("tabulate_league_standings"):
+        league_data.update(tabulate_league_standings(basic_info, team_results, running_stats))
 
-    figures = {}
+    playoff_settings = matchup_info.get_playoff_settings()
+    regular_season_games_df = games_df
+    if playoff_settings["regular_season_weeks"]:
+        regular_season_games_df = games_df[games_df["Week"] <= playoff_settings["regular_season_weeks"]]
 
-    figures.update(tabulate_league_standings(basic_info, team_ids, all_teams_total_wins))
+    with stage("get_playoff_odds"):
+        playoff_odds = get_playoff_odds(
+            regular_season_games_df,
+            num_playoff_teams=playoff_settings["playoff_team_count"],
+            seed=0,
+            processes=processes,
+        )
+        league_data.update(tabulate_playoff_odds(basic_info, playoff_odds))
 
-    figures.update(plot_all_teams(team_ids, teams_df, games_df, avgs))
+    # Figures are built on demand by the Dashboard from this compact per-team score table
+    with stage("get_all_team_scores"):
+        league_data["team_scores"] = get_all_team_scores(games_df, avgs)
 
-    team_names = basic_info.get_basic_teams_list()
+    return league_data
 
-    return figures, team_names
+
+def get_all_team_scores(all_games_df: pd.DataFrame, avg_scores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get points for/against every team, centered around league average, in one pass
+
+    Each game becomes two rows, one from each team's perspective, with the team of interest in
+    the "Team1"/"Score1" columns. League averages are joined on week, so byes and missing weeks
+    line up correctly.
+
+    Args:
+        all_games_df (pd.DataFrame): Dataframe of all league game information
+        avg_scores (pd.DataFrame): Dataframe of league average score each week
+
+    Returns:
+        pd.DataFrame: One row per team per game, sorted by team then week
+    """
+    week = all_games_df["Week"].to_numpy()
+    team1 = all_games_df["Team1"].to_numpy()
+    team2 = all_games_df["Team2"].to_numpy()
+    score1 = all_games_df["Score1"].to_numpy()
+    score2 = all_games_df["Score2"].to_numpy()
+    winner = all_games_df["Winner"].to_numpy()
+
+    all_team_scores = pd.DataFrame({
+        "Week": np.concatenate([week, week]),
+        "Team1": np.concatenate([team1, team2]),
+        "Score1": np.concatenate([score1, score2]),
+        "Team2": np.concatenate([team2, team1]),
+        "Score2": np.concatenate([score2, score1]),
+        "Winner": np.concatenate([winner, winner]),
+    })
+
+    avg = all_team_scores["Week"].map(avg_scores.set_index("Week")["Score"])
+
+    all_team_scores = all_team_scores.assign(
+        Chg1 = all_team_scores['Score1'] - avg,
+        Chg2 = all_team_scores['Score2'] - avg,
+        Win  = all_team_scores['Score1'] > all_team_scores['Score2'],
+        Avg = avg
+    )
+
+    return all_team_scores.sort_values(["Team1", "Week"], kind="stable", ignore_index=True)
 
 
 def get_team_scores(
@@ -67,26 +194,9 @@ def get_team_scores(
         all_games_df (pd.DataFrame): Dataframe of all league game information
         avg_scores (pd.DataFrame): Dataframe of league average score each week
     """
-    # grab all games with this team
-    team_games_df = all_games_df.query("Team1 == @team_id | Team2 == @team_id").reset_index(
-        drop=True
-    )
+    all_team_scores = get_all_team_scores(all_games_df, avg_scores)
 
-    # move the team of interest to "Team1" column
-    ix = list(team_games_df["Team2"] == team_id)
-    team_games_df.loc[ix, ['Team1','Score1','Team2','Score2']] = team_games_df.loc[
-        ix, ['Team2','Score2','Team1','Score1']
-    ].values
-
-    # add new score and win cols
-    team_games_df = team_games_df.assign(
-        Chg1 = team_games_df['Score1'] - avg_scores['Score'],
-        Chg2 = team_games_df['Score2'] - avg_scores['Score'],
-        Win  = team_games_df['Score1'] > team_games_df['Score2'],
-        Avg = avg_scores["Score"]
-    )
-
-    return team_games_df
+    return all_team_scores[all_team_scores["Team1"] == team_id].reset_index(drop=True)
 
 
 def get_team_ids(teams: list) -> list:
@@ -102,29 +212,90 @@ def get_team_ids(teams: list) -> list:
     return [team["id"] for team in teams]
 
 
-def tabulate_league_standings(
+def get_league_standings_df(
     basic_info: BasicInfo,
-    team_ids: list,
-    all_teams_total_wins: pd.Series
-) -> dict:
-    sorted_total_wins = all_teams_total_wins.sort_values(ascending=False)
+    team_results: pd.DataFrame,
+    running_stats: RunningLeagueStats = None
+) -> pd.DataFrame:
+    """
+    Get the league standings, sorted by total wins, alongside each team's all-play record
 
-    total_games = 15
+    Args:
+        basic_info (BasicInfo): Basic league information, used for team names
+        team_results (pd.DataFrame): Long-format team results, as from MatchupInfo.get_team_results
+        running_stats (RunningLeagueStats): Running aggregates of the final weeks to take each
+            team's record from, or None to count it from team_results. When given, the all-play
+            columns are limited to the same final weeks, so every column covers the same games
 
-    sorted_total_losses = total_games - sorted_total_wins
+    Returns:
+        pd.DataFrame: Record, expected wins, luck and team name for each team (index is team id)
+    """
+    if running_stats is None:
+        results = team_results[team_results["Result"] != "U"]
+        record = pd.crosstab(results["Team"], results["Result"]).reindex(
+            index=basic_info.get_team_ids(), columns=["W", "L", "T"], fill_value=0
+        )
+    else:
+        # Games decided in a week that isn't final yet wait until the whole week is
+        final_weeks = running_stats.get_weekly_stats()["Week"]
+        team_results = team_results[team_results["Week"].isin(final_weeks)]
+
+        record = running_stats.get_team_stats()[["Wins", "Losses", "Ties"]].set_axis(
+            ["W", "L", "T"], axis=1
+        ).reindex(index=basic_info.get_team_ids(), fill_value=0)
+
+    # Teams with no decided games yet get a 0-0 all-play record rather than NaN
+    all_play_standings = get_all_play_standings(team_results).reindex(record.index, fill_value=0)
+
+    sorted_total_win_losses = pd.DataFrame({
+        "Wins": record["W"],
+        "Losses": record["L"],
+        "Expected Wins": all_play_standings["Expected Wins"].round(2),
+        "Luck": all_play_standings["Luck"].round(2),
+        "All-Play": (
+            all_play_standings["All-Play Wins"].map("{:g}".format)
+            + "-"
+            + all_play_standings["All-Play Losses"].map("{:g}".format)
+        ),
+    })
+
+    if record["T"].any():
+        sorted_total_win_losses.insert(2, "Ties", record["T"])
+
+    sorted_total_win_losses = sorted_total_win_losses.sort_values(
+        ["Wins", "Expected Wins"], ascending=False
+    )
 
-    sorted_total_win_losses = pd.DataFrame(
-        {"Wins": sorted_total_wins, "Losses": sorted_total_losses}
+    team_names = basic_info.get_team_names()
+
+    sorted_total_win_losses["Team Name"] = (
+        sorted_total_win_losses.index.map(team_names).fillna("No Name")
     )
 
-    team_names = {
-        team_id: basic_info.get_team_name_by_id(team_id) for team_id in sorted_total_win_losses.index
-    }
+    return sorted_total_win_losses
 
-    sorted_total_win_losses["Team Name"] = pd.Series(team_names, index=sorted_total_win_losses.index)
-    sorted_total_win_losses.fillna("No Name", inplace=True)
+
+def tabulate_league_standings(
+    basic_info: BasicInfo,
+    team_results: pd.DataFrame,
+    running_stats: RunningLeagueStats = None
+) -> dict:
+    """
+    Create the league standings table, including expected wins and luck
+
+    Args:
+        basic_info (BasicInfo): Basic league information, used for team names
+        team_results (pd.DataFrame): Long-format team results, as from MatchupInfo.get_team_results
+        running_stats (RunningLeagueStats): Running aggregates of the final weeks to take each
+            team's record from, or None to count it from team_results
+
+    Returns:
+        dict: Dictionary holding the standings DataTable
+    """
+    sorted_total_win_losses = get_league_standings_df(basic_info, team_results, running_stats)
 
     data_table = dash_table.DataTable(
+        id="standings-table",
         columns=[{"name": i, "id": i} for i in sorted_total_win_losses.columns],
         data=sorted_total_win_losses.to_dict("records")
     )
@@ -132,6 +303,33 @@ def tabulate_league_standings(
     return {"standings": data_table}
 
 
+def tabulate_playoff_odds(basic_info: BasicInfo, playoff_odds: pd.DataFrame) -> dict:
+    """
+    Create the playoff odds table, as percentages sorted by chance of making the playoffs
+
+    Args:
+        basic_info (BasicInfo): Basic league information, used for team names
+        playoff_odds (pd.DataFrame): Seed probabilities, as from get_playoff_odds
+
+    Returns:
+        dict: Dictionary holding the playoff odds DataTable
+    """
+    seed_columns = [column for column in playoff_odds.columns if column != "Playoffs"]
+
+    odds_pct = (playoff_odds[["Playoffs"] + seed_columns] * 100).round(1).sort_values(
+        ["Playoffs"] + seed_columns, ascending=False
+    )
+    odds_pct.insert(0, "Team Name", odds_pct.index.map(basic_info.get_team_names()))
+
+    data_table = dash_table.DataTable(
+        id="playoff-odds-table",
+        columns=[{"name": i, "id": i} for i in odds_pct.columns],
+        data=odds_pct.to_dict("records")
+    )
+
+    return {"playoff_odds": data_table}
+
+
 def plot_all_teams(
     team_ids: list,
     teams_df: pd.DataFrame,
@@ -156,9 +354,14 @@ def plot_all_teams(
     luckiness_plots = {}
     team_points_plots = {}
 
+    team_groups = get_all_team_scores(games_df, avgs).groupby("Team1")
+
     for team_id in team_ids:
-        team_scores = get_team_scores(team_ids[team_id - 1], games_df, avgs)
-        team_name = teams_df.loc[team_ids[team_id - 1]]["team name"]
+        if team_id not in team_groups.groups:
+            continue
+
+        team_scores = team_groups.get_group(team_id).reset_index(drop=True)
+        team_name = teams_df.loc[team_id]["team name"]
 
         luckiness_plots.update(espn_plotter.plot_team_score_analysis(team_scores, team_name))
         team_points_plots.update(espn_plotter.plot_team_total_scores(team_scores, team_name))
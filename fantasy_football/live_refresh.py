@@ -0,0 +1,196 @@
+"""
+Background refresh of live-week scores for a running Dashboard
+"""
+import json
+import logging
+import threading
+
+import requests
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.client import ESPNClient, get_default_client
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import build_league_data
+
+# Seconds between polls of the live matchup period
+DEFAULT_REFRESH_INTERVAL = 120.0
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LiveRefresher:
+    """
+    Polls the current matchup period in the background and merges new scores into the season
+
+    Only ``mMatchupScore`` for the live matchup period is requested on each poll. Changed games
+    are merged into the shared league payload, the league data is rebuilt, and every team's
+    revision is bumped: each team's figures are drawn against the weekly league average, which
+    any changed score moves, so cached figures are only reused while no score has changed. The
+    league's running aggregates (records and weekly averages) are kept on its MatchupInfo across
+    polls, so a rebuild only folds in the weeks that poll made final.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        basic_info (BasicInfo): Basic league information for the season
+        matchup_info (MatchupInfo): Matchup information for the season, updated in place
+        interval (float): Seconds between polls
+        client (ESPNClient): Client to poll with (defaults to the shared client)
+
+    Attributes:
+        interval (float): Seconds between polls
+
+    Methods:
+        start (None): Starts polling in a background thread
+        stop (None): Stops the background thread
+        refresh (set): Polls once, returning the IDs of teams whose games changed
+        get_snapshot (tuple): Returns the current version, league data and team revisions
+    """
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        basic_info: BasicInfo,
+        matchup_info: MatchupInfo,
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        client: ESPNClient = None
+    ):
+        self._league_id: int = league_id
+        self._year: int = year
+        self._basic_info: BasicInfo = basic_info
+        self._matchup_info: MatchupInfo = matchup_info
+        self._client: ESPNClient = client or get_default_client()
+
+        self.interval: float = interval
+
+        # Serializes polls; _lock only guards the swap of their results, so readers never wait
+        # on a rebuild
+        self._refresh_lock: threading.Lock = threading.Lock()
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: threading.Thread = None
+
+        self._version: int = 0
+        self._team_revisions: dict = {}
+        self._league_data: dict = build_league_data(basic_info, matchup_info)
+
+    def start(self) -> None:
+        """
+        Start polling in a background daemon thread
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="live-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except requests.RequestException as error:
+                LOGGER.warning("Live refresh of league %s failed: %s", self._league_id, error)
+            except Exception:  # pylint: disable=W0703
+                # Keep polling; a bad payload or analytics bug shouldn't end live updates
+                LOGGER.exception("Live refresh of league %s failed", self._league_id)
+
+    def refresh(self) -> set:
+        """
+        Poll the live matchup period once and merge any changed games
+
+        Args:
+            None
+
+        Returns:
+            set: IDs of teams whose games changed
+        """
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> set:
+        matchup_period = self._matchup_info.get_current_matchup_period()
+
+        if matchup_period is None:
+            return set()
+
+        league_info = self._matchup_info.league_matchup_info
+
+        params = {}
+        if league_info.get("scoringPeriodId"):
+            params["scoringPeriodId"] = league_info["scoringPeriodId"]
+
+        fantasy_filter = {"schedule": {"filterMatchupPeriodIds": {"value": [matchup_period]}}}
+
+        live_info = self._client.get_league_info(
+            self._league_id,
+            self._year,
+            views=["mMatchupScore"],
+            params=params,
+            headers={"X-Fantasy-Filter": json.dumps(fantasy_filter)},
+            use_cache=False,
+        )
+
+        live_games = [
+            game for game in live_info.get("schedule", [])
+            if game.get("matchupPeriodId") == matchup_period
+        ]
+
+        changed_team_ids = self._matchup_info.update_schedule(live_games)
+
+        # Follow ESPN onto the next period once the live one is final
+        for key in ("status", "scoringPeriodId"):
+            if key in live_info:
+                league_info[key] = live_info[key]
+
+        if not changed_team_ids:
+            return changed_team_ids
+
+        # Rebuilt outside the lock, so snapshots keep serving the previous data meanwhile
+        league_data = build_league_data(self._basic_info, self._matchup_info)
+
+        with self._lock:
+            self._league_data = league_data
+            self._version += 1
+
+            for team_id in self._basic_info.get_team_ids():
+                self._team_revisions[team_id] = self._team_revisions.get(team_id, 0) + 1
+
+        return changed_team_ids
+
+    def get_snapshot(self) -> tuple:
+        """
+        Get the latest league data
+
+        Args:
+            None
+
+        Returns:
+            int: Version of the league data, bumped whenever any game changes
+            dict: Dictionary of the standings table and every team's per-week score data
+            dict: Revision of each team's data, keyed by team ID
+        """
+        with self._lock:
+            return self._version, self._league_data, dict(self._team_revisions)
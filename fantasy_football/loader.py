@@ -0,0 +1,292 @@
+"""
+Loader process that fetches a league and publishes its Dashboard data to the shared cache
+
+Usage: ``python -m fantasy_football.loader LEAGUE_ID --year 2021``, run alongside the web workers
+(``gunicorn fantasy_football.wsgi:server``)
+"""
+import argparse
+import json
+import logging
+import time
+
+import plotly.io as pio
+import requests
+
+from fantasy_football.espn_requests.constants import LEAGUE_ID, YEAR
+from fantasy_football.get_fantasy_stuff import fetch_league_info
+from fantasy_football.live_refresh import DEFAULT_REFRESH_INTERVAL, LiveRefresher
+from fantasy_football.storage.shared_cache import SHARED_CACHE_PATH, SharedCache
+from fantasy_football.visualizations.espn_plotter import ESPNPlotter
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_league_key(league_id: int, year: int) -> str:
+    """
+    Get the shared cache key prefix of a league
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+
+    Returns:
+        str: The key prefix
+    """
+    return f"league:{league_id}:{year}"
+
+
+class SharedLeagueData:
+    """
+    Reads the league data and team figures a loader process published to a shared cache
+
+    Exposes the same ``interval`` and ``get_snapshot`` as ``LiveRefresher``, so a Dashboard in a
+    web worker polls the shared cache instead of ESPN. The full snapshot is only unpickled when
+    its published version changes.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        shared_cache (SharedCache): Cache the loader publishes to
+        interval (float): Seconds between Dashboard polls
+
+    Attributes:
+        interval (float): Seconds between Dashboard polls
+
+    Methods:
+        is_published (bool): Returns whether the loader has published the league yet
+        get_snapshot (tuple): Returns the current version, league data and team revisions
+        get_teams (list): Returns list of TeamInfo for every team
+        get_team_figures (tuple): Returns a team's published figures, if current
+    """
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        shared_cache: SharedCache,
+        interval: float = DEFAULT_REFRESH_INTERVAL
+    ):
+        self._key: str = get_league_key(league_id, year)
+        self._shared_cache: SharedCache = shared_cache
+
+        self.interval: float = interval
+
+        self._snapshot: dict = None
+
+    def is_published(self) -> bool:
+        """
+        Whether the loader has published the league yet
+
+        Args:
+            None
+
+        Returns:
+            bool: True once a snapshot is in the shared cache
+        """
+        return self._shared_cache.get(f"{self._key}:version") is not None
+
+    def _get_current_snapshot(self) -> dict:
+        version = self._shared_cache.get(f"{self._key}:version")
+
+        if version is None:
+            raise LookupError(f"No league data published under {self._key} yet")
+
+        if self._snapshot is None or self._snapshot["version"] != version:
+            self._snapshot = self._shared_cache.get(f"{self._key}:snapshot")
+
+        return self._snapshot
+
+    def get_snapshot(self) -> tuple:
+        """
+        Get the latest published league data
+
+        Args:
+            None
+
+        Returns:
+            int: Version of the league data, bumped whenever any game changes
+            dict: Dictionary of the standings table and every team's per-week score data
+            dict: Revision of each team's data, keyed by team ID
+
+        Raises:
+            LookupError: If the loader has not published the league yet
+        """
+        snapshot = self._get_current_snapshot()
+
+        return snapshot["version"], snapshot["league_data"], dict(snapshot["team_revisions"])
+
+    def get_teams(self) -> list:
+        """
+        Get the league's teams
+
+        Args:
+            None
+
+        Returns:
+            list: List of TeamInfo for every team
+
+        Raises:
+            LookupError: If the loader has not published the league yet
+        """
+        return self._get_current_snapshot()["teams"]
+
+    def get_team_figures(self, team_id: int, team_revision: int) -> tuple:
+        """
+        Get a team's figures as published by the loader
+
+        Args:
+            team_id (int): The team's ID
+            team_revision (int): The team's revision the figures must match
+
+        Returns:
+            tuple: The team's luckiness and weekly points figures as dicts, or None if the
+                published figures are missing or for another revision
+        """
+        figures = self._shared_cache.get(f"{self._key}:figures:{team_id}")
+
+        if figures is None or figures["revision"] != team_revision:
+            return None
+
+        return json.loads(figures["luckiness"]), json.loads(figures["team_points"])
+
+
+def publish_league(
+    shared_cache: SharedCache,
+    league_id: int,
+    year: int,
+    refresher: LiveRefresher,
+    teams: list,
+    team_ids: set = None,
+    base_version: int = 0
+) -> None:
+    """
+    Publish a refresher's league data and rendered team figures in one transaction
+
+    Args:
+        shared_cache (SharedCache): Cache to publish to
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        refresher (LiveRefresher): Refresher holding the latest league data
+        teams (list): List of TeamInfo for every team
+        team_ids (set): IDs of teams whose figures changed, or None to render every team
+        base_version (int): Offset added to versions and revisions, so they keep increasing
+            across loader restarts
+
+    Returns:
+        None
+    """
+    key = get_league_key(league_id, year)
+    version, league_data, team_revisions = refresher.get_snapshot()
+
+    version += base_version
+    team_revisions = {
+        team.id: base_version + team_revisions.get(team.id, 0) for team in teams
+    }
+
+    espn_plotter = ESPNPlotter()
+    team_score_groups = league_data["team_scores"].groupby("Team1")
+
+    items = {}
+    for team in teams:
+        if team_ids is not None and team.id not in team_ids:
+            continue
+        if team.id not in team_score_groups.groups:
+            continue
+
+        team_scores = team_score_groups.get_group(team.id).reset_index(drop=True)
+        luckiness_plot, team_points_plot = espn_plotter.plot_team_figures(team_scores, team.name)
+
+        items[f"{key}:figures:{team.id}"] = {
+            "revision": team_revisions[team.id],
+            "luckiness": pio.to_json(luckiness_plot),
+            "team_points": pio.to_json(team_points_plot),
+        }
+
+    items[f"{key}:snapshot"] = {
+        "version": version,
+        "league_data": league_data,
+        "team_revisions": team_revisions,
+        "teams": teams,
+    }
+    items[f"{key}:version"] = version
+
+    shared_cache.set_many(items)
+
+
+def run_loader(
+    league_id: int,
+    year: int,
+    shared_cache: SharedCache,
+    interval: float = DEFAULT_REFRESH_INTERVAL
+) -> None:
+    """
+    Fetch a league, publish it, then poll the live matchup period and publish every change
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        shared_cache (SharedCache): Cache to publish to
+        interval (float): Seconds between polls
+
+    Returns:
+        None
+    """
+    basic_info, matchup_info = fetch_league_info(league_id, year)
+    teams = basic_info.get_teams()
+
+    refresher = LiveRefresher(league_id, year, basic_info, matchup_info, interval=interval)
+
+    # Continue on from the last published version so workers never see versions repeat
+    base_version = shared_cache.get(f"{get_league_key(league_id, year)}:version", -1) + 1
+
+    publish_league(shared_cache, league_id, year, refresher, teams, base_version=base_version)
+    LOGGER.info("Published league %s (%s)", league_id, year)
+
+    while True:
+        time.sleep(interval)
+
+        try:
+            changed_team_ids = refresher.refresh()
+        except requests.RequestException as error:
+            LOGGER.warning("Live refresh of league %s failed: %s", league_id, error)
+            continue
+        except Exception:  # pylint: disable=W0703
+            LOGGER.exception("Live refresh of league %s failed", league_id)
+            continue
+
+        # Every team's figures are drawn against the weekly league average, so all of them are
+        # rendered again whenever any score changes
+        if changed_team_ids:
+            publish_league(
+                shared_cache,
+                league_id,
+                year,
+                refresher,
+                teams,
+                base_version=base_version,
+            )
+            LOGGER.info("Published changes to the games of teams %s", sorted(changed_team_ids))
+
+
+def main():
+    """
+    Command line entry point for the loader process
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("league_id", type=int, nargs="?", default=LEAGUE_ID, help="ESPN league ID")
+    parser.add_argument("--year", type=int, default=YEAR, help="Season to load")
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_REFRESH_INTERVAL,
+        help="Seconds between polls of the live matchup period"
+    )
+    parser.add_argument(
+        "--cache-path", default=SHARED_CACHE_PATH, help="Path of the shared cache database"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    run_loader(args.league_id, args.year, SharedCache(args.cache_path), interval=args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""
+In-process metrics of the pipeline, ESPN requests, the response cache and Dash callbacks
+
+Metrics are exposed in the Prometheus text format (the Dashboard serves them at ``/metrics``).
+Profile one pipeline run with ``python -m fantasy_football.metrics LEAGUE_ID --profile run.prof``.
+"""
+import argparse
+import contextlib
+import cProfile
+import functools
+import pstats
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of metrics, rendered in the Prometheus text format
+
+    Args:
+        None
+
+    Attributes:
+        None
+
+    Methods:
+        register (None): Adds a metric to the registry
+        render (str): Returns every metric in the Prometheus text format
+    """
+    def __init__(self):
+        self._metrics: list = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def register(self, metric) -> None:
+        """
+        Add a metric to the registry
+
+        Args:
+            metric (Counter): A Counter, Gauge or Summary
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format
+
+        Args:
+            None
+
+        Returns:
+            str: The metrics, one sample per line
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        if resource is not None:
+            # ru_maxrss is in kilobytes on Linux
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            lines.extend([
+                "# HELP process_max_resident_memory_bytes Peak resident memory of this process",
+                "# TYPE process_max_resident_memory_bytes gauge",
+                f"process_max_resident_memory_bytes {max_rss}",
+            ])
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class Counter:
+    """
+    Monotonically increasing count, per set of label values
+
+    Args:
+        name (str): Metric name
+        documentation (str): Help text
+        registry (MetricsRegistry): Registry to add the metric to
+
+    Attributes:
+        name (str): Metric name
+
+    Methods:
+        inc (None): Increments the count for some label values
+        get (float): Returns the count for some label values
+        render (list): Returns the metric's lines in the Prometheus text format
+    """
+    _type = "counter"
+
+    def __init__(self, name: str, documentation: str, registry: MetricsRegistry = REGISTRY):
+        self.name: str = name
+        self._documentation: str = documentation
+        self._values: dict = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        registry.register(self)
+
+    def inc(self, value: float = 1.0, **labels) -> None:
+        """
+        Increment the count for some label values
+
+        Args:
+            value (float): Amount to add
+            **labels: Label values, e.g. ``status="200"``
+
+        Returns:
+            None
+        """
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def get(self, **labels) -> float:
+        """
+        Get the count for some label values
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            float: The count, or 0 if never incremented
+        """
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def _samples(self) -> list:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def render(self) -> list:
+        """
+        Render the metric in the Prometheus text format
+
+        Args:
+            None
+
+        Returns:
+            list: The metric's HELP, TYPE and sample lines
+        """
+        lines = [f"# HELP {self.name} {self._documentation}", f"# TYPE {self.name} {self._type}"]
+
+        for name, key, value in sorted(self._samples()):
+            lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, per set of label values
+
+    Args:
+        name (str): Metric name
+        documentation (str): Help text
+        registry (MetricsRegistry): Registry to add the metric to
+
+    Attributes:
+        name (str): Metric name
+
+    Methods:
+        set (None): Sets the value for some label values
+    """
+    _type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        """
+        Set the value for some label values
+
+        Args:
+            value (float): The new value
+            **labels: Label values
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+
+class Summary(Counter):
+    """
+    Count and sum of observations (e.g. latencies), per set of label values
+
+    Args:
+        name (str): Metric name
+        documentation (str): Help text
+        registry (MetricsRegistry): Registry to add the metric to
+
+    Attributes:
+        name (str): Metric name
+
+    Methods:
+        observe (None): Records one observation
+        time (contextmanager): Records the wall time of a block
+    """
+    _type = "summary"
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record one observation
+
+        Args:
+            value (float): The observed value
+            **labels: Label values
+
+        Returns:
+            None
+        """
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            count, total = self._values.get(key, (0, 0.0))
+            self._values[key] = (count + 1, total + value)
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """
+        Record the wall time of a block, in seconds
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            contextmanager: Context manager timing its block
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get(self, **labels) -> tuple:
+        """
+        Get the count and sum of observations for some label values
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            tuple: (count, sum), or (0, 0.0) if nothing was observed
+        """
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), (0, 0.0))
+
+    def _samples(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+
+        samples = []
+        for key, (count, total) in items:
+            samples.append((f"{self.name}_count", key, count))
+            samples.append((f"{self.name}_sum", key, total))
+
+        return samples
+
+
+STAGE_SECONDS = Summary("pipeline_stage_seconds", "Wall time of pipeline stages")
+STAGE_PEAK_MEMORY = Gauge(
+    "pipeline_stage_peak_memory_bytes",
+    "Peak traced Python memory during the last run of each stage (only while tracemalloc runs)",
+)
+ESPN_REQUESTS = Counter("espn_requests_total", "ESPN API requests sent, by HTTP status")
+ESPN_REQUEST_SECONDS = Summary("espn_request_seconds", "Latency of ESPN API requests")
+ESPN_RESPONSE_BYTES = Counter(
+    "espn_response_bytes_total", "Bytes received from the ESPN API, before decompression"
+)
+CACHE_LOOKUPS = Counter(
+    "espn_cache_lookups_total",
+    "Response cache lookups, by result (hit, revalidated, miss, offline_hit)",
+)
+CALLBACK_SECONDS = Summary("dash_callback_seconds", "Latency of Dash callbacks")
+
+_stage_stack = threading.local()
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """
+    Record the wall time of a pipeline stage, and its peak memory while tracemalloc is tracing
+
+    Args:
+        name (str): Stage name, e.g. ``"get_all_games_df"``
+
+    Returns:
+        contextmanager: Context manager measuring its block
+    """
+    tracing = tracemalloc.is_tracing()
+    stack = _stage_stack.__dict__.setdefault("peaks", [])
+
+    if tracing:
+        # Hand the peak so far to the enclosing stage before resetting it for this one
+        if stack:
+            stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        stack.append(0)
+
+    try:
+        with STAGE_SECONDS.time(stage=name):
+            yield
+    finally:
+        if tracing and tracemalloc.is_tracing():
+            peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+            STAGE_PEAK_MEMORY.set(peak, stage=name)
+
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+            tracemalloc.reset_peak()
+
+
+def timed_callback(name: str):
+    """
+    Decorate a Dash callback to record its latency
+
+    Args:
+        name (str): Callback name used as the metric label
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with CALLBACK_SECONDS.time(callback=name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _format_labels(key: tuple) -> str:
+    if not key:
+        return ""
+
+    labels = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in key
+    )
+
+    return "{" + labels + "}"
+
+
+def main():
+    """
+    Command line entry point: run the league pipeline once and print its metrics
+    """
+    # pylint: disable=C0415
+    from fantasy_football.espn_requests.constants import LEAGUE_ID, YEAR
+    from fantasy_football.get_fantasy_stuff import get_all_league_info
+
+    parser = argparse.ArgumentParser(description="Run the league pipeline once and print metrics")
+    parser.add_argument("league_id", type=int, nargs="?", default=LEAGUE_ID, help="ESPN league ID")
+    parser.add_argument("--year", type=int, default=YEAR, help="Season to run")
+    parser.add_argument(
+        "--profile", default=None, help="Write a cProfile dump of the run to this path"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Record each stage's peak memory"
+    )
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile() if args.profile else None
+
+    if profiler is not None:
+        profiler.enable()
+
+    get_all_league_info(args.league_id, args.year)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+
+    print(REGISTRY.render(), end="")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Exports a league's dashboard as a static HTML/JSON bundle that can be served from a CDN
+
+Usage: ``python -m fantasy_football.static_export LEAGUE_ID --year 2021 --out-dir export``
+"""
+import argparse
+import html
+import json
+import os
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from plotly.utils import PlotlyJSONEncoder
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.constants import LEAGUE_ID, YEAR
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import build_league_data, fetch_league_info
+from fantasy_football.visualizations.dashboard import (
+    EXTERNAL_STYLESHEETS,
+    SUBTITLE,
+    get_page_title,
+)
+from fantasy_football.visualizations.espn_plotter import ESPNPlotter
+
+DEFAULT_OUT_DIR = "export"
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{stylesheets}
+<script src="{plotly_js}"></script>
+</head>
+<body>
+<h1 style="text-align: center">{title}</h1>
+<div style="text-align: center">{subtitle}</div>
+{standings}
+<h3>Playoff Odds (%)</h3>
+{playoff_odds}
+<label for="team-select">Select Team</label>
+<select id="team-select">
+{team_options}
+</select>
+<div id="team-scores"></div>
+<div id="team-graph"></div>
+<script>
+fetch("league.json").then(function (response) {{
+  return response.json();
+}}).then(function (bundle) {{
+  function toFigure(figure) {{
+    var layout = Object.assign({{template: bundle.templates[figure.template]}}, figure.layout);
+    return {{data: figure.data.map(function (i) {{ return bundle.traces[i]; }}), layout: layout}};
+  }}
+  function show(teamId) {{
+    var figures = bundle.teams[teamId].figures;
+    for (var graphId in figures) {{
+      Plotly.react(graphId, toFigure(figures[graphId]));
+    }}
+  }}
+  var select = document.getElementById("team-select");
+  select.addEventListener("change", function () {{ show(select.value); }});
+  show(select.value);
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def build_bundle(league_data: dict, teams: list) -> dict:
+    """
+    Render the standings, playoff odds and every team's figures into one JSON-serializable bundle
+
+    Figures are split into traces, a layout and a Plotly template. Identical traces and templates
+    (e.g. the league-average line and the win/loss line every team's figures repeat) are stored
+    once and referenced by index.
+
+    Args:
+        league_data (dict): League data, as from build_league_data
+        teams (list): List of TeamInfo for every team
+
+    Returns:
+        dict: Standings and playoff odds tables, pooled traces and templates, and each team's
+            figures keyed by team ID
+    """
+    espn_plotter = ESPNPlotter()
+    team_score_groups = league_data["team_scores"].groupby("Team1")
+
+    traces = []
+    templates = []
+    trace_indexes = {}
+    template_indexes = {}
+
+    def pool(item: dict, items: list, indexes: dict) -> int:
+        key = json.dumps(item, sort_keys=True)
+
+        if key not in indexes:
+            indexes[key] = len(items)
+            items.append(item)
+
+        return indexes[key]
+
+    def add_figure(figure) -> dict:
+        figure_json = json.loads(pio.to_json(figure))
+        layout = figure_json.get("layout", {})
+
+        return {
+            "data": [pool(trace, traces, trace_indexes) for trace in figure_json.get("data", [])],
+            "template": pool(layout.pop("template", {}), templates, template_indexes),
+            "layout": layout,
+        }
+
+    team_bundles = {}
+    for team in teams:
+        if team.id not in team_score_groups.groups:
+            continue
+
+        team_scores = team_score_groups.get_group(team.id).reset_index(drop=True)
+
+        luckiness_plot = espn_plotter.plot_team_score_analysis(team_scores, team.name)
+        team_points_plot = espn_plotter.plot_team_total_scores(team_scores, team.name)
+
+        # Keyed by the Dashboard's graph IDs
+        team_bundles[team.id] = {
+            "name": team.name,
+            "figures": {
+                "team-scores": add_figure(team_points_plot[team.name]),
+                "team-graph": add_figure(luckiness_plot[team.name]),
+            },
+        }
+
+    return {
+        "standings": _get_table_bundle(league_data["standings"]),
+        "playoff_odds": _get_table_bundle(league_data["playoff_odds"]),
+        "traces": traces,
+        "templates": templates,
+        "teams": team_bundles,
+    }
+
+
+def export_league(
+    league_id: int,
+    year: int,
+    basic_info: BasicInfo,
+    matchup_info: MatchupInfo,
+    out_dir: str = DEFAULT_OUT_DIR,
+    plotly_js_url: str = None,
+    league_data: dict = None
+) -> str:
+    """
+    Export a league's dashboard to ``out_dir/<league_id>/<year>/``
+
+    Every exported league shares one Plotly JS asset in ``out_dir``, named by its version so it
+    can be cached indefinitely, unless ``plotly_js_url`` points the pages at a hosted copy.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        basic_info (BasicInfo): Basic league information
+        matchup_info (MatchupInfo): League matchup information
+        out_dir (str): Root directory of the exported bundle
+        plotly_js_url (str): URL of Plotly JS to load instead of writing a shared local copy
+        league_data (dict): League data already built by build_league_data, if any
+
+    Returns:
+        str: Path of the league's exported index.html
+    """
+    league_dir = os.path.join(out_dir, str(league_id), str(year))
+    os.makedirs(league_dir, exist_ok=True)
+
+    if plotly_js_url is None:
+        plotly_js_path = write_plotly_js(out_dir)
+        plotly_js_url = os.path.relpath(plotly_js_path, league_dir).replace(os.sep, "/")
+
+    teams = basic_info.get_teams()
+    if league_data is None:
+        league_data = build_league_data(basic_info, matchup_info)
+    bundle = build_bundle(league_data, teams)
+
+    _write_text(
+        os.path.join(league_dir, "league.json"),
+        json.dumps(bundle, cls=PlotlyJSONEncoder, separators=(",", ":")),
+    )
+
+    page = _PAGE_TEMPLATE.format(
+        title=html.escape(get_page_title(league_data)),
+        subtitle=html.escape(SUBTITLE),
+        stylesheets="\n".join(
+            f'<link rel="stylesheet" href="{html.escape(url)}">' for url in EXTERNAL_STYLESHEETS
+        ),
+        plotly_js=html.escape(plotly_js_url),
+        standings=_render_table(bundle["standings"]),
+        playoff_odds=_render_table(bundle["playoff_odds"]),
+        team_options="\n".join(
+            f'<option value="{team.id}">{html.escape(team.name)}</option>'
+            for team in teams if team.id in bundle["teams"]
+        ),
+    )
+
+    index_path = os.path.join(league_dir, "index.html")
+    _write_text(index_path, page)
+
+    return index_path
+
+
+def write_plotly_js(out_dir: str) -> str:
+    """
+    Write the shared Plotly JS asset to ``out_dir``, unless it is already there
+
+    Args:
+        out_dir (str): Root directory of the exported bundle
+
+    Returns:
+        str: Path of the asset, named by Plotly JS version
+    """
+    plotly_js_path = os.path.join(out_dir, f"plotly-{get_plotlyjs_version()}.min.js")
+
+    if not os.path.exists(plotly_js_path):
+        os.makedirs(out_dir, exist_ok=True)
+        _write_text(plotly_js_path, get_plotlyjs())
+
+    return plotly_js_path
+
+
+def _get_table_bundle(data_table) -> dict:
+    return {
+        "columns": [column["name"] for column in data_table.columns],
+        "data": data_table.data,
+    }
+
+
+def _render_table(table: dict) -> str:
+    header = "".join(f"<th>{html.escape(str(column))}</th>" for column in table["columns"])
+    rows = "".join(
+        "<tr>"
+        + "".join(
+            f"<td>{html.escape(str(row.get(column, '')))}</td>" for column in table["columns"]
+        )
+        + "</tr>"
+        for row in table["data"]
+    )
+
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>"
+
+
+def _write_text(path: str, text: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out_file:
+        out_file.write(text)
+
+    os.replace(tmp_path, path)
+
+
+def main():
+    """
+    Command line entry point for the static export
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("league_id", type=int, nargs="?", default=LEAGUE_ID, help="ESPN league ID")
+    parser.add_argument("--year", type=int, default=YEAR, help="Season to export")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Root directory of the bundle")
+    parser.add_argument(
+        "--plotly-js-url", default=None,
+        help="Load Plotly JS from this URL instead of a shared copy in the output directory"
+    )
+    args = parser.parse_args()
+
+    basic_info, matchup_info = fetch_league_info(args.league_id, args.year)
+
+    index_path = export_league(
+        args.league_id,
+        args.year,
+        basic_info,
+        matchup_info,
+        out_dir=args.out_dir,
+        plotly_js_url=args.plotly_js_url,
+    )
+    print(f"Exported {index_path}")
+
+
+if __name__ == '__main__':
+    main()
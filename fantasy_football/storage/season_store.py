@@ -0,0 +1,463 @@
+"""
+Local columnar store of league seasons, backed by SQLite
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.constants import BENCH_LINEUP_SLOT_IDS
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.espn_requests.roster_info import RosterInfo
+
+DATA_DIR = os.environ.get(
+    "FANTASY_FOOTBALL_DATA_DIR", os.path.join(os.path.expanduser("~"), ".fantasy_football")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    league_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    saved_at REAL NOT NULL,
+    league_meta TEXT,
+    PRIMARY KEY (league_id, year)
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    league_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    location TEXT,
+    nickname TEXT,
+    abbrev TEXT,
+    PRIMARY KEY (league_id, year, team_id)
+);
+
+CREATE TABLE IF NOT EXISTS team_weeks (
+    league_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    opponent_id INTEGER NOT NULL,
+    points_for REAL NOT NULL,
+    points_against REAL NOT NULL,
+    result TEXT NOT NULL,
+    is_home INTEGER NOT NULL,
+    game_index INTEGER NOT NULL,
+    game_id INTEGER,
+    PRIMARY KEY (league_id, year, week, team_id)
+);
+
+CREATE TABLE IF NOT EXISTS player_weeks (
+    league_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    slot_id INTEGER NOT NULL,
+    position_id INTEGER NOT NULL,
+    points REAL NOT NULL,
+    PRIMARY KEY (league_id, year, week, team_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    full_name TEXT
+);
+"""
+
+# Columns added after the first release, added to existing databases on open
+_ADDED_COLUMNS = {
+    "seasons": {"league_meta": "TEXT"},
+    "team_weeks": {"game_id": "INTEGER"},
+}
+
+# Top-level payload keys stored as rows; everything else (settings, status, scoring period) is
+# kept as JSON in seasons.league_meta
+_ROW_KEYS = ("id", "seasonId", "teams", "schedule")
+
+_RESULT_TO_WINNER = {"W": "HOME", "L": "AWAY", "T": "TIE", "U": "UNDECIDED"}
+
+
+class SeasonStore:
+    """
+    Local store of normalized league seasons, one row per team per week
+
+    Seasons are written once from the ESPN payload and then read back with filtered SQL
+    queries, so multi-season history doesn't require re-parsing the raw JSON. The
+    ``team_weeks`` table is keyed (and so indexed) on (league_id, year, week, team_id). League
+    settings and status are kept as JSON alongside each season.
+
+    Args:
+        data_dir (str): Directory holding the store's database file
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+
+    Methods:
+        has_season (bool): Returns whether a season has been stored
+        save_season (None): Stores a season's teams and schedule
+        load_teams_df (pd.DataFrame): Returns a season's teams, like BasicInfo.get_teams_dataframe
+        load_games_df (pd.DataFrame): Returns a season's games, like MatchupInfo.get_all_games_df
+        load_team_results (pd.DataFrame): Returns filtered team-week results across seasons
+        load_league_info (dict): Returns an ESPN-shaped payload for BasicInfo/MatchupInfo
+        save_player_weeks (None): Stores a season's player-week points
+        load_player_weeks (pd.DataFrame): Returns a season's player-week points, like RosterInfo
+        load_player_names (dict): Returns stored player names keyed by player ID
+    """
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.db_path: str = os.path.join(data_dir, "seasons.sqlite3")
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+            for table, columns in _ADDED_COLUMNS.items():
+                existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+
+                for column, column_type in columns.items():
+                    if column not in existing:
+                        connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    @contextlib.contextmanager
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path)
+
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def has_season(self, league_id: int, year: int) -> bool:
+        """
+        Whether a season has been stored
+
+        Seasons saved before league settings were stored count as missing, so they are fetched
+        and saved again.
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+
+        Returns:
+            bool: True if the season is in the store
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM seasons WHERE league_id = ? AND year = ? "
+                "AND league_meta IS NOT NULL",
+                (league_id, year),
+            ).fetchone()
+
+        return row is not None
+
+    def save_season(
+        self,
+        league_id: int,
+        year: int,
+        basic_info: BasicInfo,
+        matchup_info: MatchupInfo
+    ) -> None:
+        """
+        Store a season's teams, schedule, settings and status, replacing any stored copy
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            basic_info (BasicInfo): Basic league information for the season
+            matchup_info (MatchupInfo): Matchup information for the season
+
+        Returns:
+            None
+        """
+        teams = [
+            (league_id, year, team["id"], team.get("location"), team.get("nickname"), team.get("abbrev"))
+            for team in basic_info.get_basic_teams_list()
+        ]
+
+        games_df = matchup_info.get_all_games_df()
+        game_index = np.arange(len(games_df))
+        # One entry per row of games_df, which keeps the schedule's order
+        game_ids = np.array(
+            [game.get("id") for game in matchup_info.league_matchup_info["schedule"]], dtype=object
+        )
+
+        league_meta = {
+            key: value for key, value in basic_info.league_basic_info.items()
+            if key not in _ROW_KEYS
+        }
+
+        winner = games_df["Winner"].str.upper().to_numpy()
+        home_result = np.select([winner == "HOME", winner == "AWAY", winner == "TIE"], ["W", "L", "T"], "U")
+        away_result = np.select([winner == "AWAY", winner == "HOME", winner == "TIE"], ["W", "L", "T"], "U")
+
+        team_weeks = pd.DataFrame({
+            "league_id": league_id,
+            "year": year,
+            "week": np.concatenate([games_df["Week"], games_df["Week"]]),
+            "team_id": np.concatenate([games_df["Team1"], games_df["Team2"]]),
+            "opponent_id": np.concatenate([games_df["Team2"], games_df["Team1"]]),
+            "points_for": np.concatenate([games_df["Score1"], games_df["Score2"]]),
+            "points_against": np.concatenate([games_df["Score2"], games_df["Score1"]]),
+            "result": np.concatenate([home_result, away_result]),
+            "is_home": np.repeat([1, 0], len(games_df)),
+            "game_index": np.concatenate([game_index, game_index]),
+            "game_id": np.concatenate([game_ids, game_ids]),
+        })
+
+        with self._connect() as connection:
+            for table in ("seasons", "teams", "team_weeks"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE league_id = ? AND year = ?", (league_id, year)
+                )
+
+            connection.executemany("INSERT INTO teams VALUES (?, ?, ?, ?, ?, ?)", teams)
+            connection.executemany(
+                f"INSERT INTO team_weeks ({', '.join(team_weeks.columns)}) "
+                f"VALUES ({', '.join('?' * len(team_weeks.columns))})",
+                team_weeks.itertuples(index=False, name=None),
+            )
+            connection.execute(
+                "INSERT INTO seasons (league_id, year, saved_at, league_meta) VALUES (?, ?, ?, ?)",
+                (league_id, year, time.time(), json.dumps(league_meta)),
+            )
+
+    def load_teams_df(self, league_id: int, year: int) -> pd.DataFrame:
+        """
+        Get a stored season's teams
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+
+        Returns:
+            pd.DataFrame: Pandas DataFrame of team ID, name, and abbreviation
+        """
+        with self._connect() as connection:
+            teams_df = pd.read_sql_query(
+                "SELECT team_id AS id, location || ' ' || nickname AS 'team name', abbrev "
+                "FROM teams WHERE league_id = ? AND year = ? ORDER BY rowid",
+                connection,
+                params=(league_id, year),
+            )
+
+        return teams_df.set_index("id")
+
+    def load_games_df(self, league_id: int, year: int) -> pd.DataFrame:
+        """
+        Get a stored season's games
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+
+        Returns:
+            pd.DataFrame: Pandas DataFrame of all game matchup scores
+        """
+        with self._connect() as connection:
+            games_df = pd.read_sql_query(
+                "SELECT week AS Week, team_id AS Team1, points_for AS Score1, "
+                "opponent_id AS Team2, points_against AS Score2, result AS Winner "
+                "FROM team_weeks WHERE league_id = ? AND year = ? AND is_home = 1 "
+                "ORDER BY game_index",
+                connection,
+                params=(league_id, year),
+            )
+
+        games_df["Winner"] = games_df["Winner"].map(_RESULT_TO_WINNER)
+
+        return games_df
+
+    def load_team_results(
+        self,
+        league_id: int,
+        years: list = None,
+        weeks: list = None,
+        team_id: int = None
+    ) -> pd.DataFrame:
+        """
+        Get stored team-week results, filtered in SQL
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            years (list): Years to include, or None for every stored year
+            weeks (list): Weeks to include, or None for every week
+            team_id (int): A single team to include, or None for every team
+
+        Returns:
+            pd.DataFrame: One row per team per week with columns Year, Week, Team, Opponent,
+                PointsFor, PointsAgainst, Result and Win
+        """
+        query = (
+            "SELECT year AS Year, week AS Week, team_id AS Team, opponent_id AS Opponent, "
+            "points_for AS PointsFor, points_against AS PointsAgainst, result AS Result "
+            "FROM team_weeks WHERE league_id = ?"
+        )
+        params = [league_id]
+
+        if years is not None:
+            query += f" AND year IN ({', '.join('?' * len(years))})"
+            params.extend(years)
+
+        if weeks is not None:
+            query += f" AND week IN ({', '.join('?' * len(weeks))})"
+            params.extend(weeks)
+
+        if team_id is not None:
+            query += " AND team_id = ?"
+            params.append(team_id)
+
+        query += " ORDER BY year, week, team_id"
+
+        with self._connect() as connection:
+            team_results = pd.read_sql_query(query, connection, params=params)
+
+        team_results["Win"] = (team_results["Result"] == "W").astype(int)
+
+        return team_results
+
+    def load_league_info(self, league_id: int, year: int) -> dict:
+        """
+        Get a stored season as an ESPN-shaped payload, like the one parse_league_info returns
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+
+        Returns:
+            dict: League payload (teams, schedule, settings and status) usable by BasicInfo and
+                MatchupInfo
+        """
+        with self._connect() as connection:
+            meta_row = connection.execute(
+                "SELECT league_meta FROM seasons WHERE league_id = ? AND year = ?",
+                (league_id, year),
+            ).fetchone()
+            teams = connection.execute(
+                "SELECT team_id, location, nickname, abbrev FROM teams "
+                "WHERE league_id = ? AND year = ? ORDER BY rowid",
+                (league_id, year),
+            ).fetchall()
+            games = connection.execute(
+                "SELECT game_id, week, team_id, points_for, opponent_id, points_against, result "
+                "FROM team_weeks WHERE league_id = ? AND year = ? AND is_home = 1 "
+                "ORDER BY game_index",
+                (league_id, year),
+            ).fetchall()
+
+        league_info = {
+            "id": league_id,
+            "seasonId": year,
+            "teams": [
+                {"id": team_id, "location": location, "nickname": nickname, "abbrev": abbrev}
+                for team_id, location, nickname, abbrev in teams
+            ],
+            "schedule": [
+                {
+                    **({"id": game_id} if game_id is not None else {}),
+                    "matchupPeriodId": week,
+                    "home": {"teamId": team1, "totalPoints": score1},
+                    "away": {"teamId": team2, "totalPoints": score2},
+                    "winner": _RESULT_TO_WINNER[result],
+                }
+                for game_id, week, team1, score1, team2, score2, result in games
+            ],
+        }
+
+        if meta_row is not None and meta_row[0] is not None:
+            league_info.update(json.loads(meta_row[0]))
+
+        return league_info
+
+    def save_player_weeks(self, league_id: int, year: int, roster_info: RosterInfo) -> None:
+        """
+        Store a season's player-week points, replacing the stored weeks it covers
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            roster_info (RosterInfo): Roster information for the season
+
+        Returns:
+            None
+        """
+        player_weeks = roster_info.get_player_weeks_df()
+
+        rows = pd.DataFrame({
+            "league_id": league_id,
+            "year": year,
+            "week": player_weeks["Week"].astype(int),
+            "team_id": player_weeks["Team"].astype(int),
+            "player_id": player_weeks["Player"].astype(int),
+            "slot_id": player_weeks["Slot"].astype(int),
+            "position_id": player_weeks["Position"].astype(int),
+            "points": player_weeks["Points"].astype(float),
+        })
+
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM player_weeks WHERE league_id = ? AND year = ? AND week = ?",
+                [(league_id, year, int(week)) for week in rows["week"].unique()],
+            )
+            connection.executemany(
+                "INSERT INTO player_weeks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows.itertuples(index=False, name=None),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO players VALUES (?, ?)", roster_info.player_names.items()
+            )
+
+    def load_player_weeks(self, league_id: int, year: int, weeks: list = None) -> pd.DataFrame:
+        """
+        Get a stored season's player-week points
+
+        Args:
+            league_id (int): The ID for the fantasy league
+            year (int): The year of the league
+            weeks (list): Weeks to include, or None for every stored week
+
+        Returns:
+            pd.DataFrame: Player-week points with the same columns and dtypes as
+                RosterInfo.get_player_weeks_df
+        """
+        query = (
+            "SELECT week AS Week, team_id AS Team, player_id AS Player, slot_id AS Slot, "
+            "position_id AS Position, points AS Points "
+            "FROM player_weeks WHERE league_id = ? AND year = ?"
+        )
+        params = [league_id, year]
+
+        if weeks is not None:
+            query += f" AND week IN ({', '.join('?' * len(weeks))})"
+            params.extend(weeks)
+
+        with self._connect() as connection:
+            player_weeks = pd.read_sql_query(query, connection, params=params)
+
+        player_weeks = player_weeks.astype({
+            "Week": np.int16, "Team": np.int16, "Player": np.int32,
+            "Slot": np.int16, "Position": np.int16, "Points": np.float32,
+        })
+        player_weeks["Starter"] = ~player_weeks["Slot"].isin(BENCH_LINEUP_SLOT_IDS)
+
+        return player_weeks
+
+    def load_player_names(self) -> dict:
+        """
+        Get every stored player's name
+
+        Args:
+            None
+
+        Returns:
+            dict: Player full names keyed by player ID
+        """
+        with self._connect() as connection:
+            return dict(connection.execute("SELECT player_id, full_name FROM players").fetchall())
@@ -0,0 +1,110 @@
+"""
+Server-side cache shared by every process of a deployment, backed by SQLite
+"""
+import contextlib
+import os
+import pickle
+import sqlite3
+import time
+
+from fantasy_football.storage.season_store import DATA_DIR
+
+SHARED_CACHE_PATH = os.environ.get(
+    "FANTASY_FOOTBALL_SHARED_CACHE", os.path.join(DATA_DIR, "shared_cache.sqlite3")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """
+    Key/value cache shared between processes through one SQLite file
+
+    Values are pickled. The database runs in WAL mode, so any number of web workers can read
+    while a loader process writes, and ``set_many`` publishes several entries atomically.
+
+    Args:
+        path (str): Path of the SQLite database file
+
+    Attributes:
+        path (str): Path of the SQLite database file
+
+    Methods:
+        get (object): Returns the value stored under a key
+        set (None): Stores a value under a key
+        set_many (None): Stores several values in one transaction
+    """
+    def __init__(self, path: str = SHARED_CACHE_PATH):
+        self.path: str = path
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0)
+
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str, default=None):
+        """
+        Get the value stored under a key
+
+        Args:
+            key (str): The cache key
+            default: Value to return if nothing is stored under the key
+
+        Returns:
+            object: The stored value, or ``default``
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value) -> None:
+        """
+        Store a value under a key, replacing any previous value
+
+        Args:
+            key (str): The cache key
+            value: Any picklable value
+
+        Returns:
+            None
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: dict) -> None:
+        """
+        Store several values in one transaction, so readers see all or none of them
+
+        Args:
+            items (dict): Values keyed by cache key
+
+        Returns:
+            None
+        """
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, updated_at) VALUES (?, ?, ?)",
+                [
+                    (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now)
+                    for key, value in items.items()
+                ],
+            )
@@ -0,0 +1,123 @@
+"""
+Generates synthetic ESPN-shaped league payloads for benchmarking and offline development
+"""
+import numpy as np
+
+
+def generate_league_info(
+    num_teams: int = 10,
+    num_weeks: int = 14,
+    league_id: int = 1,
+    year: int = 2021,
+    played_weeks: int = None,
+    seed: int = None
+) -> dict:
+    """
+    Generate one season's league payload shaped like an ESPN ``mTeam``/``mMatchup`` response
+
+    The schedule is a round-robin (circle method) repeated as needed; with an odd number of
+    teams one team has a bye each week. Weeks after ``played_weeks`` are left unplayed, with
+    zero scores and an ``UNDECIDED`` winner, like an in-progress ESPN season.
+
+    Args:
+        num_teams (int): Number of teams in the league
+        num_weeks (int): Number of matchup periods in the season
+        league_id (int): League ID to put in the payload
+        year (int): Season year to put in the payload
+        played_weeks (int): Number of weeks already played (defaults to every week)
+        seed (int): Seed for the random scores
+
+    Returns:
+        dict: Synthetic league payload
+    """
+    rng = np.random.default_rng(seed)
+    played_weeks = num_weeks if played_weeks is None else played_weeks
+
+    teams = [
+        {
+            "id": team_id,
+            "location": f"Team {team_id}",
+            "nickname": "Synthetics",
+            "abbrev": f"T{team_id}",
+        }
+        for team_id in range(1, num_teams + 1)
+    ]
+
+    # Circle method: fix the first slot and rotate the rest one place each week
+    slots = list(range(1, num_teams + 1)) + ([None] if num_teams % 2 else [])
+    team_means = rng.normal(110.0, 10.0, size=num_teams + 1)
+
+    schedule = []
+
+    for week in range(1, num_weeks + 1):
+        for i in range(len(slots) // 2):
+            home, away = slots[i], slots[-1 - i]
+
+            if home is None or away is None:
+                continue
+
+            if week <= played_weeks:
+                home_points = round(float(rng.normal(team_means[home], 20.0)), 2)
+                away_points = round(float(rng.normal(team_means[away], 20.0)), 2)
+                winner = "HOME" if home_points > away_points else "AWAY" if away_points > home_points else "TIE"
+            else:
+                home_points = away_points = 0.0
+                winner = "UNDECIDED"
+
+            schedule.append({
+                "id": len(schedule) + 1,
+                "matchupPeriodId": week,
+                "home": {"teamId": home, "totalPoints": home_points},
+                "away": {"teamId": away, "totalPoints": away_points},
+                "winner": winner,
+            })
+
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+    return {
+        "id": league_id,
+        "seasonId": year,
+        "scoringPeriodId": min(played_weeks + 1, num_weeks),
+        "status": {"currentMatchupPeriod": min(played_weeks + 1, num_weeks)},
+        "settings": {
+            "scheduleSettings": {"matchupPeriodCount": num_weeks, "playoffTeamCount": 4},
+        },
+        "teams": teams,
+        "schedule": schedule,
+    }
+
+
+def generate_league_seasons(
+    num_teams: int = 10,
+    num_weeks: int = 14,
+    num_seasons: int = 1,
+    league_id: int = 1,
+    first_year: int = 2021,
+    seed: int = None
+) -> dict:
+    """
+    Generate several fully played seasons of a synthetic league
+
+    Args:
+        num_teams (int): Number of teams in the league
+        num_weeks (int): Number of matchup periods in each season
+        num_seasons (int): Number of seasons to generate
+        league_id (int): League ID to put in the payloads
+        first_year (int): Year of the first season
+        seed (int): Seed for the random scores
+
+    Returns:
+        dict: League payloads keyed by (league_id, year)
+    """
+    seeds = np.random.SeedSequence(seed).spawn(num_seasons)
+
+    return {
+        (league_id, first_year + i): generate_league_info(
+            num_teams=num_teams,
+            num_weeks=num_weeks,
+            league_id=league_id,
+            year=first_year + i,
+            seed=season_seed.generate_state(1)[0],
+        )
+        for i, season_seed in enumerate(seeds)
+    }
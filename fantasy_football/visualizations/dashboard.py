@@ -1,19 +1,93 @@
 """
 Contains class to create plotly dashboard
 """
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+import re
+import threading
+import time
+from typing import TYPE_CHECKING
+
 import dash
 from dash import dcc
 from dash import html
-from dash.dependencies import Input, Output
-import plotly.graph_objects as go
+from dash.dependencies import Input, Output, State
+import flask
+
+from fantasy_football.metrics import REGISTRY, stage, timed_callback
+
+if TYPE_CHECKING:
+    # Only for annotations; the analytics stack is imported when a league is loaded
+    from fantasy_football.live_refresh import LiveRefresher
+
+# Number of teams whose figures are kept in memory after being built, per league
+DEFAULT_FIGURE_CACHE_SIZE = 32
+
+# Number of leagues opened by URL whose data is kept in memory
+DEFAULT_LEAGUE_CACHE_SIZE = 8
+
+# Seconds a failed league load is served from cache before a visit tries it again
+FAILED_LOAD_RETRY_SECONDS = 30.0
+
+LOGGER = logging.getLogger(__name__)
+
+TITLE = "Fumble Inn Analytics"
+SUBTITLE = "Presents insights into the greatest league in all of fantasy football"
+EXTERNAL_STYLESHEETS = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
+
+_LEAGUE_PATH = re.compile(r"^/league/(\d+)/(\d+)/?$")
+
+
+def get_page_title(league_data: dict) -> str:
+    """
+    Get the page title of a league
+
+    Args:
+        league_data (dict): League data, as from build_league_data
+
+    Returns:
+        str: "<league name> Analytics", or the default title if the name is unknown
+    """
+    league_name = league_data.get("name")
+
+    return f"{league_name} Analytics" if league_name else TITLE
 
 
 class Dashboard:
     """
     Creates plotly dashboard
 
+    Team figures are built on demand when a team is selected and kept in a bounded LRU cache,
+    so startup only needs the compact per-team score data. When a ``LiveRefresher`` is given,
+    clients poll it through an interval component, and the standings table and the shown team's
+    figures are rebuilt once any score has changed. A ``SharedLeagueData`` can be given instead, to
+    serve data (and pre-rendered figures) published by a separate loader process.
+
+    The given league is served at ``/`` and ``/league/<id>/<year>``. With a ``league_loader``,
+    any other ``/league/<id>/<year>`` is loaded on first access and kept in an LRU of at most
+    ``league_cache_size`` leagues; the least recently used league is dropped (and its refresher
+    stopped) when a new one is loaded.
+
+    Leagues are loaded on a background thread while the page shows a loading message, so when
+    ``league_data`` is left out the server can start before the default league has been fetched.
+    A load that fails is shown as an error for ``FAILED_LOAD_RETRY_SECONDS`` before it is retried.
+
+    The server also exposes this process's metrics at ``/metrics``, in the Prometheus text format.
+
     Args:
-        team_plots (list): List of team luckiness plots
+        league_id (int): The ID of the league served at ``/``
+        year (int): The year of the league served at ``/``
+        league_data (dict): Standings table and per-team weekly score data, or None to load the
+            league with ``league_loader`` in the background
+        teams (list): List of TeamInfo for every team
+        figure_cache_size (int): Number of teams whose figures are kept after being built
+        refresher (LiveRefresher): Background refresher of live-week scores (or SharedLeagueData
+            reader of a loader process), if any
+        league_loader (callable): Called as ``league_loader(league_id, year)`` to load another
+            league, returning its league data, TeamInfo list and refresher (or None)
+        league_cache_size (int): Number of leagues loaded by URL to keep in memory
 
     Attributes:
         external_stylesheets (list): List of external CSS stylesheets
@@ -21,20 +95,54 @@ class Dashboard:
         app_children (list): Child elements for the dashboard
 
     Methods:
-        build_app (None): Builds the dashboard
+        build_layout (None): Builds the dashboard layout and callbacks
+        build_app (None): Builds the dashboard and runs the development server
     """
-    def __init__(self, team_plots: dict, team_names: list):
-        self._team_plots: dict = team_plots
-        self._team_names: list = team_names
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        league_data: dict = None,
+        teams: list = None,
+        figure_cache_size: int = DEFAULT_FIGURE_CACHE_SIZE,
+        refresher: "LiveRefresher" = None,
+        league_loader=None,
+        league_cache_size: int = DEFAULT_LEAGUE_CACHE_SIZE
+    ):
+        if league_data is None and league_loader is None:
+            raise ValueError("Either league_data or a league_loader is needed")
 
-        self.external_stylesheets: list = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
-        self.app: dash.Dash = dash.Dash(__name__, external_stylesheets=self.external_stylesheets)
+        self._figure_cache_size: int = figure_cache_size
+        self._league_loader = league_loader
+        self._league_cache_size: int = league_cache_size
+
+        self._default_key: tuple = (league_id, year)
+        self._default_league: _LeagueState = None
+        if league_data is not None:
+            self._default_league = _LeagueState(
+                league_id, year, league_data, teams, refresher, figure_cache_size
+            )
+
+        self._leagues: collections.OrderedDict = collections.OrderedDict()
+        self._leagues_lock: threading.Lock = threading.Lock()
+        self._loads: dict = {}
+        self._load_failure_times: dict = {}
+        self._load_executor: ThreadPoolExecutor = None
+
+        self.external_stylesheets: list = EXTERNAL_STYLESHEETS
+        self.app: dash.Dash = dash.Dash(
+            __name__,
+            external_stylesheets=self.external_stylesheets,
+            # League pages are rendered by the URL callback, after the initial layout
+            suppress_callback_exceptions=True,
+        )
+        self.app.server.add_url_rule("/metrics", "metrics", self._serve_metrics)
 
         self.app_children: list = []
 
-    def build_app(self) -> None:
+    def build_layout(self) -> None:
         """
-        Builds the dashboard
+        Builds the dashboard layout and registers its callbacks
 
         Args:
             None
@@ -42,52 +150,155 @@ class Dashboard:
         Returns:
             None
         """
-        self._build_title()
-        self._build_league_standings_table()
-        self._build_team_luckiness_children()
+        self.app_children = [
+            dcc.Location(id="url", refresh=False),
+            html.Div(id="page-content"),
+            # Re-renders the page every second while its league is loading
+            dcc.Interval(id="loading-interval", interval=1000, disabled=True),
+        ]
 
         self.app.layout = html.Div(style={}, children=self.app_children)
-        self.app.run_server(debug=True)
 
-    def _build_title(self) -> None:
-        self.app_children.append(
+        self._register_callbacks()
+
+        # Start fetching the default league before the first visitor arrives
+        self._get_league(*self._default_key, wait=False)
+
+    def build_app(self, debug: bool = True) -> None:
+        """
+        Builds the dashboard and runs the single-process development server
+
+        For production, serve ``app.server`` with a WSGI server instead (see ``wsgi.py``).
+
+        Args:
+            debug (bool): Run with Dash's debug mode and reloader
+
+        Returns:
+            None
+        """
+        self.build_layout()
+        self.app.run_server(debug=debug)
+
+    @staticmethod
+    def _serve_metrics() -> flask.Response:
+        return flask.Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    def _get_league(self, league_id: int, year: int, wait: bool = True):
+        key = (league_id, year)
+
+        with self._leagues_lock:
+            if key == self._default_key and self._default_league is not None:
+                return self._default_league
+
+            league = self._leagues.get(key)
+            if league is not None:
+                self._leagues.move_to_end(key)
+                return league
+
+            if self._league_loader is None:
+                return None
+
+            # One load per league at a time, so concurrent first visits don't fetch it twice,
+            # and a failed load is kept for a while, so page refreshes don't retry it each time
+            future = self._loads.get(key)
+            failure_time = self._load_failure_times.get(key)
+            if (
+                failure_time is not None
+                and time.monotonic() - failure_time >= FAILED_LOAD_RETRY_SECONDS
+            ):
+                future = None
+
+            is_new_load = future is None
+            if is_new_load:
+                if self._load_executor is None:
+                    self._load_executor = ThreadPoolExecutor(
+                        max_workers=2, thread_name_prefix="league-loader"
+                    )
+                future = self._load_executor.submit(self._load_league, league_id, year)
+                self._loads[key] = future
+                self._load_failure_times.pop(key, None)
+
+        # Added outside the lock, as an already finished load runs the callback right here
+        if is_new_load:
+            future.add_done_callback(functools.partial(self._finish_load, key))
+
+        if not wait and not future.done():
+            return None
+
+        return future.result()
+
+    def _finish_load(self, key: tuple, future) -> None:
+        with self._leagues_lock:
+            if self._loads.get(key) is not future:
+                return
+
+            if future.exception() is None:
+                # The league is now in the LRU, so later visits don't look at the load
+                del self._loads[key]
+            else:
+                self._load_failure_times[key] = time.monotonic()
+
+    def _load_league(self, league_id: int, year: int):
+        league_data, teams, refresher = self._league_loader(league_id, year)
+        league = _LeagueState(league_id, year, league_data, teams, refresher, self._figure_cache_size)
+
+        evicted_leagues = []
+
+        with self._leagues_lock:
+            if (league_id, year) == self._default_key:
+                self._default_league = league
+                return league
+
+            self._leagues[(league_id, year)] = league
+
+            while len(self._leagues) > self._league_cache_size:
+                evicted_leagues.append(self._leagues.popitem(last=False)[1])
+
+        for evicted_league in evicted_leagues:
+            evicted_league.close()
+
+        return league
+
+    def _build_league_page(self, league) -> list:
+        app_children = []
+
+        app_children.append(
             html.H1(
-                children="Fumble Inn Analytics",
+                children=get_page_title(league.league_data),
                 style={
                     "textAlign": "center",
                 }
             )
         )
 
-        self.app_children.append(
+        app_children.append(
             html.Div(
-                children="Presents insights into the greatest league in all of fantasy football",
+                children=SUBTITLE,
                 style={
                     "textAlign": "center",
                 }
             )
         )
 
-    def _build_league_standings_table(self) -> None:
-        self.app_children.append(
+        app_children.append(
+            html.Div([
+                league.league_data["standings"]
+            ])
+        )
+
+        app_children.append(
             html.Div([
-                self._team_plots["standings"]
+                html.H3("Playoff Odds (%)"),
+                league.league_data["playoff_odds"],
             ])
         )
 
-    def _build_team_luckiness_children(self) -> None:
-        self.app_children.extend([
+        app_children.extend([
             html.Label("Select Team"),
 
             dcc.Dropdown(
-                options=[
-                    {
-                        "label": i["location"] + " " + i["nickname"],
-                        "value": i["location"] + " " + i["nickname"]
-                    }
-                    for i in self._team_names
-                ],
-                value=self._team_names[0]["location"] + " " + self._team_names[0]["nickname"],
+                options=[{"label": team.name, "value": team.name} for team in league.teams],
+                value=league.teams[0].name,
                 id="my-input",
             ),
 
@@ -98,15 +309,214 @@ class Dashboard:
             dcc.Graph(
                 id='team-graph',
             ),
+
+            dcc.Interval(
+                id="refresh-interval",
+                interval=int(league.refresher.interval * 1000) if league.refresher else 60000,
+                disabled=league.refresher is None,
+            ),
+
+            dcc.Store(id="shown-data"),
+            dcc.Store(id="league-key", data=list(league.key)),
         ])
 
+        return app_children
+
+    def _build_message_page(self, message: str) -> list:
+        return [
+            html.H1(children=TITLE, style={"textAlign": "center"}),
+            html.Div(children=message, style={"textAlign": "center"}),
+        ]
+
+    def _register_callbacks(self) -> None:
+        @self.app.callback(
+            Output(component_id='page-content', component_property='children'),
+            Output(component_id='loading-interval', component_property='disabled'),
+            Input(component_id='url', component_property='pathname'),
+            Input(component_id='loading-interval', component_property='n_intervals')
+        ) # pylint: disable=W0612
+        @timed_callback("display_page")
+        def display_page(pathname: str, n_intervals: int) -> list:
+            # pylint: disable=W0613
+            if pathname in (None, "", "/"):
+                league_id, year = self._default_key
+            else:
+                match = _LEAGUE_PATH.match(pathname)
+                if match is None:
+                    return self._build_message_page(f"No page at {pathname}"), True
+
+                league_id, year = int(match.group(1)), int(match.group(2))
+
+            try:
+                league = self._get_league(league_id, year, wait=False)
+            except Exception as error:  # pylint: disable=W0703
+                LOGGER.exception("Loading league %s (%s) failed", league_id, year)
+                return self._build_message_page(
+                    f"Could not load league {league_id} ({year}): {error}"
+                ), True
+
+            if league is None:
+                if self._league_loader is None:
+                    return self._build_message_page(
+                        f"League {league_id} ({year}) is not available"
+                    ), True
+
+                return self._build_message_page(f"Loading league {league_id} ({year})..."), False
+
+            return self._build_league_page(league), True
+
         @self.app.callback(
             Output(component_id='team-graph', component_property='figure'),
             Output(component_id='team-scores', component_property='figure'),
-            Input(component_id='my-input', component_property='value')
+            Output(component_id='standings-table', component_property='data'),
+            Output(component_id='playoff-odds-table', component_property='data'),
+            Output(component_id='shown-data', component_property='data'),
+            Input(component_id='my-input', component_property='value'),
+            Input(component_id='refresh-interval', component_property='n_intervals'),
+            State(component_id='shown-data', component_property='data'),
+            State(component_id='league-key', component_property='data')
         ) # pylint: disable=W0612
-        def update_output_div(input_value: str) -> go.Figure:
-            luckiness_plot = self._team_plots["luckiness_plots"][input_value]
-            team_points_plot = self._team_plots["team_points_plots"][input_value]
+        @timed_callback("update_output_div")
+        def update_output_div(
+            input_value: str, n_intervals: int, shown_data: dict, league_key: list
+        ) -> tuple:
+            # pylint: disable=W0613
+            # Never wait here: an evicted league is reloaded in the background, and a failed
+            # load is shown by display_page
+            try:
+                league = self._get_league(*league_key, wait=False)
+            except Exception:  # pylint: disable=W0703
+                LOGGER.exception("Loading league %s (%s) failed", *league_key)
+                return (dash.no_update,) * 5
+
+            if league is None:
+                return (dash.no_update,) * 5
+
+            league.sync_with_refresher()
+
+            shown_data = shown_data or {}
+            team_revision = league.team_revisions.get(league.team_ids_by_name[input_value], 0)
+
+            new_shown_data = {
+                "league": list(league.key),
+                "version": league.data_version,
+                "team": input_value,
+                "team_revision": team_revision,
+            }
+
+            if new_shown_data == shown_data:
+                return (dash.no_update,) * 5
+
+            standings_data = dash.no_update
+            playoff_odds_data = dash.no_update
+            if shown_data.get("version", 0) != league.data_version:
+                standings_data = league.league_data["standings"].data
+                playoff_odds_data = league.league_data["playoff_odds"].data
+
+            luckiness_plot, team_points_plot = league.get_team_figures(input_value, team_revision)
+
+            return luckiness_plot, team_points_plot, standings_data, playoff_odds_data, new_shown_data
+
+
+class _LeagueState:
+    """
+    One league's data as served by the Dashboard, with its own bounded cache of team figures
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        league_data (dict): Standings table and per-team weekly score data
+        teams (list): List of TeamInfo for every team
+        refresher (LiveRefresher): Refresher (or SharedLeagueData) to sync with, if any
+        figure_cache_size (int): Number of teams whose figures are kept after being built
+
+    Attributes:
+        key (tuple): The (league_id, year) of the league
+        league_data (dict): Latest standings table and per-team weekly score data
+        teams (list): List of TeamInfo for every team
+        refresher (LiveRefresher): Refresher (or SharedLeagueData) to sync with, if any
+        team_ids_by_name (dict): Team IDs keyed by team name
+        data_version (int): Version of the league data last synced
+        team_revisions (dict): Revision of each team's data, keyed by team ID
+
+    Methods:
+        sync_with_refresher (None): Picks up the refresher's latest league data
+        get_team_figures (tuple): Returns a team's figures, building them if not cached
+        close (None): Stops the refresher, if any
+    """
+    def __init__(
+        self,
+        league_id: int,
+        year: int,
+        league_data: dict,
+        teams: list,
+        refresher: "LiveRefresher",
+        figure_cache_size: int
+    ):
+        self.key: tuple = (league_id, year)
+        self.league_data: dict = league_data
+        self.teams: list = teams
+        self.refresher: "LiveRefresher" = refresher
+
+        self.team_ids_by_name: dict = {team.name: team.id for team in teams}
+        self.data_version: int = 0
+        self.team_revisions: dict = {}
+
+        self._team_score_groups = league_data["team_scores"].groupby("Team1")
+
+        self.get_team_figures = functools.lru_cache(maxsize=figure_cache_size)(
+            self._build_team_figures
+        )
+
+    def sync_with_refresher(self) -> None:
+        """
+        Pick up the refresher's latest league data, if it has changed
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.refresher is None:
+            return
 
-            return luckiness_plot, team_points_plot
+        version, league_data, team_revisions = self.refresher.get_snapshot()
+
+        if version != self.data_version:
+            self.league_data = league_data
+            self.team_revisions = team_revisions
+            self._team_score_groups = league_data["team_scores"].groupby("Team1")
+            self.data_version = version
+
+    def _build_team_figures(self, team_name: str, team_revision: int) -> tuple:
+        # team_revision is only part of the LRU key, so a team's figures are rebuilt on change
+        # pylint: disable=W0613
+        team_id = self.team_ids_by_name[team_name]
+
+        # A SharedLeagueData refresher serves figures pre-rendered by the loader process
+        if hasattr(self.refresher, "get_team_figures"):
+            figures = self.refresher.get_team_figures(team_id, team_revision)
+            if figures is not None:
+                return figures
+
+        from fantasy_football.visualizations.espn_plotter import ESPNPlotter  # pylint: disable=C0415
+
+        team_scores = self._team_score_groups.get_group(team_id).reset_index(drop=True)
+
+        with stage("plot_team_figures"):
+            return ESPNPlotter().plot_team_figures(team_scores, team_name)
+
+    def close(self) -> None:
+        """
+        Stop the league's refresher, if it runs in the background
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        # Only a LiveRefresher runs in the background
+        if hasattr(self.refresher, "stop"):
+            self.refresher.stop()
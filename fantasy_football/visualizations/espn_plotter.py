@@ -17,6 +17,8 @@ class ESPNPlotter:
 
     Methods:
         plot_team_score_analysis (None): Plots team's and opponent's points compared to average
+        plot_team_total_scores (dict): Plots a team's weekly score
+        plot_team_figures (tuple): Plots both of a team's Dashboard figures
     """
     def __init__(self):
         pass
@@ -118,3 +120,20 @@ class ESPNPlotter:
         )
 
         return {team_name: fig}
+
+    def plot_team_figures(self, team_scores: pd.DataFrame, team_name: str) -> tuple:
+        """
+        Plot both of the figures the Dashboard shows for a team
+
+        Args:
+            team_scores (pd.DataFrame): DataFrame of a team's scores, by matchup (week)
+            team_name (str): The name of the team to be plotted
+
+        Returns:
+            go.Figure: The team's wins and losses compared to average
+            go.Figure: The team's weekly points
+        """
+        luckiness_plot = self.plot_team_score_analysis(team_scores, team_name)
+        team_points_plot = self.plot_team_total_scores(team_scores, team_name)
+
+        return luckiness_plot[team_name], team_points_plot[team_name]
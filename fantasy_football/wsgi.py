@@ -0,0 +1,73 @@
+"""
+Production WSGI entry point, e.g. ``gunicorn --workers 4 fantasy_football.wsgi:server``
+
+Workers never fetch from ESPN. They serve the league data and figures that the loader process
+(``python -m fantasy_football.loader``) publishes to the shared cache.
+"""
+import os
+import time
+
+from fantasy_football.espn_requests.constants import LEAGUE_ID, YEAR
+from fantasy_football.loader import SharedLeagueData
+from fantasy_football.storage.shared_cache import SharedCache
+from fantasy_football.visualizations.dashboard import Dashboard
+
+# Seconds the background load of the league waits for the loader to publish it
+DEFAULT_STARTUP_TIMEOUT = 120.0
+
+
+def create_dashboard(
+    league_id: int,
+    year: int,
+    shared_cache: SharedCache = None,
+    startup_timeout: float = DEFAULT_STARTUP_TIMEOUT
+) -> Dashboard:
+    """
+    Create a Dashboard that reads a league (and any other published league) from the shared cache
+
+    Nothing is read at creation, so a worker starts serving right away: pages show the loading
+    message until the loader has published the league, then pick it up on their next poll.
+
+    Args:
+        league_id (int): The ID for the fantasy league
+        year (int): The year of the league
+        shared_cache (SharedCache): Cache the loader publishes to (defaults to the data directory's)
+        startup_timeout (float): Seconds to wait for the loader to publish the league before
+            showing an error
+
+    Returns:
+        Dashboard: The Dashboard, with its layout built
+    """
+    shared_cache = shared_cache or SharedCache()
+
+    def load_shared_league(load_league_id: int, load_year: int) -> tuple:
+        # Runs on the Dashboard's loader thread, so waiting here never blocks a request
+        shared_league = SharedLeagueData(load_league_id, load_year, shared_cache)
+
+        if (load_league_id, load_year) == (league_id, year):
+            deadline = time.monotonic() + startup_timeout
+            while not shared_league.is_published():
+                if time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"League {league_id} ({year}) was not published to the shared cache; "
+                        "is the loader running?"
+                    )
+                time.sleep(1.0)
+
+        # Other leagues are served if a loader process is publishing them too
+        _, league_data, _ = shared_league.get_snapshot()
+
+        return league_data, shared_league.get_teams(), shared_league
+
+    dashboard = Dashboard(league_id, year, league_loader=load_shared_league)
+    dashboard.build_layout()
+
+    return dashboard
+
+
+dashboard = create_dashboard(
+    int(os.environ.get("FANTASY_FOOTBALL_LEAGUE_ID", LEAGUE_ID)),
+    int(os.environ.get("FANTASY_FOOTBALL_YEAR", YEAR)),
+    shared_cache=SharedCache(),
+)
+server = dashboard.app.server
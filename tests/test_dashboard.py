@@ -0,0 +1,101 @@
+"""
+Tests for the Dashboard's league loading callbacks
+"""
+import threading
+import time
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import build_league_data
+from fantasy_football.synthetic_league import generate_league_info
+from fantasy_football.visualizations.dashboard import Dashboard
+
+
+def _load_synthetic_league(league_id: int, year: int) -> tuple:
+    league_info = generate_league_info(6, 10, league_id=league_id, year=year, seed=league_id)
+
+    basic_info = BasicInfo(league_id, year, client=object(), league_info=league_info)
+    matchup_info = MatchupInfo(league_id, year, client=object(), league_info=league_info)
+
+    return build_league_data(basic_info, matchup_info), basic_info.get_teams(), None
+
+
+def _post_team_update(client, league_key: list, team_name: str):
+    outputs = [
+        ("team-graph", "figure"),
+        ("team-scores", "figure"),
+        ("standings-table", "data"),
+        ("playoff-odds-table", "data"),
+        ("shown-data", "data"),
+    ]
+
+    return client.post("/_dash-update-component", json={
+        "output": f"..{'...'.join(f'{component}.{prop}' for component, prop in outputs)}..",
+        "outputs": [{"id": component, "property": prop} for component, prop in outputs],
+        "inputs": [
+            {"id": "my-input", "property": "value", "value": team_name},
+            {"id": "refresh-interval", "property": "n_intervals", "value": 1},
+        ],
+        "changedPropIds": ["refresh-interval.n_intervals"],
+        "state": [
+            {"id": "shown-data", "property": "data", "value": None},
+            {"id": "league-key", "property": "data", "value": league_key},
+        ],
+    })
+
+
+def _get_updated_outputs(response) -> dict:
+    assert response.status_code in (200, 204)
+
+    # Dash answers a callback that updates nothing with 204 or with an empty response
+    return response.get_json()["response"] if response.status_code == 200 else {}
+
+
+def _create_dashboard(league_loader) -> Dashboard:
+    league_data, teams, _ = _load_synthetic_league(1, 2021)
+
+    dashboard = Dashboard(1, 2021, league_data, teams, league_loader=league_loader)
+    dashboard.build_layout()
+
+    return dashboard
+
+
+def test_team_update_does_not_wait_for_a_league_load():
+    release = threading.Event()
+
+    def slow_loader(league_id: int, year: int) -> tuple:
+        release.wait(10)
+        return _load_synthetic_league(league_id, year)
+
+    dashboard = _create_dashboard(slow_loader)
+    client = dashboard.app.server.test_client()
+
+    start = time.perf_counter()
+    response = _post_team_update(client, [2, 2020], "Team 1 Synthetics")
+    elapsed = time.perf_counter() - start
+
+    release.set()
+
+    assert _get_updated_outputs(response) == {}
+    assert elapsed < 5
+
+    # Once loaded, the league's figures are served
+    dashboard._get_league(2, 2020)  # pylint: disable=W0212
+    response = _post_team_update(client, [2, 2020], "Team 1 Synthetics")
+    assert "team-graph" in _get_updated_outputs(response)
+
+
+def test_team_update_survives_a_failed_load():
+    def failing_loader(league_id: int, year: int) -> tuple:
+        raise ValueError(f"League {league_id} ({year}) is broken")
+
+    dashboard = _create_dashboard(failing_loader)
+    client = dashboard.app.server.test_client()
+
+    for _ in range(2):
+        response = _post_team_update(client, [3, 2020], "Team 1 Synthetics")
+        assert _get_updated_outputs(response) == {}
+        time.sleep(0.1)
+
+    response = _post_team_update(client, [1, 2021], "Team 1 Synthetics")
+    assert "team-graph" in _get_updated_outputs(response)
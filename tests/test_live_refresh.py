@@ -0,0 +1,84 @@
+"""
+Tests for the live-week refresher
+"""
+import copy
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.live_refresh import LiveRefresher
+from fantasy_football.synthetic_league import generate_league_info
+
+
+class _LiveClient:
+    """
+    Answers every live poll with the current matchup period's games, one with new scores
+    """
+    def __init__(self, league_info: dict, game_index: int):
+        week = league_info["status"]["currentMatchupPeriod"]
+        self._games = copy.deepcopy([
+            game for game in league_info["schedule"] if game["matchupPeriodId"] == week
+        ])
+
+        self._games[game_index]["home"]["totalPoints"] += 10.0
+        self._games[game_index]["away"]["totalPoints"] += 2.0
+
+    def get_league_info(self, *args, **kwargs) -> dict:  # pylint: disable=W0613
+        return {"schedule": copy.deepcopy(self._games)}
+
+
+def _create_refresher(game_index: int) -> tuple:
+    league_info = generate_league_info(6, 10, played_weeks=8, seed=4)
+
+    week = league_info["status"]["currentMatchupPeriod"]
+    for game in league_info["schedule"]:
+        if game["matchupPeriodId"] == week:
+            game["home"]["totalPoints"], game["away"]["totalPoints"] = 40.0, 30.0
+
+    basic_info = BasicInfo(1, 2021, client=object(), league_info=league_info)
+    matchup_info = MatchupInfo(1, 2021, client=object(), league_info=league_info)
+
+    refresher = LiveRefresher(
+        1, 2021, basic_info, matchup_info, client=_LiveClient(league_info, game_index)
+    )
+
+    return refresher, league_info
+
+
+def test_score_change_bumps_every_team_revision():
+    refresher, league_info = _create_refresher(game_index=1)
+    week = league_info["status"]["currentMatchupPeriod"]
+    changed_game = [game for game in league_info["schedule"] if game["matchupPeriodId"] == week][1]
+
+    _, old_league_data, _ = refresher.get_snapshot()
+
+    changed_team_ids = refresher.refresh()
+
+    version, league_data, team_revisions = refresher.get_snapshot()
+
+    assert changed_team_ids == {changed_game["home"]["teamId"], changed_game["away"]["teamId"]}
+    assert version == 1
+    assert team_revisions == {team["id"]: 1 for team in league_info["teams"]}
+
+    # Teams whose own game didn't change still see the new weekly average
+    unchanged_team = next(
+        team["id"] for team in league_info["teams"] if team["id"] not in changed_team_ids
+    )
+
+    def get_week_average(data: dict) -> float:
+        team_scores = data["team_scores"]
+        row = (team_scores["Team1"] == unchanged_team) & (team_scores["Week"] == week)
+        return team_scores.loc[row, "Avg"].item()
+
+    assert get_week_average(league_data) > get_week_average(old_league_data)
+
+
+def test_unchanged_poll_keeps_revisions():
+    refresher, _ = _create_refresher(game_index=0)
+    refresher.refresh()
+
+    # The second poll returns the same scores, so nothing is rebuilt
+    assert refresher.refresh() == set()
+
+    version, _, team_revisions = refresher.get_snapshot()
+    assert version == 1
+    assert set(team_revisions.values()) == {1}
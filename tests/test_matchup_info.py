@@ -0,0 +1,210 @@
+"""
+Tests for the matchup analytics, checked against plain loops over the schedule
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.synthetic_league import generate_league_info
+
+NUM_TEAMS = 8
+NUM_WEEKS = 10
+PLAYED_WEEKS = 5
+
+
+def _create_league_info(played_weeks: int = PLAYED_WEEKS, decided_live_games: int = 2) -> dict:
+    league_info = generate_league_info(NUM_TEAMS, NUM_WEEKS, played_weeks=played_weeks, seed=11)
+
+    # Some of the live week's games are already decided, but the week isn't final
+    for game in _get_week_games(league_info, played_weeks + 1)[:decided_live_games]:
+        game["home"]["totalPoints"], game["away"]["totalPoints"] = 95.5, 101.25
+        game["winner"] = "AWAY"
+
+    return league_info
+
+
+def _create_matchup_info(league_info: dict) -> MatchupInfo:
+    return MatchupInfo(1, 2021, client=object(), league_info=league_info)
+
+
+def _get_week_games(league_info: dict, week: int) -> list:
+    return [game for game in league_info["schedule"] if game["matchupPeriodId"] == week]
+
+
+def _get_reference_rows(league_info: dict) -> dict:
+    # One row per team per game, keyed by (week, team), straight from the schedule
+    results = {
+        "HOME": ("W", "L"), "AWAY": ("L", "W"), "TIE": ("T", "T"), "UNDECIDED": ("U", "U")
+    }
+
+    rows = {}
+    for game in league_info["schedule"]:
+        home, away = game["home"], game["away"]
+        home_result, away_result = results[game["winner"]]
+
+        rows[game["matchupPeriodId"], home["teamId"]] = (
+            away["teamId"], home["totalPoints"], away["totalPoints"], home_result
+        )
+        rows[game["matchupPeriodId"], away["teamId"]] = (
+            home["teamId"], away["totalPoints"], home["totalPoints"], away_result
+        )
+
+    return rows
+
+
+def _get_final_weeks(league_info: dict) -> list:
+    weeks = sorted({game["matchupPeriodId"] for game in league_info["schedule"]})
+
+    return [
+        week for week in weeks
+        if all(game["winner"] != "UNDECIDED" for game in _get_week_games(league_info, week))
+    ]
+
+
+def test_team_results_match_schedule():
+    league_info = _create_league_info()
+    team_results = _create_matchup_info(league_info).get_team_results()
+
+    rows = _get_reference_rows(league_info)
+
+    assert len(team_results) == len(rows)
+    assert list(zip(team_results["Week"], team_results["Team"])) == sorted(rows)
+
+    for week, team, opponent, points_for, points_against, result in zip(
+        team_results["Week"], team_results["Team"], team_results["Opponent"],
+        team_results["PointsFor"], team_results["PointsAgainst"], team_results["Result"]
+    ):
+        assert (opponent, points_for, points_against, result) == rows[week, team]
+
+
+def test_total_wins_match_schedule():
+    league_info = _create_league_info()
+    matchup_info = _create_matchup_info(league_info)
+
+    expected_wins = {team["id"]: 0 for team in league_info["teams"]}
+    for (_, team), (_, _, _, result) in _get_reference_rows(league_info).items():
+        expected_wins[team] += result == "W"
+
+    total_wins = matchup_info.get_all_teams_total_wins()
+
+    assert total_wins.to_dict() == expected_wins
+    assert matchup_info.get_single_team_total_wins(3) == expected_wins[3]
+
+    with pytest.raises(KeyError):
+        matchup_info.get_single_team_total_wins(NUM_TEAMS + 1)
+
+
+def test_game_margins_match_schedule():
+    league_info = _create_league_info()
+    margins = _create_matchup_info(league_info).get_all_game_margins()
+
+    rows = _get_reference_rows(league_info)
+
+    assert len(margins) == len(rows)
+
+    for week, team, margin in zip(margins["Week"], margins["Team"], margins["Margin"]):
+        _, points_for, points_against, _ = rows[week, team]
+        assert margin == pytest.approx(points_for - points_against)
+
+
+def test_weekly_average_score_matches_schedule():
+    league_info = _create_league_info()
+    average_scores = _create_matchup_info(league_info).get_weekly_average_score()
+
+    week_scores = {}
+    for (week, _), (_, points_for, _, _) in _get_reference_rows(league_info).items():
+        week_scores.setdefault(week, []).append(points_for)
+
+    # Final weeks come from the running stats, the live and unplayed weeks from the schedule
+    assert average_scores["Week"].tolist() == list(range(1, NUM_WEEKS + 1))
+    np.testing.assert_allclose(
+        average_scores["Score"].to_numpy(dtype=float),
+        [np.mean(week_scores[week]) for week in range(1, NUM_WEEKS + 1)],
+    )
+
+
+def test_running_stats_only_count_final_weeks():
+    league_info = _create_league_info()
+    team_stats = _create_matchup_info(league_info).get_running_stats().get_team_stats()
+
+    final_weeks = _get_final_weeks(league_info)
+    assert final_weeks == list(range(1, PLAYED_WEEKS + 1))
+
+    expected = {team["id"]: {"W": 0, "L": 0, "T": 0} for team in league_info["teams"]}
+    for (week, team), (_, _, _, result) in _get_reference_rows(league_info).items():
+        if week in final_weeks:
+            expected[team][result] += 1
+
+    for team, record in expected.items():
+        assert team_stats.loc[team, ["Wins", "Losses", "Ties"]].tolist() == [
+            record["W"], record["L"], record["T"]
+        ]
+
+
+def _assert_matches_full_rebuild(matchup_info: MatchupInfo) -> None:
+    rebuilt = _create_matchup_info(copy.deepcopy(matchup_info.league_matchup_info))
+
+    running_stats = matchup_info.get_running_stats()
+    rebuilt_stats = rebuilt.get_running_stats()
+
+    pd.testing.assert_frame_equal(running_stats.get_team_stats(), rebuilt_stats.get_team_stats())
+    pd.testing.assert_frame_equal(
+        running_stats.get_weekly_stats(), rebuilt_stats.get_weekly_stats()
+    )
+    pd.testing.assert_frame_equal(
+        matchup_info.get_weekly_average_score(), rebuilt.get_weekly_average_score()
+    )
+
+
+def test_incremental_running_stats_match_full_rebuild():
+    season = generate_league_info(NUM_TEAMS, NUM_WEEKS, seed=11)
+
+    # Start three weeks in, then let each later week's games come in over two polls
+    league_info = copy.deepcopy(season)
+    for week in range(4, NUM_WEEKS + 1):
+        for game in _get_week_games(league_info, week):
+            game["home"]["totalPoints"] = game["away"]["totalPoints"] = 0.0
+            game["winner"] = "UNDECIDED"
+
+    matchup_info = _create_matchup_info(league_info)
+    _assert_matches_full_rebuild(matchup_info)
+
+    for week in range(4, NUM_WEEKS + 1):
+        week_games = copy.deepcopy(_get_week_games(season, week))
+
+        matchup_info.update_schedule(week_games[:2])
+        _assert_matches_full_rebuild(matchup_info)
+        assert not matchup_info.get_running_stats().has_week(week)
+
+        matchup_info.update_schedule(week_games[2:])
+        _assert_matches_full_rebuild(matchup_info)
+        assert matchup_info.get_running_stats().has_week(week)
+
+
+def test_stat_correction_rebuilds_running_stats():
+    league_info = generate_league_info(NUM_TEAMS, NUM_WEEKS, seed=11)
+    matchup_info = _create_matchup_info(league_info)
+
+    old_stats = matchup_info.get_running_stats().get_team_stats()
+
+    # A correction to an already final week can't be folded in, so the aggregates start over
+    corrected_game = copy.deepcopy(_get_week_games(league_info, 2)[0])
+    corrected_game["home"]["totalPoints"] += 25.0
+    corrected_game["winner"] = "HOME"
+
+    changed_team_ids = matchup_info.update_schedule([corrected_game])
+
+    assert changed_team_ids == {
+        corrected_game["home"]["teamId"], corrected_game["away"]["teamId"]
+    }
+    _assert_matches_full_rebuild(matchup_info)
+
+    new_stats = matchup_info.get_running_stats().get_team_stats()
+    home_id = corrected_game["home"]["teamId"]
+
+    assert new_stats.loc[home_id, "Points For"] == pytest.approx(
+        old_stats.loc[home_id, "Points For"] + 25.0
+    )
@@ -0,0 +1,60 @@
+"""
+Tests for the Monte Carlo playoff odds
+"""
+import copy
+
+import numpy as np
+
+from fantasy_football.analytics.playoff_odds import get_playoff_odds
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.synthetic_league import generate_league_info
+
+
+def _get_games_df(league_info: dict):
+    return MatchupInfo(1, 2021, client=object(), league_info=league_info).get_all_games_df()
+
+
+def _start_live_week(league_info: dict, week: int, scores: list) -> dict:
+    league_info = copy.deepcopy(league_info)
+    live_games = [game for game in league_info["schedule"] if game["matchupPeriodId"] == week]
+
+    for game, (home_points, away_points) in zip(live_games, scores):
+        game["home"]["totalPoints"] = home_points
+        game["away"]["totalPoints"] = away_points
+
+    return league_info
+
+
+def test_odds_are_probabilities():
+    league_info = generate_league_info(8, 14, played_weeks=10, seed=1)
+
+    odds = get_playoff_odds(_get_games_df(league_info), num_simulations=2_000, seed=0, processes=1)
+
+    seed_columns = [column for column in odds.columns if column != "Playoffs"]
+    np.testing.assert_allclose(odds[seed_columns].sum(axis=1), 1.0)
+    np.testing.assert_allclose(odds[seed_columns].sum(axis=0), 1.0)
+    np.testing.assert_allclose(odds["Playoffs"].sum(), 4.0)
+
+
+def test_odds_are_reproducible_across_processes():
+    games_df = _get_games_df(generate_league_info(8, 14, played_weeks=10, seed=1))
+
+    inline = get_playoff_odds(games_df, num_simulations=4_000, seed=3, batch_size=500, processes=1)
+    pooled = get_playoff_odds(games_df, num_simulations=4_000, seed=3, batch_size=500, processes=2)
+
+    assert inline.equals(pooled)
+
+
+def test_live_week_partial_scores_are_simulated():
+    league_info = generate_league_info(8, 14, played_weeks=10, seed=1)
+
+    # Week 11 has started: a blowout in progress and a 100-100 game, both still undecided
+    live_info = _start_live_week(league_info, 11, [(60.0, 5.0), (100.0, 100.0)])
+
+    odds = get_playoff_odds(_get_games_df(league_info), num_simulations=5_000, seed=0, processes=1)
+    live_odds = get_playoff_odds(
+        _get_games_df(live_info), num_simulations=5_000, seed=0, processes=1
+    )
+
+    # Partial scores neither count as results nor shift the fitted score distributions
+    assert live_odds.equals(odds)
@@ -0,0 +1,72 @@
+"""
+Tests for the league standings table
+"""
+import numpy as np
+import pytest
+
+from fantasy_football.espn_requests.basic_info import BasicInfo
+from fantasy_football.espn_requests.matchup_info import MatchupInfo
+from fantasy_football.get_fantasy_stuff import get_league_standings_df
+from fantasy_football.synthetic_league import generate_league_info
+
+
+def _create_league(played_weeks: int, decided_live_games: int = 0) -> tuple:
+    league_info = generate_league_info(8, 12, played_weeks=played_weeks, seed=7)
+
+    # Some of the live week's games are already decided, but the week isn't final
+    live_games = [
+        game for game in league_info["schedule"] if game["matchupPeriodId"] == played_weeks + 1
+    ]
+    for game in live_games[:decided_live_games]:
+        game["home"]["totalPoints"], game["away"]["totalPoints"] = 120.0, 80.0
+        game["winner"] = "HOME"
+
+    basic_info = BasicInfo(1, 2021, client=object(), league_info=league_info)
+    matchup_info = MatchupInfo(1, 2021, client=object(), league_info=league_info)
+
+    return basic_info, matchup_info
+
+
+def _assert_luck_matches_record(standings):
+    ties = standings["Ties"] if "Ties" in standings else 0
+    actual_wins = standings["Wins"] + ties / 2
+
+    np.testing.assert_allclose(
+        standings["Luck"], actual_wins - standings["Expected Wins"], atol=0.011
+    )
+
+
+@pytest.mark.parametrize("use_running_stats", [False, True])
+def test_luck_matches_record_during_live_week(use_running_stats):
+    basic_info, matchup_info = _create_league(played_weeks=6, decided_live_games=2)
+    running_stats = matchup_info.get_running_stats() if use_running_stats else None
+
+    standings = get_league_standings_df(basic_info, matchup_info.get_team_results(), running_stats)
+
+    _assert_luck_matches_record(standings)
+
+    # Six final weeks of 8 teams, plus the two decided live games unless only final weeks count
+    num_results = 6 * 8 + (0 if use_running_stats else 2 * 2)
+    assert standings["Wins"].sum() + standings["Losses"].sum() == num_results
+
+
+def test_running_stats_standings_match_counted_standings_for_final_weeks():
+    basic_info, matchup_info = _create_league(played_weeks=6)
+
+    counted = get_league_standings_df(basic_info, matchup_info.get_team_results())
+    running = get_league_standings_df(
+        basic_info, matchup_info.get_team_results(), matchup_info.get_running_stats()
+    )
+
+    assert running.equals(counted)
+
+
+def test_standings_before_any_final_week():
+    basic_info, matchup_info = _create_league(played_weeks=0, decided_live_games=1)
+
+    standings = get_league_standings_df(
+        basic_info, matchup_info.get_team_results(), matchup_info.get_running_stats()
+    )
+
+    assert (standings[["Wins", "Losses", "Expected Wins", "Luck"]] == 0).all().all()
+    assert (standings["All-Play"] == "0-0").all()
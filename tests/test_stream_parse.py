@@ -0,0 +1,82 @@
+"""
+Tests for the streaming league payload parser
+"""
+import io
+import json
+
+import numpy as np
+import pytest
+
+from fantasy_football.espn_requests import stream_parse
+from fantasy_football.espn_requests.roster_info import RosterInfo
+from fantasy_football.synthetic_league import generate_league_info
+
+
+def _add_rosters(league_info: dict, scoring_period_id: int, roster_first: bool = False) -> dict:
+    teams = []
+
+    for team in league_info["teams"]:
+        entries = [
+            {
+                "playerId": team["id"] * 100 + i,
+                "lineupSlotId": i,
+                "playerPoolEntry": {
+                    "appliedStatTotal": 50.0,
+                    "player": {
+                        "fullName": f"Player {team['id']}-{i}",
+                        "defaultPositionId": i % 5 + 1,
+                        "stats": [
+                            {"scoringPeriodId": scoring_period_id, "statSourceId": 1,
+                             "appliedTotal": 99.0},
+                            {"scoringPeriodId": scoring_period_id, "statSourceId": 0,
+                             "appliedTotal": float(team["id"] + i)},
+                        ],
+                    },
+                },
+            }
+            for i in range(3)
+        ]
+        roster = {"roster": {"entries": entries}}
+
+        teams.append({**roster, **team} if roster_first else {**team, **roster})
+
+    return {**league_info, "teams": teams}
+
+
+def _parse(league_info: dict, scoring_period_id: int, use_ijson: bool, monkeypatch) -> tuple:
+    if not use_ijson:
+        monkeypatch.setattr(stream_parse, "ijson", None)
+    elif stream_parse.ijson is None:
+        pytest.skip("ijson is not installed")
+
+    body = io.BytesIO(json.dumps(league_info).encode())
+
+    return stream_parse.parse_league_info(body, scoring_period_id)
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+@pytest.mark.parametrize("roster_first", [False, True])
+def test_roster_columns_match_roster_info(use_ijson, roster_first, monkeypatch):
+    league_info = _add_rosters(generate_league_info(4, 6, seed=2), 3, roster_first=roster_first)
+
+    slim_info, roster_columns = _parse(league_info, 3, use_ijson, monkeypatch)
+
+    roster_info = RosterInfo(1, 2021, client=object())
+    roster_info.add_scoring_period(3, league_info)
+    expected = roster_info.get_player_weeks_df()
+
+    for column in ("Team", "Player", "Slot", "Position", "Points"):
+        np.testing.assert_array_equal(roster_columns[column], expected[column].to_numpy())
+
+    assert roster_columns["player_names"] == roster_info.player_names
+    assert [team["id"] for team in slim_info["teams"]] == [1, 2, 3, 4]
+    assert slim_info["schedule"] == league_info["schedule"]
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_team_without_id_is_a_parse_error(use_ijson, monkeypatch):
+    league_info = _add_rosters(generate_league_info(4, 6, seed=2), 3)
+    del league_info["teams"][1]["id"]
+
+    with pytest.raises(ValueError, match="no id"):
+        _parse(league_info, 3, use_ijson, monkeypatch)